@@ -14,7 +14,8 @@ Typical usage::
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, fields
+import functools
+from dataclasses import dataclass, fields
 from typing import Any
 
 
@@ -39,6 +40,9 @@ class Settings:
         stability_wait_ms: Milliseconds to wait after the last detected
             change before treating the screen as stable (lets CSS
             animations and scrolling settle).
+        profile_classifier: When True, the state classifier counts how
+            often each change type is returned and logs the distribution
+            every 20,000 frames, to guide ordering of its checks.
         min_zone_confidence: Minimum confidence score (0-1) required to
             register a new zone in the Canvas Mapper.
         zone_expiry_seconds: Seconds before an unconfirmed or stale
@@ -47,6 +51,18 @@ class Settings:
             zone before a hover event is emitted.
         motion_speed_pixels_per_sec: Default cursor movement speed used
             by the Brush Controller for smooth pointer travel.
+        plan_cache_size: Number of successful task plans the planner
+            keeps for reuse when the same task is planned against the
+            same zones.  Zero disables the plan cache.
+        plan_cache_path: JSON file (relative to the working directory)
+            used to persist the plan cache across runs.  Left empty to
+            keep the cache in memory only.
+        plan_cache_ttl_seconds: Age after which a cached plan is no
+            longer reused or reloaded from the cache file (7 days).
+        plan_max_zones: Most zones listed in a planning prompt.  On
+            busier screens only the zones most relevant to the task
+            are sent (interactive, label matching the task, focused).
+            Zero sends every zone.
         api_timeout_vision_seconds: HTTP timeout for vision (image)
             requests to the Claude API.
         api_timeout_text_seconds: HTTP timeout for text-only requests to
@@ -61,6 +77,32 @@ class Settings:
             replay session data is stored.
         save_frames_as_png: When True, individual frames are saved as
             PNG images alongside the session metadata.
+        frame_codec: Lossless image codec for saved frames: ``png``
+            or ``webp``.  WebP encodes faster than PNG at a similar
+            size on typical desktop captures.
+        frame_shard_size: Frames packed into each ``frames/NNNNNN.tar``
+            shard.  Zero writes one image file per frame instead, in
+            the ``frame_codec`` format.  Shards avoid a file create per
+            frame, which dominates write cost on NTFS and spinning
+            disks.
+        keyframe_interval: When greater than 1, only every Nth saved
+            frame is encoded in full.  The frames in between are stored
+            as zlib-compressed XOR deltas against that keyframe, which
+            is far smaller and cheaper to encode.  Values of 0 or 1
+            store every frame in full.
+        record_scale: Factor in ``(0, 1]`` applied to frame width and
+            height before encoding.  Halving the size cuts encode time
+            and storage roughly fourfold.
+        record_grayscale: When True, frames are converted to
+            single-channel grayscale before encoding.
+        skip_duplicate_frames: When True, a frame identical to the last
+            saved frame is not encoded again; its cursor sample points
+            at the saved frame instead.  Idle desktop periods then cost
+            almost nothing to record.
+        cursor_format: On-disk format of the cursor log: ``jsonl``
+            (one JSON object per line, read by the replay viewer) or
+            ``npz`` (compressed numpy columns, several times smaller
+            and much faster to write for long sessions).
         compress_video: When True, completed sessions are compressed
             into a video file for compact storage.
         platform_name: Explicit platform override (``linux``,
@@ -76,6 +118,7 @@ class Settings:
     diff_threshold_percent: float = 0.5
     tier2_threshold_percent: float = 30.0
     stability_wait_ms: int = 500
+    profile_classifier: bool = False
 
     # -- Zone detection -------------------------------------------------------
     min_zone_confidence: float = 0.7
@@ -88,6 +131,12 @@ class Settings:
     # -- Director -------------------------------------------------------------
     step_delay_seconds: float = 2.0
 
+    # -- Task planner ---------------------------------------------------------
+    plan_cache_size: int = 0
+    plan_cache_path: str = ""
+    plan_cache_ttl_seconds: float = 7 * 24 * 60 * 60.0
+    plan_max_zones: int = 200
+
     # -- API settings ---------------------------------------------------------
     api_timeout_vision_seconds: float = 30.0
     api_timeout_text_seconds: float = 30.0
@@ -98,6 +147,13 @@ class Settings:
     recording_enabled: bool = True
     session_dir: str = "sessions"
     save_frames_as_png: bool = True
+    frame_codec: str = "png"
+    frame_shard_size: int = 0
+    keyframe_interval: int = 0
+    record_scale: float = 1.0
+    record_grayscale: bool = False
+    skip_duplicate_frames: bool = False
+    cursor_format: str = "jsonl"
     compress_video: bool = True
 
     # -- Platform -------------------------------------------------------------
@@ -121,8 +177,7 @@ class Settings:
             A new ``Settings`` instance populated from *data*, with
             defaults filling any missing keys.
         """
-        known_names = {f.name for f in fields(cls)}
-        filtered = {k: v for k, v in data.items() if k in known_names}
+        filtered = {name: data[name] for name in _field_names(cls) if name in data}
         return cls(**filtered)
 
     def to_dict(self) -> dict[str, Any]:
@@ -132,7 +187,24 @@ class Settings:
             A shallow dictionary mapping every field name to its
             current value.
         """
-        return asdict(self)
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type[Settings]) -> tuple[str, ...]:
+    """Return the dataclass field names of *cls*, computed once per class.
+
+    Every field is a flat scalar, so ``to_dict`` can read attributes
+    directly instead of paying for ``asdict``'s recursive copy, and
+    neither method re-introspects the class on each call.
+
+    Args:
+        cls: ``Settings`` or a subclass of it.
+
+    Returns:
+        Field names in declaration order.
+    """
+    return tuple(f.name for f in fields(cls))
 
 
 def get_default_settings() -> Settings:
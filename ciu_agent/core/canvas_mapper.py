@@ -282,7 +282,7 @@ class CanvasMapper:
         """
         logger.debug(
             "Tier 0: %s — no analysis needed",
-            classification.change_type.value,
+            classification.change_type.label,
         )
         return ProcessFrameResult(
             classification=classification,
@@ -344,7 +344,7 @@ class CanvasMapper:
 
         logger.info(
             "Tier 1: %s — %d region(s), +%d /%d /-%d zones",
-            classification.change_type.value,
+            classification.change_type.label,
             len(classification.regions),
             zones_added,
             zones_updated,
@@ -386,7 +386,7 @@ class CanvasMapper:
             image_data=image_data,
             screen_width=w,
             screen_height=h,
-            context=f"Change type: {classification.change_type.value}",
+            context=f"Change type: {classification.change_type.label}",
         )
 
         # Use synchronous call (the orchestrator runs in a loop,
@@ -404,7 +404,7 @@ class CanvasMapper:
 
             logger.info(
                 "Tier 2: %s — replaced %d zones with %d from API (%.0f ms, %d tokens)",
-                classification.change_type.value,
+                classification.change_type.label,
                 old_count,
                 zones_added,
                 response.latency_ms,
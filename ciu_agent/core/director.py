@@ -262,6 +262,8 @@ class Director:
                         duration_ms=elapsed,
                     )
 
+                # The current plan failed, so never reuse it from cache.
+                self._planner.forget(task)
                 new_plan = self._create_plan(task)
                 plans_used += 1
 
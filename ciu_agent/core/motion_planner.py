@@ -16,6 +16,11 @@ It does not import any other ``core/`` modules.
 from __future__ import annotations
 
 import math
+from collections import OrderedDict
+from collections.abc import Iterator
+from itertools import repeat
+
+import numpy as np
 
 from ciu_agent.config.settings import Settings
 from ciu_agent.core.zone_registry import ZoneRegistry
@@ -38,6 +43,18 @@ _MIN_WAYPOINTS: int = 2
 _DEFAULT_SCAN_SPACING: int = 50
 """Pixel gap between scan lines in an exploratory sweep."""
 
+_DIRECT_CACHE_SIZE: int = 256
+"""Maximum number of memoised ``plan_direct`` waypoint lists."""
+
+_SCAN_GRID_CACHE_SIZE: int = 32
+"""Maximum number of memoised exploratory scan grids."""
+
+_MAX_ROUTE_DEPTH: int = 10
+"""Maximum nesting of detours when routing around avoid zones."""
+
+_BATCH_INTERSECT_MIN_RECTS: int = 8
+"""Avoid-zone count at which segment tests switch to one NumPy pass."""
+
 
 class MotionPlanner:
     """Generates cursor movement trajectories for the Brush Controller.
@@ -70,6 +87,15 @@ class MotionPlanner:
         """
         self._registry = registry
         self._settings = settings
+        # LRU of plan_direct waypoints keyed on
+        # (x, y, zone_id, registry version, speed).
+        self._direct_cache: OrderedDict[tuple[int, int, str, int, float], list[tuple[int, int]]] = (
+            OrderedDict()
+        )
+        # LRU of exploratory sweeps keyed on (*region, spacing, speed).
+        self._scan_grid_cache: OrderedDict[tuple[int, int, int, int, int, float], np.ndarray] = (
+            OrderedDict()
+        )
 
     # ------------------------------------------------------------------
     # Core planning methods
@@ -87,6 +113,9 @@ class MotionPlanner:
         distributed along the line at intervals determined by the
         configured motion speed and the assumed 60 fps tick rate.
 
+        Results are memoised per start point and target while the
+        registry version and motion speed are unchanged.
+
         Args:
             start: Current cursor position ``(x, y)``.
             target_zone_id: ID of the destination zone in the
@@ -100,20 +129,73 @@ class MotionPlanner:
             ValueError: If *target_zone_id* is not found in the
                 registry.
         """
-        zone = self._registry.get(target_zone_id)
-        if zone is None:
-            raise ValueError(f"Target zone '{target_zone_id}' not found in registry")
+        key = (
+            start[0],
+            start[1],
+            target_zone_id,
+            self._registry.version,
+            self._settings.motion_speed_pixels_per_sec,
+        )
+        cache = self._direct_cache
+        points = cache.get(key)
+        if points is not None:
+            cache.move_to_end(key)
+        else:
+            zone = self._registry.get(target_zone_id)
+            if zone is None:
+                raise ValueError(f"Target zone '{target_zone_id}' not found in registry")
 
-        end = zone.bounds.center()
-        num_steps = self._steps_for_distance(self._distance(start, end))
-        points = self.interpolate_line(start, end, num_steps)
+            end = zone.bounds.center()
+            num_steps = self._steps_for_distance(self._distance(start, end))
+            points = self.interpolate_line(start, end, num_steps)
+            cache[key] = points
+            if len(cache) > _DIRECT_CACHE_SIZE:
+                cache.popitem(last=False)
 
+        # Copy so callers cannot mutate the cached waypoint list.
         return Trajectory(
             type=TrajectoryType.DIRECT,
-            points=points,
+            points=list(points),
             target_zone_id=target_zone_id,
         )
 
+    def plan_direct_iter(
+        self,
+        start: tuple[int, int],
+        target_zone_id: str,
+    ) -> Iterator[tuple[int, int]]:
+        """Lazily yield the waypoints of a direct trajectory.
+
+        Equivalent to iterating ``plan_direct(...).points`` but each
+        waypoint is computed with integer stepping only when the
+        consumer asks for it, so a caller that abandons the motion
+        early (target moved, cancellation) never materialises the
+        rest of the path.  Positions are exactly rounded, so they can
+        differ from ``plan_direct`` by one pixel where float rounding
+        lands beside an exact half.
+
+        Args:
+            start: Current cursor position ``(x, y)``.
+            target_zone_id: ID of the destination zone in the
+                registry.
+
+        Returns:
+            An iterator over ``(x, y)`` integer waypoints from
+            *start* to the zone center inclusive.
+
+        Raises:
+            ValueError: If *target_zone_id* is not found in the
+                registry.  Raised immediately, not on first
+                iteration.
+        """
+        zone = self._registry.get(target_zone_id)
+        if zone is None:
+            raise ValueError(f"Target zone '{target_zone_id}' not found in registry")
+
+        ex, ey = zone.bounds.center()
+        num_steps = self._steps_for_distance(self._distance(start, (ex, ey)))
+        return self._bresenham(start[0], start[1], ex, ey, num_steps)
+
     def plan_safe(
         self,
         start: tuple[int, int],
@@ -152,24 +234,19 @@ class MotionPlanner:
                 raise ValueError(f"Avoid zone '{zid}' not found in registry")
             avoid_rects.append((zid, zone.bounds))
 
+        # Test nearer rectangles first so the blocker found for a
+        # segment is normally the one the cursor would reach first.
+        avoid_rects.sort(key=lambda item: self._edge_distance_sq(start, item[1]))
+
         end = target_zone.bounds.center()
         waypoints = self._route_around(start, end, avoid_rects)
 
-        # Interpolate each leg of the route and merge.
-        all_points: list[tuple[int, int]] = []
-        for i in range(len(waypoints) - 1):
-            seg_start = waypoints[i]
-            seg_end = waypoints[i + 1]
-            num_steps = self._steps_for_distance(self._distance(seg_start, seg_end))
-            seg_points = self.interpolate_line(seg_start, seg_end, num_steps)
-            if all_points:
-                # Avoid duplicating the junction point.
-                seg_points = seg_points[1:]
-            all_points.extend(seg_points)
-
-        # Enforce global waypoint limits.
-        if len(all_points) > _MAX_WAYPOINTS:
-            all_points = self._downsample(all_points, _MAX_WAYPOINTS)
+        # Interpolate into one array and enforce the global waypoint
+        # limit before any per-point tuples are built.
+        path = self._path_array(waypoints)
+        if len(path) > _MAX_WAYPOINTS:
+            path = path[self._downsample_indices(len(path), _MAX_WAYPOINTS)]
+        all_points = self._to_points(path)
 
         return Trajectory(
             type=TrajectoryType.SAFE,
@@ -209,44 +286,15 @@ class MotionPlanner:
             )
 
         scan_spacing = max(1, scan_spacing)
+        grid = self._build_scan_grid(region, scan_spacing)
 
-        # Build scan-line endpoints.
-        scan_points: list[tuple[int, int]] = []
-        left = rx
-        right = rx + rw
-        y = ry
-        row_index = 0
-        while y <= ry + rh:
-            if row_index % 2 == 0:
-                scan_points.append((left, y))
-                scan_points.append((right, y))
-            else:
-                scan_points.append((right, y))
-                scan_points.append((left, y))
-            y += scan_spacing
-            row_index += 1
-
-        if not scan_points:
-            scan_points.append((rx, ry))
-
-        # Prepend a leg from start to the first scan point.
-        all_points: list[tuple[int, int]] = []
-        first_scan = scan_points[0]
-        lead_in_steps = self._steps_for_distance(self._distance(start, first_scan))
-        lead_in = self.interpolate_line(start, first_scan, lead_in_steps)
-        all_points.extend(lead_in)
-
-        # Interpolate each scan-line segment.
-        for i in range(len(scan_points) - 1):
-            seg_start = scan_points[i]
-            seg_end = scan_points[i + 1]
-            num_steps = self._steps_for_distance(self._distance(seg_start, seg_end))
-            seg = self.interpolate_line(seg_start, seg_end, num_steps)
-            # Drop the first point to avoid duplicating the junction.
-            all_points.extend(seg[1:])
-
-        if len(all_points) > _MAX_WAYPOINTS:
-            all_points = self._downsample(all_points, _MAX_WAYPOINTS)
+        # Lead in from start to the first scan point (the region's
+        # top-left corner), then follow the cached sweep.
+        lead_in = self._path_array([start, (rx, ry)])
+        path = np.concatenate((lead_in, grid[1:]))
+        if len(path) > _MAX_WAYPOINTS:
+            path = path[self._downsample_indices(len(path), _MAX_WAYPOINTS)]
+        all_points = self._to_points(path)
 
         return Trajectory(
             type=TrajectoryType.EXPLORATORY,
@@ -277,18 +325,35 @@ class MotionPlanner:
             *end* inclusive.
         """
         num_steps = max(_MIN_WAYPOINTS, num_steps)
-        if num_steps == 1:
-            return [start]
 
         sx, sy = start
         ex, ey = end
-        points: list[tuple[int, int]] = []
-        for i in range(num_steps):
-            t = i / (num_steps - 1)
-            x = round(sx + (ex - sx) * t)
-            y = round(sy + (ey - sy) * t)
-            points.append((x, y))
-        return points
+        dx = ex - sx
+        dy = ey - sy
+
+        # ``i / (num_steps - 1)`` per waypoint, matching the scalar
+        # formula exactly so ``np.rint`` reproduces ``round()``.
+        t = np.arange(num_steps) / (num_steps - 1)
+
+        # Axis-aligned and 45-degree lines need only one interpolated
+        # axis; scan lines in exploratory sweeps hit these paths.
+        if dy == 0:
+            xs = np.rint(sx + dx * t).astype(np.int64).tolist()
+            return list(zip(xs, repeat(sy, num_steps)))
+        if dx == 0:
+            ys = np.rint(sy + dy * t).astype(np.int64).tolist()
+            return list(zip(repeat(sx, num_steps), ys))
+        if abs(dx) + abs(dy) < 2 * num_steps:
+            # Sub-2-pixel spacing: integer stepping beats float setup.
+            return list(MotionPlanner._bresenham(sx, sy, ex, ey, num_steps))
+        if abs(dx) == abs(dy):
+            offsets = abs(dx) * t
+            xs = np.rint(sx + offsets if dx > 0 else sx - offsets)
+            ys = np.rint(sy + offsets if dy > 0 else sy - offsets)
+        else:
+            xs = np.rint(sx + dx * t)
+            ys = np.rint(sy + dy * t)
+        return list(zip(xs.astype(np.int64).tolist(), ys.astype(np.int64).tolist()))
 
     @staticmethod
     def line_intersects_rect(
@@ -311,7 +376,8 @@ class MotionPlanner:
             ``True`` if the segment intersects or is contained by the
             rectangle.
         """
-        if rect.area() == 0:
+        x_min, y_min, x_max, y_max, _cx, _cy, area = rect.extents()
+        if area == 0:
             return False
 
         x1, y1 = float(p1[0]), float(p1[1])
@@ -320,12 +386,6 @@ class MotionPlanner:
         dx = x2 - x1
         dy = y2 - y1
 
-        # Rectangle edges.
-        x_min = float(rect.x)
-        x_max = float(rect.x + rect.width)
-        y_min = float(rect.y)
-        y_max = float(rect.y + rect.height)
-
         # Liang-Barsky parameters: -dx, +dx, -dy, +dy
         p = [-dx, dx, -dy, dy]
         q = [
@@ -394,6 +454,18 @@ class MotionPlanner:
         dy = b[1] - a[1]
         return math.sqrt(dx * dx + dy * dy)
 
+    @staticmethod
+    def _edge_distance_sq(point: tuple[int, int], rect: Rectangle) -> int:
+        """Squared distance from a point to the nearest edge of a rect.
+
+        Returns ``0`` when the point lies inside or on the rectangle.
+        """
+        px, py = point
+        x_min, y_min, x_max, y_max, _cx, _cy, _area = rect.extents()
+        gap_x = max(x_min - px, 0, px - x_max)
+        gap_y = max(y_min - py, 0, py - y_max)
+        return gap_x * gap_x + gap_y * gap_y
+
     def _steps_for_distance(self, distance: float) -> int:
         """Calculate the number of interpolation steps for a distance.
 
@@ -413,60 +485,277 @@ class MotionPlanner:
 
         # Time in seconds to traverse the distance.
         travel_seconds = distance / speed
-        # Number of frames at assumed FPS.
+        # Number of frames at assumed FPS, rounded half up; the value
+        # is non-negative, so ``int(x + 0.5)`` avoids ``round()``.
         steps = max(
             _MIN_WAYPOINTS,
-            min(_MAX_WAYPOINTS, round(travel_seconds * _ASSUMED_FPS)),
+            min(_MAX_WAYPOINTS, int(travel_seconds * _ASSUMED_FPS + 0.5)),
         )
         return steps
 
+    def _path_array(self, waypoints: list[tuple[int, int]]) -> np.ndarray:
+        """Interpolate every leg of a polyline in one vectorised pass.
+
+        Produces the same points as calling ``interpolate_line`` on
+        each leg (with the float formula) and dropping the duplicated
+        junction point of every leg after the first, but builds all
+        legs from concatenated parameter arrays instead of one Python
+        call and list per leg.
+
+        Args:
+            waypoints: Polyline vertices ``(x, y)``; at least two.
+
+        Returns:
+            An ``(N, 2)`` int64 array of merged waypoints.
+        """
+        wp = np.asarray(waypoints, dtype=np.int64)
+        starts = wp[:-1]
+        deltas = wp[1:] - starts
+        dx = deltas[:, 0]
+        dy = deltas[:, 1]
+
+        # Per-leg step counts, mirroring _steps_for_distance.
+        speed = self._settings.motion_speed_pixels_per_sec
+        distances = np.sqrt(dx * dx + dy * dy)
+        if speed <= 0.0:
+            steps = np.full(len(deltas), _MIN_WAYPOINTS, dtype=np.int64)
+        else:
+            frames = np.floor(distances / speed * _ASSUMED_FPS + 0.5).astype(np.int64)
+            steps = np.clip(frames, _MIN_WAYPOINTS, _MAX_WAYPOINTS)
+            steps[distances <= 0.0] = _MIN_WAYPOINTS
+
+        # Every leg after the first skips its junction (index 0).
+        first_index = np.ones(len(steps), dtype=np.int64)
+        first_index[0] = 0
+        counts = steps - first_index
+        leg = np.repeat(np.arange(len(steps)), counts)
+        leg_offset = np.repeat(np.cumsum(counts) - counts - first_index, counts)
+        index = np.arange(int(counts.sum())) - leg_offset
+
+        t = index / (steps[leg] - 1)
+        xs = np.rint(starts[leg, 0] + dx[leg] * t)
+        ys = np.rint(starts[leg, 1] + dy[leg] * t)
+        return np.column_stack((xs, ys)).astype(np.int64)
+
+    @staticmethod
+    def _to_points(path: np.ndarray) -> list[tuple[int, int]]:
+        """Convert an ``(N, 2)`` waypoint array into a list of tuples."""
+        return list(zip(path[:, 0].tolist(), path[:, 1].tolist()))
+
+    def _build_scan_grid(
+        self,
+        region: tuple[int, int, int, int],
+        scan_spacing: int,
+    ) -> np.ndarray:
+        """Return the interpolated lawnmower sweep for a region.
+
+        The sweep does not depend on the cursor start position, so it
+        is memoised per ``(region, scan_spacing, motion speed)`` and
+        shared read-only between calls.
+
+        Args:
+            region: Non-degenerate scan area ``(x, y, width, height)``.
+            scan_spacing: Vertical gap in pixels between scan lines
+                (>= 1).
+
+        Returns:
+            A read-only ``(N, 2)`` int64 array starting at the
+            region's top-left corner.
+        """
+        speed = self._settings.motion_speed_pixels_per_sec
+        key = (*region, scan_spacing, speed)
+        cache = self._scan_grid_cache
+        grid = cache.get(key)
+        if grid is not None:
+            cache.move_to_end(key)
+            return grid
+
+        rx, ry, rw, rh = region
+
+        # Build scan-line endpoints.
+        scan_points: list[tuple[int, int]] = []
+        left = rx
+        right = rx + rw
+        y = ry
+        row_index = 0
+        while y <= ry + rh:
+            if row_index % 2 == 0:
+                scan_points.append((left, y))
+                scan_points.append((right, y))
+            else:
+                scan_points.append((right, y))
+                scan_points.append((left, y))
+            y += scan_spacing
+            row_index += 1
+
+        grid = self._path_array(scan_points)
+        grid.flags.writeable = False
+        cache[key] = grid
+        if len(cache) > _SCAN_GRID_CACHE_SIZE:
+            cache.popitem(last=False)
+        return grid
+
     def _route_around(
         self,
         start: tuple[int, int],
         end: tuple[int, int],
         avoid_rects: list[tuple[str, Rectangle]],
-        _depth: int = 0,
     ) -> list[tuple[int, int]]:
-        """Recursively build waypoints that avoid blocking rectangles.
+        """Build waypoints that avoid blocking rectangles.
 
         If the direct segment from *start* to *end* is clear, returns
         ``[start, end]``.  Otherwise it detects the first blocking
         rectangle and inserts a detour waypoint around the nearer
-        edge, then recurses on the resulting sub-segments.
+        edge, then processes the resulting sub-segments.
+
+        Sub-segments are handled with an explicit depth-first stack
+        rather than recursion, so legs are emitted in path order
+        without per-level call overhead or list concatenation.
 
         Args:
             start: Segment start ``(x, y)``.
             end: Segment end ``(x, y)``.
             avoid_rects: List of ``(zone_id, Rectangle)`` pairs to
                 avoid.
-            _depth: Internal recursion depth guard.
 
         Returns:
             Ordered list of waypoints from *start* to *end*.
         """
-        _MAX_DEPTH = 10
-        if _depth >= _MAX_DEPTH:
-            return [start, end]
+        # With many avoid zones, test a segment against all of them at
+        # once; for a handful the plain loop has less overhead.
+        extents: np.ndarray | None = None
+        if len(avoid_rects) >= _BATCH_INTERSECT_MIN_RECTS:
+            extents = np.array([rect.extents() for _zid, rect in avoid_rects], dtype=np.float64)
+
+        waypoints: list[tuple[int, int]] = [start]
+        # Each entry is (segment start, segment end, depth).  The
+        # second leg is pushed first so the first leg is popped first.
+        stack: list[tuple[tuple[int, int], tuple[int, int], int]] = [(start, end, 0)]
+
+        while stack:
+            seg_start, seg_end, depth = stack.pop()
+
+            blocker: Rectangle | None = None
+            if depth < _MAX_ROUTE_DEPTH:
+                # Find the first blocking rectangle along the segment.
+                if extents is not None:
+                    index = self._first_intersecting(seg_start, seg_end, extents)
+                    if index >= 0:
+                        blocker = avoid_rects[index][1]
+                else:
+                    for _zid, rect in avoid_rects:
+                        if self.line_intersects_rect(seg_start, seg_end, rect):
+                            blocker = rect
+                            break
+
+            if blocker is None:
+                waypoints.append(seg_end)
+                continue
+
+            # Determine a detour point around the blocker.
+            detour = self._detour_point(seg_start, seg_end, blocker)
+            stack.append((detour, seg_end, depth + 1))
+            stack.append((seg_start, detour, depth + 1))
+
+        return waypoints
+
+    @staticmethod
+    def _first_intersecting(
+        p1: tuple[int, int],
+        p2: tuple[int, int],
+        extents: np.ndarray,
+    ) -> int:
+        """Find the first rectangle a segment intersects, in one pass.
+
+        Vectorised form of ``line_intersects_rect``: the Liang-Barsky
+        parameters are evaluated for every rectangle at once, looping
+        only over the four edge directions.
+
+        Args:
+            p1: First endpoint of the line segment ``(x, y)``.
+            p2: Second endpoint of the line segment ``(x, y)``.
+            extents: Float array of shape ``(K, 7)`` whose rows are
+                ``Rectangle.extents()`` tuples.
 
-        # Find the first blocking rectangle along the segment.
-        blocker: Rectangle | None = None
-        for _zid, rect in avoid_rects:
-            if self.line_intersects_rect(start, end, rect):
-                blocker = rect
-                break
+        Returns:
+            Index of the first intersecting rectangle, or ``-1`` if
+            the segment is clear of all of them.
+        """
+        x1, y1 = float(p1[0]), float(p1[1])
+        dx = float(p2[0]) - x1
+        dy = float(p2[1]) - y1
+
+        hits = extents[:, 6] != 0.0
+        t_enter = np.zeros(len(extents))
+        t_exit = np.ones(len(extents))
+        for pi, qi in (
+            (-dx, x1 - extents[:, 0]),
+            (dx, extents[:, 2] - x1),
+            (-dy, y1 - extents[:, 1]),
+            (dy, extents[:, 3] - y1),
+        ):
+            if pi == 0.0:
+                # Parallel to this edge pair: outside means no hit.
+                hits &= qi >= 0.0
+            elif pi < 0.0:
+                np.maximum(t_enter, qi / pi, out=t_enter)
+            else:
+                np.minimum(t_exit, qi / pi, out=t_exit)
+        hits &= t_enter <= t_exit
 
-        if blocker is None:
-            return [start, end]
+        if not hits.any():
+            return -1
+        return int(np.argmax(hits))
 
-        # Determine a detour point around the blocker.
-        detour = self._detour_point(start, end, blocker)
+    @staticmethod
+    def _bresenham(
+        sx: int,
+        sy: int,
+        ex: int,
+        ey: int,
+        num_steps: int,
+    ) -> Iterator[tuple[int, int]]:
+        """Interpolate a line lazily using integer arithmetic only.
 
-        # Recurse on the two sub-segments.
-        first_leg = self._route_around(start, detour, avoid_rects, _depth + 1)
-        second_leg = self._route_around(detour, end, avoid_rects, _depth + 1)
+        Each axis advances by the quotient of ``delta / (num_steps - 1)``
+        per step and carries the remainder as a Bresenham-style error
+        term, so no floating-point multiplies or ``round()`` calls are
+        needed.  Exact ties round half to even, matching ``round()``.
 
-        # Merge, dropping the duplicate junction point.
-        return first_leg + second_leg[1:]
+        Args:
+            sx: Start x-coordinate.
+            sy: Start y-coordinate.
+            ex: End x-coordinate.
+            ey: End y-coordinate.
+            num_steps: Number of waypoints to produce (>= 2).
+
+        Yields:
+            ``num_steps`` integer waypoints from ``(sx, sy)`` to
+            ``(ex, ey)`` inclusive.
+        """
+        den = num_steps - 1
+        step_x, rem_x = divmod(ex - sx, den)
+        step_y, rem_y = divmod(ey - sy, den)
+        x, err_x = sx, 0
+        y, err_y = sy, 0
+
+        for _ in range(num_steps):
+            twice_x = err_x << 1
+            twice_y = err_y << 1
+            px = x + 1 if twice_x > den or (twice_x == den and x & 1) else x
+            py = y + 1 if twice_y > den or (twice_y == den and y & 1) else y
+            yield (px, py)
+
+            x += step_x
+            err_x += rem_x
+            if err_x >= den:
+                err_x -= den
+                x += 1
+            y += step_y
+            err_y += rem_y
+            if err_y >= den:
+                err_y -= den
+                y += 1
 
     @staticmethod
     def _detour_point(
@@ -489,62 +778,42 @@ class MotionPlanner:
         Returns:
             A single ``(x, y)`` waypoint that lies outside *blocker*.
         """
-        margin = min(10, max(blocker.width, blocker.height) // 2 + 1)
+        left, top, right, bottom, bcx, bcy, _area = blocker.extents()
+        margin = min(10, max(right - left, bottom - top) // 2 + 1)
 
         mid_x = (start[0] + end[0]) / 2.0
         mid_y = (start[1] + end[1]) / 2.0
 
-        bx = blocker.x
-        by = blocker.y
-        bw = blocker.width
-        bh = blocker.height
-
-        # Distances from midpoint to each edge of the blocker.
-        dist_left = abs(mid_x - bx)
-        dist_right = abs(mid_x - (bx + bw))
-        dist_top = abs(mid_y - by)
-        dist_bottom = abs(mid_y - (by + bh))
-
-        min_dist = min(dist_left, dist_right, dist_top, dist_bottom)
-
-        # Route past the closest edge, keeping the margin.
-        bcx, bcy = blocker.center()
-
-        if min_dist == dist_top:
-            # Go above the blocker.
-            return (bcx, by - margin)
-        elif min_dist == dist_bottom:
-            # Go below the blocker.
-            return (bcx, by + bh + margin)
-        elif min_dist == dist_left:
-            # Go left of the blocker.
-            return (bx - margin, bcy)
-        else:
-            # Go right of the blocker.
-            return (bx + bw + margin, bcy)
+        # Distances from midpoint to the top, bottom, left, and right
+        # edges, paired with the detour past each edge.
+        dists = (
+            abs(mid_y - top),
+            abs(mid_y - bottom),
+            abs(mid_x - left),
+            abs(mid_x - right),
+        )
+        candidates = (
+            (bcx, top - margin),
+            (bcx, bottom + margin),
+            (left - margin, bcy),
+            (right + margin, bcy),
+        )
+
+        # Route past the closest edge, keeping the margin.  The first
+        # minimum wins, so ties prefer top, bottom, left, then right.
+        return candidates[dists.index(min(dists))]
 
     @staticmethod
-    def _downsample(
-        points: list[tuple[int, int]],
-        max_count: int,
-    ) -> list[tuple[int, int]]:
-        """Uniformly downsample a point list while keeping endpoints.
+    def _downsample_indices(count: int, max_count: int) -> np.ndarray:
+        """Indices of the points kept by a uniform downsample.
 
         Args:
-            points: Original waypoint list.
-            max_count: Maximum number of points to keep (>= 2).
+            count: Length of the original point sequence.
+            max_count: Number of points to keep (>= 2).
 
         Returns:
-            A shortened list that preserves the first and last
-            points.
+            ``max_count`` ascending indices including ``0`` and
+            ``count - 1``.
         """
-        if len(points) <= max_count or max_count < 2:
-            return list(points)
-
-        result: list[tuple[int, int]] = [points[0]]
-        step = (len(points) - 1) / (max_count - 1)
-        for i in range(1, max_count - 1):
-            idx = round(i * step)
-            result.append(points[idx])
-        result.append(points[-1])
-        return result
+        # ``np.rint`` rounds half-to-even exactly like ``round()``.
+        return np.rint(np.linspace(0, count - 1, max_count)).astype(np.intp)
@@ -0,0 +1,290 @@
+"""Plan cache: reuse task plans for repeated task and screen combinations.
+
+Repeated automations ("open settings", "save the document") are often
+planned against the same screen.  The ``PlanCache`` maps a fingerprint
+of the normalised task text and the visible zones to the plan Claude
+returned last time, so the ``TaskPlanner`` can skip the API round-trip
+entirely on a hit.
+
+Entries are kept in a small in-memory LRU.  When a path is given they
+are also persisted as JSON (written atomically) and reloaded on start,
+dropping any older than the time-to-live.  A cache may be shared by
+threads planning concurrently.
+
+This module depends only on ``ciu_agent.models`` and the Python
+standard library.
+
+Typical usage::
+
+    cache = PlanCache(max_entries=100, path="sessions/plan_cache.json")
+    plan = cache.get(task, zones)
+    if plan is None:
+        plan = planner_call(task, zones)
+        cache.put(task, zones, plan)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+
+from ciu_agent.models.task import TaskPlan, TaskStep
+from ciu_agent.models.zone import Zone
+
+logger = logging.getLogger(__name__)
+
+# Persisted entries older than this are ignored on load (7 days).
+_DEFAULT_TTL_SECONDS: float = 7 * 24 * 60 * 60.0
+
+
+# Courtesy words that do not change what a task asks for.
+_FILLER_WORDS: frozenset[str] = frozenset({"please", "kindly"})
+
+
+def _normalise_task(task: str) -> str:
+    """Return the task text as used for cache keys.
+
+    Case, punctuation, spacing, and courtesy words are ignored, so
+    "Please open Settings." and "open settings" share a key.  Words
+    and their order are kept: rephrasings still miss rather than risk
+    reusing a plan for a different task.
+    """
+    return " ".join(w for w in re.findall(r"\w+", task.lower()) if w not in _FILLER_WORDS)
+
+
+def plan_fingerprint(task: str, zones: list[Zone], platform: str = "") -> str:
+    """Return a stable key for a task planned against a set of zones.
+
+    The key covers the normalised task text, the platform, and each
+    zone's id, label, type, and center, so a plan is only reused when
+    the screen offers the same targets in the same places on the same
+    OS (shortcuts differ between platforms).  Zone order does not
+    matter.
+
+    Args:
+        task: Natural-language task description.
+        zones: Zones visible when the task is planned.
+        platform: OS identifier the plan is for, as passed to the
+            ``TaskPlanner``.
+
+    Returns:
+        A hex SHA-256 digest.
+    """
+    material = {
+        "task": _normalise_task(task),
+        "platform": platform,
+        "zones": sorted((z.id, z.label, z.type.value, list(z.bounds.center())) for z in zones),
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """Least-recently-used cache of successful task plans.
+
+    Only plans that succeeded with at least one step are stored.  A hit
+    returns a new ``TaskPlan`` carrying the caller's task description,
+    with ``api_calls_used`` and ``latency_ms`` of zero since no request
+    was made.
+
+    Args:
+        max_entries: Maximum number of plans kept; the least recently
+            used entry is evicted beyond this.
+        path: Optional JSON file used to persist the cache across
+            runs.  ``None`` keeps the cache in memory only.
+        ttl_seconds: Age after which an entry is discarded, whether
+            loaded from the file or stored during this run.
+        platform: OS identifier included in every key, so one cache
+            file can serve several platforms without mixing plans.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100,
+        path: str | Path | None = None,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        platform: str = "",
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._path = Path(path) if path else None
+        self._ttl_seconds = ttl_seconds
+        self._platform = platform
+        # key -> (normalised task, stored_at, steps, raw_response)
+        self._entries: OrderedDict[str, tuple[str, float, list[TaskStep], str]] = OrderedDict()
+        # Guards _entries and the cache file; held across each save so
+        # concurrent writers never interleave or persist stale data.
+        self._lock = threading.Lock()
+        if self._path is not None:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        task: str,
+        zones: list[Zone],
+        *,
+        key: str | None = None,
+    ) -> TaskPlan | None:
+        """Return the cached plan for *task* on *zones*, if any.
+
+        Args:
+            task: Natural-language task description.
+            zones: Zones currently visible on screen.
+            key: ``plan_fingerprint(task, zones, platform)``, when the caller
+                has already computed it.
+
+        Returns:
+            A successful ``TaskPlan`` on a hit, or ``None``.
+        """
+        if key is None:
+            key = plan_fingerprint(task, zones, self._platform)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time() - self._ttl_seconds:
+                # Expired while in memory; the next save drops it from disk too.
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        _, _, steps, raw_response = entry
+        return TaskPlan(
+            task_description=task,
+            steps=list(steps),
+            raw_response=raw_response,
+            success=True,
+        )
+
+    def put(
+        self,
+        task: str,
+        zones: list[Zone],
+        plan: TaskPlan,
+        *,
+        key: str | None = None,
+    ) -> None:
+        """Store a plan if it succeeded and has steps.
+
+        Args:
+            task: Natural-language task description.
+            zones: Zones the plan was produced for.
+            plan: The plan returned by the API.
+            key: ``plan_fingerprint(task, zones, platform)``, when the caller
+                has already computed it.
+        """
+        if not plan.success or not plan.steps:
+            return
+        if key is None:
+            key = plan_fingerprint(task, zones, self._platform)
+        entry = (_normalise_task(task), time.time(), list(plan.steps), plan.raw_response)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def discard(self, task: str) -> int:
+        """Remove every cached plan for *task*, whatever the zones.
+
+        Called when a plan did not work out, so that replanning asks
+        the API again instead of returning the same steps.
+
+        Args:
+            task: Natural-language task description.
+
+        Returns:
+            The number of entries removed.
+        """
+        norm = _normalise_task(task)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0] == norm]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove every cached plan."""
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def __len__(self) -> int:
+        """Return the number of cached plans."""
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Read persisted entries, skipping expired or malformed ones."""
+        assert self._path is not None
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("PlanCache: ignoring unreadable %s: %s", self._path, exc)
+            return
+        if not isinstance(raw, dict):
+            logger.warning("PlanCache: ignoring unreadable %s: not a JSON object", self._path)
+            return
+
+        cutoff = time.time() - self._ttl_seconds
+        for item in raw.get("entries", []):
+            try:
+                stored_at = float(item["stored_at"])
+                if stored_at < cutoff:
+                    continue
+                steps = [TaskStep(**step) for step in item["steps"]]
+                self._entries[str(item["key"])] = (
+                    str(item["task"]),
+                    stored_at,
+                    steps,
+                    str(item.get("raw_response", "")),
+                )
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("PlanCache: skipping malformed entry: %s", exc)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        """Write all entries to the cache file, replacing it atomically.
+
+        Called with ``_lock`` held.
+        """
+        if self._path is None:
+            return
+        data = {
+            "entries": [
+                {
+                    "key": key,
+                    "task": task,
+                    "stored_at": stored_at,
+                    "steps": [asdict(step) for step in steps],
+                    "raw_response": raw_response,
+                }
+                for key, (task, stored_at, steps, raw_response) in list(self._entries.items())
+            ]
+        }
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            logger.warning("PlanCache: could not write %s: %s", self._path, exc)
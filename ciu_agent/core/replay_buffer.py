@@ -9,10 +9,14 @@ plain data (numpy arrays, dataclasses).  It never imports or depends on
 Session directory layout::
 
     sessions/session_YYYYMMDD_HHMMSS/
-        frames/          # PNG frames (when save_frames_as_png is True)
-            000001.png
+        frames/          # Frames (when save_frames_as_png is True)
+            000001.png   # one file per frame, or, with frame_shard_size,
             ...
-        cursor.jsonl     # One JSON object per cursor sample
+            000000.tar   # tar shards holding the same image members
+            delta.bin    # with keyframe_interval: compressed XOR deltas
+            delta.json   # frame -> [keyframe, offset, length] index
+        cursor.jsonl     # One JSON object per cursor sample, or
+        cursor.npz       # compressed column arrays (cursor_format="npz")
         events.jsonl     # One serialised SpatialEvent per line
         actions.jsonl    # One serialised Action per line
         metadata.json    # SessionMetadata as JSON
@@ -30,42 +34,113 @@ Typical usage::
 
 from __future__ import annotations
 
-import json
+import io
+import os
+import queue
+import tarfile
+import threading
 import time
-from dataclasses import asdict, dataclass
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import cv2
 import numpy as np
+import orjson
 from numpy.typing import NDArray
 
 from ciu_agent.config.settings import Settings
 from ciu_agent.models.actions import Action
 from ciu_agent.models.events import SpatialEvent
 
+_FRAME_QUEUE_SIZE: int = 64
+"""Maximum frames waiting for the background writer.
+
+When the writer falls this far behind, ``record_frame`` blocks until a
+slot frees up, so a slow disk throttles capture instead of letting
+pending frames grow without bound in RAM.
+"""
+
+_EncodedFrame = tuple[int, NDArray[np.uint8], memoryview | None]
+"""Encoder pool output: frame number, reduced image, and encoded bytes."""
+
+_ENCODE_WORKERS: int = max(1, (os.cpu_count() or 2) - 1)
+"""Threads encoding frames in parallel, leaving one core for capture.
+
+``cv2.imencode`` releases the GIL while compressing, so encode
+throughput scales with cores rather than being capped at one.
+"""
+
+_CURSOR_DTYPE: np.dtype[Any] = np.dtype(
+    [
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("timestamp", "<f8"),
+        ("frame", "<i8"),
+        ("same_as", "<i8"),
+    ]
+)
+"""Row layout of the in-memory cursor log, one field per ``CursorSample``
+attribute.  ``same_as`` holds -1 where the sample's value is None."""
+
+_CURSOR_FORMATS: frozenset[str] = frozenset({"jsonl", "npz"})
+"""Accepted values of the ``cursor_format`` setting."""
+
+_CURSOR_INITIAL_ROWS: int = 1024
+"""Initial cursor log capacity; the array doubles whenever it fills."""
+
+_FRAME_CODECS: dict[str, tuple[str, tuple[int, ...]]] = {
+    "png": (".png", ()),
+    "webp": (".webp", (cv2.IMWRITE_WEBP_QUALITY, 101)),
+}
+"""File extension and OpenCV encoder parameters for each ``frame_codec``.
+
+Both codecs are lossless; WebP quality 101 selects lossless mode.
+"""
+
+_RECORD_QUEUE_SIZE: int = 4096
+"""Maximum events and actions waiting to be encoded and written."""
+
+_SHARD_MAX_BYTES: int = 256 * 1024 * 1024
+"""Size at which a frame shard is rolled over even if not yet full."""
+
+_WRITE_BUFFER_BYTES: int = 1 << 20
+"""Write buffer for shard and streamed JSONL files, so each frame or
+record is not a separate syscall."""
+
 # ---------------------------------------------------------------------------
 # Data structures
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class CursorSample:
     """A single cursor-position sample tied to a frame.
 
+    Recording writes samples straight into a numpy array, so instances
+    are only built when a log is loaded back.  ``slots`` keeps each of
+    those instances free of a per-object ``__dict__``.
+
     Attributes:
         x: Horizontal screen coordinate.
         y: Vertical screen coordinate.
         timestamp: Unix timestamp when the sample was taken.
         frame: Frame number this sample corresponds to.
+        same_as: Frame number of an identical earlier frame whose image
+            stands in for this one, or None when this frame's image was
+            saved itself.  Only set when ``skip_duplicate_frames`` is
+            enabled.
     """
 
     x: int
     y: int
     timestamp: float
     frame: int
+    same_as: int | None = None
 
 
 @dataclass
@@ -82,6 +157,10 @@ class SessionMetadata:
         action_count: Total number of director actions recorded.
         screen_width: Width of the captured screen in pixels.
         screen_height: Height of the captured screen in pixels.
+        grayscale: Whether frames were saved single-channel
+            (``record_grayscale``).  Codecs such as WebP store them as
+            three channels, so ``load_frames`` uses this to decode
+            them back to one.
     """
 
     session_id: str
@@ -93,6 +172,26 @@ class SessionMetadata:
     action_count: int = 0
     screen_width: int = 0
     screen_height: int = 0
+    grayscale: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the metadata as a plain dictionary.
+
+        Returns:
+            A dictionary mapping every field name to its value.
+        """
+        return {
+            "session_id": self.session_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "task_description": self.task_description,
+            "frame_count": self.frame_count,
+            "event_count": self.event_count,
+            "action_count": self.action_count,
+            "screen_width": self.screen_width,
+            "screen_height": self.screen_height,
+            "grayscale": self.grayscale,
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -100,43 +199,283 @@ class SessionMetadata:
 # ---------------------------------------------------------------------------
 
 
-def _enum_safe_dict(obj: Any) -> dict[str, Any]:
-    """Convert a dataclass to a dict, replacing Enum values with names.
+_JSONL_OPTIONS: int = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+"""``orjson`` options for one JSONL record: newline-terminated, with
+non-string payload keys stringified the way ``json.dumps`` does."""
+
+
+# ---------------------------------------------------------------------------
+# Frame storage
+# ---------------------------------------------------------------------------
+
+_FRAME_FILE_FLAGS: int = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+"""Flags for creating a frame file; ``O_BINARY`` disables newline
+translation on Windows and does not exist elsewhere."""
+
+_HAS_FADVISE: bool = hasattr(os, "posix_fadvise")
+"""Whether the platform (Linux) supports ``os.posix_fadvise``."""
+
+
+def _write_frame_file(path: Path, data: memoryview) -> None:
+    """Write one encoded frame to its own file with a single ``write``.
+
+    The frame is encoded in memory and written straight to a raw file
+    descriptor, avoiding the ``FILE*`` buffering inside
+    ``cv2.imwrite``.  Where ``posix_fadvise`` exists, the file is
+    marked ``POSIX_FADV_DONTNEED`` before closing.  That starts
+    writeback right away instead of letting dirty frames pile up until
+    the kernel throttles the writer.  It also keeps write-once frames
+    from evicting useful pages from the cache.
+
+    Args:
+        path: Destination file path.
+        data: Byte view of the encoder's output array, written without
+            an intermediate ``bytes`` copy.
+    """
+    fd = os.open(path, _FRAME_FILE_FLAGS, 0o644)
+    try:
+        view = data
+        while view:
+            view = view[os.write(fd, view) :]
+        if _HAS_FADVISE:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+class _FrameShardWriter:
+    """Appends encoded frames to a rolling series of tar shards.
+
+    Each shard is an uncompressed tar archive named by its zero-padded
+    index (``000000.tar``, ``000001.tar``, ...) whose members are the
+    encoded frame files.  A new shard starts once the current one holds
+    *frames_per_shard* members or reaches ``_SHARD_MAX_BYTES``.
+
+    Args:
+        frames_dir: Directory that receives the shard files.
+        frames_per_shard: Maximum number of frames per shard.
+    """
+
+    def __init__(self, frames_dir: Path, frames_per_shard: int) -> None:
+        """Initialise without opening a shard until the first frame.
+
+        Args:
+            frames_dir: Directory that receives the shard files.
+            frames_per_shard: Maximum number of frames per shard.
+        """
+        self._frames_dir: Path = frames_dir
+        self._frames_per_shard: int = frames_per_shard
+        self._shard_index: int = 0
+        self._fh: BinaryIO | None = None
+        self._tar: tarfile.TarFile | None = None
+        self._count: int = 0
+        self._bytes: int = 0
 
-    Uses ``dataclasses.asdict`` and then walks the resulting dict to
-    swap any ``Enum`` member for its ``.name`` string.  This keeps the
-    JSONL output human-readable and safe for round-tripping.
+    def add(self, name: str, data: memoryview) -> None:
+        """Append one encoded frame to the current shard.
+
+        Args:
+            name: Member name inside the shard (e.g. ``000001.png``).
+            data: Byte view of the encoded frame.
+        """
+        if self._tar is None:
+            self._open_next()
+        elif self._count >= self._frames_per_shard or self._bytes >= _SHARD_MAX_BYTES:
+            self.close()
+            self._open_next()
+        assert self._tar is not None
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        self._count += 1
+        self._bytes += info.size
+
+    def close(self) -> None:
+        """Finish and close the current shard, if one is open."""
+        if self._tar is not None and self._fh is not None:
+            self._tar.close()
+            self._fh.close()
+        self._tar = None
+        self._fh = None
+
+    def _open_next(self) -> None:
+        """Open the next shard file in sequence."""
+        path = self._frames_dir / f"{self._shard_index:06d}.tar"
+        self._shard_index += 1
+        self._fh = path.open("wb", buffering=_WRITE_BUFFER_BYTES)
+        self._tar = tarfile.open(fileobj=self._fh, mode="w")
+        self._count = 0
+        self._bytes = 0
+
+
+class _DeltaWriter:
+    """Stores frames as compressed XOR deltas against a keyframe.
+
+    Consecutive screen frames differ in few pixels, so XOR-ing a frame
+    with the last keyframe gives a mostly-zero buffer.  Fast zlib
+    compresses that buffer to a small fraction of a full PNG, for far
+    less CPU.  Keyframes themselves are stored as ordinary frames by
+    the caller.  Deltas are appended to ``delta.bin`` and indexed in
+    ``delta.json``.
 
     Args:
-        obj: A dataclass instance to serialise.
+        frames_dir: Directory that receives ``delta.bin`` and
+            ``delta.json``.
+        interval: A keyframe is requested every *interval* frames.
+    """
+
+    def __init__(self, frames_dir: Path, interval: int) -> None:
+        """Initialise and open ``delta.bin`` for writing.
+
+        Args:
+            frames_dir: Directory that receives the delta files.
+            interval: Frames per keyframe, including the keyframe.
+        """
+        self._frames_dir: Path = frames_dir
+        self._interval: int = interval
+        self._fh: BinaryIO = (frames_dir / "delta.bin").open("wb", buffering=_WRITE_BUFFER_BYTES)
+        self._offset: int = 0
+        self._index: list[list[int]] = []
+        self._keyframe: NDArray[np.uint8] | None = None
+        self._keyframe_number: int = 0
+        self._since_keyframe: int = 0
+
+    def add(self, frame_number: int, image: NDArray[np.uint8]) -> bool:
+        """Store *image* as a delta if the current keyframe allows it.
+
+        Args:
+            frame_number: Frame index of *image*.
+            image: The frame to store.
+
+        Returns:
+            True if the frame was stored as a delta.  False means the
+            caller must store it in full and pass it to ``keyframe``.
+        """
+        key = self._keyframe
+        if (
+            key is None
+            or self._since_keyframe >= self._interval - 1
+            or key.shape != image.shape
+            or key.dtype != image.dtype
+        ):
+            return False
+        delta = zlib.compress(np.bitwise_xor(image, key), 1)
+        self._fh.write(delta)
+        self._index.append([frame_number, self._keyframe_number, self._offset, len(delta)])
+        self._offset += len(delta)
+        self._since_keyframe += 1
+        return True
+
+    def keyframe(self, frame_number: int, image: NDArray[np.uint8]) -> None:
+        """Make *image*, already stored in full, the new keyframe.
+
+        Args:
+            frame_number: Frame index of *image*.
+            image: The stored frame.  It is kept by reference.
+        """
+        self._keyframe = image
+        self._keyframe_number = frame_number
+        self._since_keyframe = 0
+
+    def close(self) -> None:
+        """Close ``delta.bin`` and write the ``delta.json`` index."""
+        self._fh.close()
+        self._keyframe = None
+        (self._frames_dir / "delta.json").write_bytes(orjson.dumps(self._index))
+
+
+def _fsync_directory(path: Path) -> None:
+    """Flush a directory's entries to stable storage.
+
+    Frame and session files are written without any per-file sync.
+    One directory ``fsync`` when the session stops makes all the new
+    directory entries durable at once.  Windows cannot open
+    directories as files, so this is a no-op there.
+
+    Args:
+        path: Directory whose entries should be persisted.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _recompress_png(data: bytes, level: int) -> bytes | None:
+    """Re-encode a PNG at a higher deflate level, losslessly.
+
+    Args:
+        data: The original PNG file contents.
+        level: zlib compression level for the new encoding (0-9).
 
     Returns:
-        A plain dictionary with all Enum values replaced by their
-        ``.name`` strings.
+        The re-encoded PNG if it is smaller than *data*, else None.
     """
-    raw = asdict(obj)
-    return _walk_enums(raw)
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if image is None:
+        return None
+    ok, encoded = cv2.imencode(".png", image, (cv2.IMWRITE_PNG_COMPRESSION, level))
+    if not ok or encoded.size >= len(data):
+        return None
+    return encoded.tobytes()
+
 
+def _recompress_frames(frames_dir: Path, level: int) -> int:
+    """Recompress every PNG frame of a session in place.
 
-def _walk_enums(data: Any) -> Any:
-    """Recursively replace Enum members with their name strings.
+    Handles both frame files and tar shards.  Each file or shard is
+    rewritten under a temporary name and moved over the original with
+    ``os.replace``, so a crash never leaves a truncated frame behind.
 
     Args:
-        data: Arbitrary nested structure (dict, list, or scalar).
+        frames_dir: The session's ``frames/`` directory.
+        level: zlib compression level for the new encoding (0-9).
 
     Returns:
-        The same structure with every ``Enum`` replaced by its
-        ``.name`` attribute.
+        Total number of bytes saved.
     """
-    if isinstance(data, dict):
-        return {k: _walk_enums(v) for k, v in data.items()}
-    if isinstance(data, list):
-        return [_walk_enums(item) for item in data]
-    if isinstance(data, tuple):
-        return [_walk_enums(item) for item in data]
-    if isinstance(data, Enum):
-        return data.name
-    return data
+    saved = 0
+    for path in sorted(frames_dir.glob("*.png")):
+        data = path.read_bytes()
+        smaller = _recompress_png(data, level)
+        if smaller is not None:
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(smaller)
+            os.replace(tmp, path)
+            saved += len(data) - len(smaller)
+
+    for shard in sorted(frames_dir.glob("*.tar")):
+        tmp = shard.with_name(shard.name + ".tmp")
+        shard_saved = 0
+        with (
+            tarfile.open(shard, mode="r") as src,
+            tmp.open("wb", buffering=_WRITE_BUFFER_BYTES) as fh,
+            tarfile.open(fileobj=fh, mode="w") as dst,
+        ):
+            for member in src:
+                member_fh = src.extractfile(member)
+                if member_fh is None:
+                    dst.addfile(member)
+                    continue
+                data = member_fh.read()
+                if member.name.endswith(".png"):
+                    smaller = _recompress_png(data, level)
+                    if smaller is not None:
+                        shard_saved += len(data) - len(smaller)
+                        data = smaller
+                member.size = len(data)
+                dst.addfile(member, io.BytesIO(data))
+        if shard_saved:
+            os.replace(tmp, shard)
+            saved += shard_saved
+        else:
+            tmp.unlink()
+    return saved
 
 
 # ---------------------------------------------------------------------------
@@ -147,10 +486,16 @@ def _walk_enums(data: Any) -> Any:
 class ReplayBuffer:
     """Records frames, events, and actions into structured sessions.
 
-    The buffer holds data in memory while a session is active and
-    flushes everything to disk when ``stop_session`` is called.  Frame
-    images are optionally written as PNGs during recording to avoid
-    accumulating large numpy arrays in RAM.
+    Events and actions are streamed to their JSONL files as they are
+    recorded, so memory stays bounded and ``stop_session`` does not
+    stall on a large backlog.  Cursor samples are held in memory and
+    written when ``stop_session`` is called.  Frame images are
+    optionally saved during recording, encoded with the configured
+    ``frame_codec`` (PNG or lossless WebP), so large numpy arrays do
+    not accumulate in RAM.  Frames are encoded on a small thread pool
+    fed by a bounded queue and saved in order by a writer thread, so
+    the capture loop only pays for an enqueue.  A second thread
+    JSON-encodes and writes events and actions the same way.
 
     Args:
         settings: Injected application settings that control
@@ -165,11 +510,28 @@ class ReplayBuffer:
             settings: Application-wide configuration.
         """
         self._settings: Settings = settings
-        self._cursor_log: list[CursorSample] = []
-        self._events: list[SpatialEvent] = []
-        self._actions: list[Action] = []
+        self._cursor_log: NDArray[Any] = np.empty(0, dtype=_CURSOR_DTYPE)
+        self._cursor_count: int = 0
+        self._events_fh: BinaryIO | None = None
+        self._actions_fh: BinaryIO | None = None
         self._metadata: SessionMetadata | None = None
         self._session_dir: Path | None = None
+        self._frame_queue: queue.Queue[Future[_EncodedFrame] | None] = queue.Queue(
+            maxsize=_FRAME_QUEUE_SIZE
+        )
+        self._encoder: ThreadPoolExecutor | None = None
+        self._frames_dir: Path | None = None
+        self._shards: _FrameShardWriter | None = None
+        self._deltas: _DeltaWriter | None = None
+        self._writer: threading.Thread | None = None
+        self._record_queue: queue.Queue[tuple[BinaryIO, dict[str, Any]] | None] = queue.Queue(
+            maxsize=_RECORD_QUEUE_SIZE
+        )
+        self._record_writer: threading.Thread | None = None
+        self._writer_error: Exception | None = None
+        self._last_image: NDArray[np.uint8] | None = None
+        self._scaled: tuple[tuple[int, int], tuple[int, int]] = ((0, 0), (0, 0))
+        self._last_frame_number: int = 0
 
     # -- Session lifecycle ---------------------------------------------------
 
@@ -199,11 +561,26 @@ class ReplayBuffer:
 
         Raises:
             RuntimeError: If a session is already in progress.
+            ValueError: If ``frame_codec`` or ``cursor_format`` names an
+                unsupported format, or ``record_scale`` is outside
+                ``(0, 1]``.
         """
         if self._metadata is not None:
             raise RuntimeError(
                 "A session is already in progress.  Call stop_session() before starting a new one."
             )
+        if self._settings.frame_codec not in _FRAME_CODECS:
+            raise ValueError(
+                f"Unsupported frame_codec {self._settings.frame_codec!r}; "
+                f"expected one of {sorted(_FRAME_CODECS)}"
+            )
+        if not 0.0 < self._settings.record_scale <= 1.0:
+            raise ValueError(f"record_scale must be in (0, 1], got {self._settings.record_scale}")
+        if self._settings.cursor_format not in _CURSOR_FORMATS:
+            raise ValueError(
+                f"Unsupported cursor_format {self._settings.cursor_format!r}; "
+                f"expected one of {sorted(_CURSOR_FORMATS)}"
+            )
 
         if not session_id:
             now = datetime.now(tz=timezone.utc)
@@ -217,6 +594,7 @@ class ReplayBuffer:
             task_description=task_description,
             screen_width=width,
             screen_height=height,
+            grayscale=self._settings.record_grayscale,
         )
 
         # Resolve session directory under the configured root.
@@ -225,12 +603,40 @@ class ReplayBuffer:
         self._session_dir.mkdir(parents=True, exist_ok=True)
 
         if self._settings.save_frames_as_png:
-            (self._session_dir / "frames").mkdir(exist_ok=True)
+            self._frames_dir = self._session_dir / "frames"
+            self._frames_dir.mkdir(exist_ok=True)
+            if self._settings.frame_shard_size > 0:
+                self._shards = _FrameShardWriter(self._frames_dir, self._settings.frame_shard_size)
+            if self._settings.keyframe_interval > 1:
+                self._deltas = _DeltaWriter(self._frames_dir, self._settings.keyframe_interval)
+            self._encoder = ThreadPoolExecutor(
+                max_workers=_ENCODE_WORKERS,
+                thread_name_prefix=f"replay-encode-{session_id}",
+            )
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"replay-writer-{session_id}",
+                daemon=True,
+            )
+            self._writer.start()
 
         # Reset in-memory buffers.
-        self._cursor_log = []
-        self._events = []
-        self._actions = []
+        self._last_image = None
+        self._cursor_log = np.empty(_CURSOR_INITIAL_ROWS, dtype=_CURSOR_DTYPE)
+        self._cursor_count = 0
+        self._events_fh = (self._session_dir / "events.jsonl").open(
+            "wb", buffering=_WRITE_BUFFER_BYTES
+        )
+        self._actions_fh = (self._session_dir / "actions.jsonl").open(
+            "wb", buffering=_WRITE_BUFFER_BYTES
+        )
+        self._writer_error = None
+        self._record_writer = threading.Thread(
+            target=self._record_writer_loop,
+            name=f"replay-records-{session_id}",
+            daemon=True,
+        )
+        self._record_writer.start()
 
         return session_id
 
@@ -244,10 +650,23 @@ class ReplayBuffer:
     ) -> None:
         """Record a single frame with its cursor position.
 
-        The cursor position is always appended to the in-memory log.
+        The cursor position is always appended to the in-memory log, a
+        structured numpy array with one ``CursorSample``-shaped row per
+        frame, so recording allocates no per-sample Python objects.
         If ``save_frames_as_png`` is enabled in settings, the frame
-        image is also written to the ``frames/`` sub-directory as a
-        PNG with a six-digit zero-padded filename.
+        image is also queued for the background writer, which encodes
+        it with the configured ``frame_codec`` and saves it to the
+        ``frames/`` sub-directory under a six-digit zero-padded
+        filename, either as its own file or as a member of a tar
+        shard when ``frame_shard_size`` is set.  The array is queued
+        by reference, so the caller must not modify it afterwards;
+        the capture engine allocates a fresh array per frame.  Call
+        ``flush_frames`` to wait until every queued frame is on disk.
+
+        With ``skip_duplicate_frames`` enabled, a frame identical to the
+        last saved one is not encoded again; its cursor sample records
+        the saved frame's number in ``same_as`` instead.  The frame
+        still counts towards ``frame_count``.
 
         Args:
             image: The captured screen image as a numpy array
@@ -263,26 +682,51 @@ class ReplayBuffer:
         if self._metadata is None or self._session_dir is None:
             raise RuntimeError("No active session.  Call start_session() first.")
 
-        self._cursor_log.append(
-            CursorSample(
-                x=cursor_x,
-                y=cursor_y,
-                timestamp=timestamp,
-                frame=frame_number,
-            )
+        same_as = -1
+        if self._writer is not None:
+            # An exact comparison costs about as much as hashing the
+            # buffer, and cannot mistake a changed frame for a repeat.
+            if (
+                self._settings.skip_duplicate_frames
+                and self._last_image is not None
+                and np.array_equal(image, self._last_image)
+            ):
+                same_as = self._last_frame_number
+            else:
+                assert self._encoder is not None
+                self._frame_queue.put(self._encoder.submit(self._encode_frame, frame_number, image))
+                self._last_image = image
+                self._last_frame_number = frame_number
+
+        if self._cursor_count == len(self._cursor_log):
+            grown = np.empty(max(2 * self._cursor_count, 1), dtype=_CURSOR_DTYPE)
+            grown[: self._cursor_count] = self._cursor_log
+            self._cursor_log = grown
+        self._cursor_log[self._cursor_count] = (
+            cursor_x,
+            cursor_y,
+            timestamp,
+            frame_number,
+            same_as,
         )
+        self._cursor_count += 1
         self._metadata.frame_count += 1
 
-        if self._settings.save_frames_as_png:
-            filename = f"{frame_number:06d}.png"
-            frame_path = self._session_dir / "frames" / filename
-            cv2.imwrite(str(frame_path), image)
+    def flush_frames(self) -> None:
+        """Block until every queued frame has been written to disk.
+
+        Returns immediately when no frames are pending or PNG saving
+        is disabled.
+        """
+        if self._writer is not None:
+            self._frame_queue.join()
 
     def record_event(self, event: SpatialEvent) -> None:
         """Record a spatial event.
 
-        The event is buffered in memory and will be flushed to
-        ``events.jsonl`` when ``stop_session`` is called.
+        The event is converted to a dict on the caller's thread, so
+        later changes to it are not recorded.  JSON encoding and the
+        append to ``events.jsonl`` happen on the record writer thread.
 
         Args:
             event: The spatial event to record.
@@ -290,16 +734,17 @@ class ReplayBuffer:
         Raises:
             RuntimeError: If no session is currently active.
         """
-        if self._metadata is None:
+        if self._metadata is None or self._events_fh is None:
             raise RuntimeError("No active session.  Call start_session() first.")
-        self._events.append(event)
+        self._record_queue.put((self._events_fh, event.to_dict()))
         self._metadata.event_count += 1
 
     def record_action(self, action: Action) -> None:
         """Record a director action.
 
-        The action is buffered in memory and will be flushed to
-        ``actions.jsonl`` when ``stop_session`` is called.
+        The action is converted to a dict on the caller's thread, so
+        later status updates are not recorded.  JSON encoding and the
+        append to ``actions.jsonl`` happen on the record writer thread.
 
         Args:
             action: The action to record.
@@ -307,75 +752,305 @@ class ReplayBuffer:
         Raises:
             RuntimeError: If no session is currently active.
         """
-        if self._metadata is None:
+        if self._metadata is None or self._actions_fh is None:
             raise RuntimeError("No active session.  Call start_session() first.")
-        self._actions.append(action)
+        self._record_queue.put((self._actions_fh, action.to_dict()))
         self._metadata.action_count += 1
 
     def stop_session(self) -> Path:
         """Stop recording and finalise the session.
 
-        Writes all buffered data to disk inside the session directory:
+        Waits for the background writers to finish any queued frames,
+        events and actions, closes the streamed ``events.jsonl`` and
+        ``actions.jsonl`` files, then writes the remaining data inside
+        the session directory:
 
-        - ``cursor.jsonl`` -- one JSON line per cursor sample.
-        - ``events.jsonl`` -- one JSON line per spatial event.
-        - ``actions.jsonl`` -- one JSON line per director action.
+        - ``cursor.jsonl`` -- one JSON line per cursor sample, or
+          ``cursor.npz`` when ``cursor_format`` is ``"npz"``.
         - ``metadata.json`` -- full session metadata.
 
+        Finally the ``frames/`` and session directories are synced
+        once each, so their entries survive a crash without a sync per
+        file.
+
         Returns:
             Path to the session directory.
 
         Raises:
-            RuntimeError: If no session is currently active.
+            RuntimeError: If no session is currently active, or if a
+                background writer failed to save a frame or record.  In the
+                latter case the session is still finalised first.
         """
         if self._metadata is None or self._session_dir is None:
             raise RuntimeError("No active session.  Call start_session() first.")
 
+        if self._writer is not None:
+            self._frame_queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._encoder is not None:
+            self._encoder.shutdown()
+            self._encoder = None
+        if self._shards is not None:
+            self._shards.close()
+            self._shards = None
+        if self._deltas is not None:
+            self._deltas.close()
+            self._deltas = None
+        self._frames_dir = None
+        if self._record_writer is not None:
+            self._record_queue.put(None)
+            self._record_writer.join()
+            self._record_writer = None
+        for fh in (self._events_fh, self._actions_fh):
+            if fh is not None:
+                fh.close()
+        self._events_fh = None
+        self._actions_fh = None
+
         self._metadata.end_time = time.time()
 
         # -- Cursor log ------------------------------------------------------
-        cursor_path = self._session_dir / "cursor.jsonl"
-        with cursor_path.open("w", encoding="utf-8") as fh:
-            for sample in self._cursor_log:
-                line = json.dumps(asdict(sample), ensure_ascii=False)
-                fh.write(line + "\n")
-
-        # -- Events ----------------------------------------------------------
-        events_path = self._session_dir / "events.jsonl"
-        with events_path.open("w", encoding="utf-8") as fh:
-            for event in self._events:
-                line = json.dumps(_enum_safe_dict(event), ensure_ascii=False)
-                fh.write(line + "\n")
-
-        # -- Actions ---------------------------------------------------------
-        actions_path = self._session_dir / "actions.jsonl"
-        with actions_path.open("w", encoding="utf-8") as fh:
-            for action in self._actions:
-                line = json.dumps(_enum_safe_dict(action), ensure_ascii=False)
-                fh.write(line + "\n")
+        samples = self._cursor_log[: self._cursor_count]
+        if self._settings.cursor_format == "npz":
+            np.savez_compressed(
+                self._session_dir / "cursor.npz",
+                **{name: samples[name] for name in _CURSOR_DTYPE.names or ()},
+            )
+        else:
+            self._write_cursor_jsonl(self._session_dir / "cursor.jsonl", samples)
 
         # -- Metadata --------------------------------------------------------
         meta_path = self._session_dir / "metadata.json"
-        with meta_path.open("w", encoding="utf-8") as fh:
-            json.dump(
-                asdict(self._metadata),
-                fh,
-                indent=2,
-                ensure_ascii=False,
+        meta_path.write_bytes(
+            orjson.dumps(
+                self._metadata.to_dict(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
             )
-            fh.write("\n")
+        )
 
         session_dir = self._session_dir
+        if self._settings.save_frames_as_png:
+            _fsync_directory(session_dir / "frames")
+        _fsync_directory(session_dir)
 
         # Clear internal state so a new session can start.
-        self._cursor_log = []
-        self._events = []
-        self._actions = []
+        self._cursor_log = np.empty(0, dtype=_CURSOR_DTYPE)
+        self._cursor_count = 0
         self._metadata = None
         self._session_dir = None
+        self._last_image = None
+
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise RuntimeError(f"Failed to write session data: {error}") from error
 
         return session_dir
 
+    @staticmethod
+    def _write_cursor_jsonl(path: Path, samples: NDArray[Any]) -> None:
+        """Write cursor samples as one JSON object per line.
+
+        Each column is converted to Python scalars once with
+        ``tolist``, rather than reading fields row by row.
+
+        Args:
+            path: Destination ``cursor.jsonl`` path.
+            samples: Filled rows of the cursor log.
+        """
+        with path.open("wb") as fh:
+            columns = [samples[name].tolist() for name in _CURSOR_DTYPE.names or ()]
+            for x, y, ts, frame, same_as in zip(*columns):
+                record: dict[str, Any] = {"x": x, "y": y, "timestamp": ts, "frame": frame}
+                if same_as >= 0:
+                    record["same_as"] = same_as
+                fh.write(orjson.dumps(record, option=_JSONL_OPTIONS))
+
+    # -- Background writers --------------------------------------------------
+
+    def _record_writer_loop(self) -> None:
+        """Encode and append queued event/action dicts until ``None``.
+
+        Runs on the record writer thread.  Each item names the file it
+        belongs to, so one thread serves both streams and keeps each in
+        recording order.  The first failure is kept for
+        ``stop_session``; the queue is still drained afterwards.
+        """
+        while True:
+            item = self._record_queue.get()
+            if item is None:
+                return
+            if self._writer_error is None:
+                fh, record = item
+                try:
+                    fh.write(orjson.dumps(record, option=_JSONL_OPTIONS))
+                except Exception as exc:
+                    self._writer_error = exc
+
+    def _writer_loop(self) -> None:
+        """Save encoded frames in capture order until the ``None`` sentinel.
+
+        Runs on the writer thread.  Frames are encoded concurrently on
+        the encoder pool, but each future is awaited in the order it was
+        queued, so shards, deltas, and files are written sequentially.
+        The first failure is kept for ``stop_session`` to report; later
+        frames are still drained so producers never block forever.
+        """
+        while True:
+            item = self._frame_queue.get()
+            try:
+                if item is None:
+                    return
+                if self._writer_error is None:
+                    try:
+                        self._save_frame(*item.result())
+                    except Exception as exc:
+                        self._writer_error = exc
+                else:
+                    item.cancel()
+            finally:
+                self._frame_queue.task_done()
+
+    def _encode_frame(self, frame_number: int, image: NDArray[np.uint8]) -> _EncodedFrame:
+        """Reduce and encode one frame on an encoder pool thread.
+
+        When keyframe deltas are enabled, only the reduction happens
+        here: whether a frame becomes a keyframe depends on the frames
+        before it, so that decision and any encoding is left to the
+        writer thread.
+
+        Args:
+            frame_number: Frame index, passed through for the writer.
+            image: The captured frame.  The capture engine allocates a
+                new array per frame, so it is not copied.
+
+        Returns:
+            ``(frame_number, reduced, data)`` where *data* is the encoded
+            frame, or None when the writer must decide how to store it.
+
+        Raises:
+            OSError: If the frame cannot be encoded.
+        """
+        image = self._reduce(image)
+        if self._deltas is not None:
+            return frame_number, image, None
+        return frame_number, image, self._encode(frame_number, image)
+
+    def _encode(self, frame_number: int, image: NDArray[np.uint8]) -> memoryview:
+        """Encode a reduced frame with the configured codec.
+
+        Args:
+            frame_number: Frame index, used in the error message.
+            image: The reduced frame.
+
+        Returns:
+            A flat byte view of the encoded image.
+
+        Raises:
+            OSError: If the frame cannot be encoded.
+        """
+        ext, params = _FRAME_CODECS[self._settings.frame_codec]
+        ok, encoded = cv2.imencode(ext, image, params)
+        if not ok:
+            raise OSError(f"Could not encode frame {frame_number} as {ext}")
+        # OpenCV cannot encode into a caller-owned buffer, but its output
+        # array can be written through a flat view instead of copying it
+        # into a bytes object first.
+        return memoryview(encoded).cast("B")
+
+    def _save_frame(
+        self,
+        frame_number: int,
+        image: NDArray[np.uint8],
+        data: memoryview | None,
+    ) -> None:
+        """Store one frame as a file, shard member, or delta.
+
+        The file extension records the codec, so ``load_frames`` can
+        decode either format.
+
+        Args:
+            frame_number: Frame index used for the file or member name.
+            image: The reduced frame.
+            data: The encoded frame from ``_encode_frame``, or None to
+                try a delta first and encode only on a keyframe.
+
+        Raises:
+            OSError: If the frame cannot be encoded.
+        """
+        assert self._frames_dir is not None
+        if data is None:
+            if self._deltas is not None and self._deltas.add(frame_number, image):
+                return
+            data = self._encode(frame_number, image)
+        ext, _ = _FRAME_CODECS[self._settings.frame_codec]
+        filename = f"{frame_number:06d}{ext}"
+        if self._shards is None:
+            _write_frame_file(self._frames_dir / filename, data)
+        else:
+            self._shards.add(filename, data)
+        if self._deltas is not None:
+            self._deltas.keyframe(frame_number, image)
+
+    def _reduce(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        """Apply ``record_scale`` and ``record_grayscale`` to a frame.
+
+        Deflate time grows with the number of input bytes, so shrinking
+        the frame first makes encoding cheaper.  Both steps use OpenCV's
+        SIMD kernels and run on the encoder pool.  The output size is
+        computed once per input resolution and cached as a single tuple,
+        so concurrent encoders never see a shape paired with a stale size.
+
+        Args:
+            image: The captured BGR frame.
+
+        Returns:
+            The frame to encode, which is *image* itself when neither
+            reduction is configured.
+        """
+        scale = self._settings.record_scale
+        if scale != 1.0:
+            shape = (image.shape[0], image.shape[1])
+            cached_shape, size = self._scaled
+            if shape != cached_shape:
+                height, width = shape
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                self._scaled = (shape, size)
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        if self._settings.record_grayscale and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    # -- Post-processing -----------------------------------------------------
+
+    def finalize(self, session_dir: Path, level: int = 9) -> Future[int]:
+        """Recompress a finished session's PNG frames in the background.
+
+        Frames are encoded with OpenCV's fast default PNG settings
+        while recording, which keeps the capture path cheap.  This pass
+        re-encodes each PNG frame (file or shard member) at *level* and
+        keeps the result only when it is smaller.  Pixels are
+        unchanged.  WebP frames and keyframe deltas are left alone.
+
+        Args:
+            session_dir: Path to a session directory returned by
+                ``stop_session``.
+            level: zlib compression level for the new encoding (0-9).
+
+        Returns:
+            A future resolving to the total number of bytes saved.
+
+        Raises:
+            ValueError: If *level* is outside 0-9.
+        """
+        if not 0 <= level <= 9:
+            raise ValueError(f"level must be in 0-9, got {level}")
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="replay-finalize")
+        try:
+            return executor.submit(_recompress_frames, session_dir / "frames", level)
+        finally:
+            executor.shutdown(wait=False)
+
     # -- Replay / inspection -------------------------------------------------
 
     def load_session(self, session_dir: Path) -> SessionMetadata:
@@ -396,10 +1071,108 @@ class ReplayBuffer:
         if not meta_path.exists():
             raise FileNotFoundError(f"No metadata.json found in {session_dir}")
 
-        with meta_path.open("r", encoding="utf-8") as fh:
-            raw = json.load(fh)
+        return SessionMetadata(**orjson.loads(meta_path.read_bytes()))
+
+    def load_cursor(self, session_dir: Path) -> list[CursorSample]:
+        """Load the cursor samples of a saved session.
+
+        Reads ``cursor.npz`` when present, otherwise ``cursor.jsonl``.
+
+        Args:
+            session_dir: Path to a previously saved session directory.
+
+        Returns:
+            The samples in recording order; empty when the session has
+            no cursor log.
+        """
+        npz_path = session_dir / "cursor.npz"
+        if npz_path.exists():
+            with np.load(npz_path) as arrays:
+                columns = [arrays[name].tolist() for name in _CURSOR_DTYPE.names or ()]
+            return [
+                CursorSample(x, y, ts, frame, same_as if same_as >= 0 else None)
+                for x, y, ts, frame, same_as in zip(*columns)
+            ]
+
+        jsonl_path = session_dir / "cursor.jsonl"
+        if not jsonl_path.exists():
+            return []
+        with jsonl_path.open("rb") as fh:
+            return [CursorSample(**orjson.loads(line)) for line in fh if line.strip()]
+
+    def load_frames(self, session_dir: Path) -> Iterator[tuple[int, NDArray[np.uint8]]]:
+        """Iterate over the saved frames of a session in frame order.
+
+        Reads every layout written by ``record_frame``: one image file
+        per frame or tar shards (opened read-only), in any supported
+        ``frame_codec``, plus keyframe deltas when present.  Frames
+        are decoded lazily, one at a time.  Sessions recorded with
+        ``record_grayscale`` decode to single-channel images whatever
+        the codec.
+
+        Args:
+            session_dir: Path to a previously saved session directory.
 
-        return SessionMetadata(**raw)
+        Yields:
+            ``(frame_number, image)`` pairs.  Sessions recorded without
+            frames yield nothing.
+        """
+        frames_dir = session_dir / "frames"
+        meta_path = session_dir / "metadata.json"
+        grayscale = meta_path.exists() and bool(
+            orjson.loads(meta_path.read_bytes()).get("grayscale", False)
+        )
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_UNCHANGED
+        stored = self._load_stored_frames(frames_dir, flags)
+        index_path = frames_dir / "delta.json"
+        if not index_path.exists():
+            yield from stored
+            return
+
+        # Deltas always follow their keyframe, so grouping them by
+        # keyframe and emitting each group after it keeps frame order.
+        by_keyframe: dict[int, list[list[int]]] = {}
+        for entry in orjson.loads(index_path.read_bytes()):
+            by_keyframe.setdefault(entry[1], []).append(entry)
+        with (frames_dir / "delta.bin").open("rb") as fh:
+            for number, key in stored:
+                yield number, key
+                for frame_number, _, offset, length in by_keyframe.get(number, ()):
+                    fh.seek(offset)
+                    raw = zlib.decompress(fh.read(length))
+                    delta = np.frombuffer(raw, dtype=key.dtype).reshape(key.shape)
+                    yield frame_number, np.bitwise_xor(key, delta)
+
+    @staticmethod
+    def _load_stored_frames(
+        frames_dir: Path, flags: int
+    ) -> Iterator[tuple[int, NDArray[np.uint8]]]:
+        """Decode frames stored in full, from files or tar shards.
+
+        Args:
+            frames_dir: The session's ``frames/`` directory.
+            flags: OpenCV ``IMREAD_*`` flags for decoding.
+
+        Yields:
+            ``(frame_number, image)`` pairs in frame order.
+        """
+        shards = sorted(frames_dir.glob("*.tar"))
+        if not shards:
+            extensions = {ext for ext, _ in _FRAME_CODECS.values()}
+            paths = (p for p in frames_dir.glob("*") if p.suffix in extensions)
+            for path in sorted(paths):
+                yield int(path.stem), cv2.imread(str(path), flags)
+            return
+
+        for shard in shards:
+            with tarfile.open(shard, mode="r") as tar:
+                for member in tar:
+                    fh = tar.extractfile(member)
+                    if fh is None:
+                        continue
+                    data = np.frombuffer(fh.read(), dtype=np.uint8)
+                    image = cv2.imdecode(data, flags)
+                    yield int(Path(member.name).stem), image
 
     # -- Properties ----------------------------------------------------------
 
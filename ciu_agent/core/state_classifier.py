@@ -25,13 +25,17 @@ Typical usage::
 
 from __future__ import annotations
 
+import logging
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
 
 from ciu_agent.config.settings import Settings
 from ciu_agent.core.capture_engine import DiffResult
 from ciu_agent.platform.interface import WindowInfo
 
+logger = logging.getLogger(__name__)
+
 # Maximum area (in pixels) for a changed region to be considered
 # "small" — suitable for cursor-only, hover, or tooltip effects.
 _SMALL_REGION_AREA: int = 2_500
@@ -52,22 +56,184 @@ _CENTRE_PROXIMITY_FRACTION: float = 0.15
 # a vertical menu dropdown.
 _MENU_MIN_ASPECT_RATIO: float = 1.5
 
+# Classifications between distribution log lines when
+# ``profile_classifier`` is enabled.
+_PROFILE_LOG_INTERVAL: int = 20_000
+
+# Pixels by which a region is inflated before testing whether the
+# cursor lies inside it, for hover effects and for menus.
+_CURSOR_MARGIN: int = 50
+_MENU_CURSOR_MARGIN: int = 100
+
+
+class ChangeType(IntEnum):
+    """Classification of a detected screen change.
+
+    An ``IntEnum`` so that comparisons and the policy-table lookups on
+    every classified frame use C-level integer hashing and equality
+    instead of ``Enum``'s Python-level ``__hash__``.  Use ``label`` for
+    the lowercase name shown in logs and prompts.
+    """
+
+    NO_CHANGE = 0
+    CURSOR_ONLY = 1
+    HOVER_EFFECT = 2
+    TOOLTIP = 3
+    MENU_OPENED = 4
+    CONTENT_UPDATE = 5
+    DIALOG_APPEARED = 6
+    PAGE_NAVIGATION = 7
+    APP_SWITCH = 8
+
+    @property
+    def label(self) -> str:
+        """Lowercase name, e.g. ``"menu_opened"``."""
+        return self.name.lower()
+
+
+# Routing policy per change type as ``(tier, (should_wait, wait_ms))``.
+# A wait of ``None`` means the full ``stability_wait_ms`` from settings,
+# resolved per call.  The tier is the one assigned by the region-pattern
+# step; PAGE_NAVIGATION is raised to tier 2 when it comes from the
+# tier-2 change threshold instead.
+_CLASSIFICATION_TABLE: dict[ChangeType, tuple[int, tuple[bool, int] | None]] = {
+    ChangeType.NO_CHANGE: (0, (False, 0)),
+    ChangeType.CURSOR_ONLY: (0, (False, 0)),
+    ChangeType.HOVER_EFFECT: (1, (True, 100)),
+    ChangeType.TOOLTIP: (1, (True, 100)),
+    ChangeType.MENU_OPENED: (1, (True, 300)),
+    ChangeType.CONTENT_UPDATE: (1, (True, 300)),
+    ChangeType.DIALOG_APPEARED: (2, None),
+    ChangeType.PAGE_NAVIGATION: (1, None),
+    ChangeType.APP_SWITCH: (2, None),
+}
+
+
+def _classify_regions(
+    regions: Sequence[tuple[int, int, int, int]],
+    cx: int,
+    cy: int,
+) -> ChangeType:
+    """Classify a moderate change from its regions in one pass.
+
+    Total area, the union extent, cursor proximity, and the menu-shape
+    test are gathered in a single loop with the cursor offsets computed once per region,
+    instead of one generator or loop per metric.  Typical frames carry
+    a handful of regions, where a plain loop is cheaper than building
+    a NumPy array.
+
+    Args:
+        regions: Changed-region bounding boxes ``(x, y, w, h)``.
+        cx: Cursor x-coordinate.
+        cy: Cursor y-coordinate.
+
+    Returns:
+        The best-matching ``ChangeType``; see
+        ``StateClassifier._classify_by_region_pattern``.
+    """
+    if not regions:
+        return ChangeType.CONTENT_UPDATE
+
+    total_area = 0
+    max_x = max_y = 0
+    all_near_cursor = True
+    menu = False
+    for x, y, w, h in regions:
+        area = w * h
+        total_area += area
+        if x + w > max_x:
+            max_x = x + w
+        if y + h > max_y:
+            max_y = y + h
+        dx = cx - x
+        dy = cy - y
+        if all_near_cursor and not (
+            -_CURSOR_MARGIN <= dx <= w + _CURSOR_MARGIN
+            and -_CURSOR_MARGIN <= dy <= h + _CURSOR_MARGIN
+        ):
+            all_near_cursor = False
+        if (
+            not menu
+            and area <= _MEDIUM_REGION_AREA
+            and w > 0
+            and h / w >= _MENU_MIN_ASPECT_RATIO
+            and -_MENU_CURSOR_MARGIN <= dx <= w + _MENU_CURSOR_MARGIN
+            and -_MENU_CURSOR_MARGIN <= dy <= h + _MENU_CURSOR_MARGIN
+        ):
+            menu = True
+        if menu and not all_near_cursor:
+            # Hover is ruled out and a menu region was seen, so the
+            # menu branch wins without scanning the rest.
+            return ChangeType.MENU_OPENED
+
+    # --- Small near-cursor changes: hover or tooltip ---------------
+    if all_near_cursor and total_area <= _SMALL_REGION_AREA:
+        # Tooltip heuristic: a single new rectangular region that was
+        # not there before.  We approximate by checking whether there
+        # is exactly one region.
+        if len(regions) == 1:
+            return ChangeType.TOOLTIP
+        return ChangeType.HOVER_EFFECT
+
+    # --- Tall, narrow region near cursor: menu dropdown ------------
+    if menu:
+        return ChangeType.MENU_OPENED
+
+    # --- Centred moderate region: dialog / modal -------------------
+    if _has_centred_region(regions, max_x, max_y):
+        return ChangeType.DIALOG_APPEARED
+
+    # --- Single compact region: content update ---------------------
+    if len(regions) <= 3 and total_area <= _MEDIUM_REGION_AREA:
+        return ChangeType.CONTENT_UPDATE
+
+    # --- Fallback: many or large scattered changes -----------------
+    return ChangeType.PAGE_NAVIGATION
+
+
+def _has_centred_region(
+    regions: Sequence[tuple[int, int, int, int]],
+    max_x: int,
+    max_y: int,
+) -> bool:
+    """Check if any region is roughly centred on the screen.
+
+    Uses the union bounding box of all regions to estimate the screen
+    dimensions (this avoids coupling to the platform layer for
+    screen-size queries).  A region is "centred" when its centre is
+    within ``_CENTRE_PROXIMITY_FRACTION`` of the estimated screen
+    diagonal from the estimated screen centre.
+
+    Args:
+        regions: Changed-region bounding boxes.
+        max_x: Right edge of the union of *regions*, gathered by the
+            caller's pass over them.
+        max_y: Bottom edge of the union of *regions*.
+
+    Returns:
+        ``True`` if at least one medium-or-larger region is near the
+        screen centre.
+    """
+    # Guard against degenerate case.
+    if max_x == 0 or max_y == 0:
+        return False
 
-class ChangeType(Enum):
-    """Classification of a detected screen change."""
+    # Work in doubled coordinates so centres stay integral, and compare
+    # squared distances so no square roots are taken.
+    limit_sq = 4 * (max_x * max_x + max_y * max_y) * _CENTRE_PROXIMITY_FRACTION**2
 
-    NO_CHANGE = "no_change"
-    CURSOR_ONLY = "cursor_only"
-    HOVER_EFFECT = "hover_effect"
-    TOOLTIP = "tooltip"
-    MENU_OPENED = "menu_opened"
-    CONTENT_UPDATE = "content_update"
-    DIALOG_APPEARED = "dialog_appeared"
-    PAGE_NAVIGATION = "page_navigation"
-    APP_SWITCH = "app_switch"
+    for rx, ry, rw, rh in regions:
+        if rw * rh < _SMALL_REGION_AREA:
+            continue
+        dx = 2 * rx + rw - max_x
+        dy = 2 * ry + rh - max_y
+        if dx * dx + dy * dy <= limit_sq:
+            return True
 
+    return False
 
-@dataclass
+
+@dataclass(slots=True)
 class ChangeClassification:
     """Result of classifying a screen change.
 
@@ -75,7 +241,9 @@ class ChangeClassification:
         change_type: The high-level kind of change detected.
         tier: Recommended analysis tier (0, 1, or 2).
         regions: Bounding boxes ``(x, y, w, h)`` of regions
-            that downstream tiers should analyse.
+            that downstream tiers should analyse.  This is the diff's
+            own ``changed_regions`` list, not a copy, so treat it as
+            read-only.
         confidence: Classifier confidence in ``[0.0, 1.0]``.
         should_wait: ``True`` when an animation may still be in
             progress and the caller should delay further analysis.
@@ -85,7 +253,7 @@ class ChangeClassification:
 
     change_type: ChangeType
     tier: int
-    regions: list[tuple[int, int, int, int]] = field(
+    regions: Sequence[tuple[int, int, int, int]] = field(
         default_factory=list,
     )
     confidence: float = 1.0
@@ -118,6 +286,20 @@ class StateClassifier:
         """
         self._settings = settings
         self._last_active_window: str = ""
+        # Every idle frame gets the same answer, so it is built once and
+        # shared; its regions are an immutable empty tuple.
+        self._no_change = ChangeClassification(
+            change_type=ChangeType.NO_CHANGE,
+            tier=0,
+            regions=(),
+            confidence=1.0,
+            should_wait=False,
+            wait_ms=0,
+        )
+        self._branch_counts: dict[ChangeType, int] | None = (
+            dict.fromkeys(ChangeType, 0) if settings.profile_classifier else None
+        )
+        self._profiled = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -149,19 +331,46 @@ class StateClassifier:
 
         Returns:
             A ``ChangeClassification`` with tier recommendation and
-            the regions downstream tiers should examine.
+            the regions downstream tiers should examine.  ``NO_CHANGE``
+            results are one shared instance and must not be modified.
         """
         # 1. Below Tier 0 noise floor — nothing changed.
         if diff.changed_percent < self._settings.diff_threshold_percent:
-            return ChangeClassification(
-                change_type=ChangeType.NO_CHANGE,
-                tier=0,
-                regions=[],
-                confidence=1.0,
-                should_wait=False,
-                wait_ms=0,
-            )
+            if self._branch_counts is not None:
+                self._count_branch(ChangeType.NO_CHANGE)
+            return self._no_change
+
+        # 2-5. Everything else takes the slower heuristic path, kept in
+        # its own method so this idle-frame check stays small.
+        result = self._classify_change(diff, cursor_pos, active_window)
+        if self._branch_counts is not None:
+            self._count_branch(result.change_type)
+        return result
+
+    @property
+    def branch_counts(self) -> dict[ChangeType, int]:
+        """Classifications returned so far, per change type.
+
+        Empty unless ``profile_classifier`` is enabled.
+        """
+        return dict(self._branch_counts or {})
+
+    def _classify_change(
+        self,
+        diff: DiffResult,
+        cursor_pos: tuple[int, int],
+        active_window: WindowInfo | None,
+    ) -> ChangeClassification:
+        """Classify a change above the Tier 0 noise floor (steps 2-5).
 
+        Args:
+            diff: The Tier 0 diff result from ``CaptureEngine``.
+            cursor_pos: Current cursor position ``(x, y)``.
+            active_window: The focused window, or ``None``.
+
+        Returns:
+            A ``ChangeClassification`` for the change.
+        """
         # 2. Application switch — full Tier 2 rebuild.
         if self._check_app_switch(active_window):
             should_wait, wait_ms = self._estimate_stability_wait(
@@ -170,7 +379,7 @@ class StateClassifier:
             return ChangeClassification(
                 change_type=ChangeType.APP_SWITCH,
                 tier=2,
-                regions=list(diff.changed_regions),
+                regions=diff.changed_regions,
                 confidence=0.95,
                 should_wait=should_wait,
                 wait_ms=wait_ms,
@@ -181,7 +390,7 @@ class StateClassifier:
             return ChangeClassification(
                 change_type=ChangeType.CURSOR_ONLY,
                 tier=0,
-                regions=list(diff.changed_regions),
+                regions=diff.changed_regions,
                 confidence=0.9,
                 should_wait=False,
                 wait_ms=0,
@@ -195,7 +404,7 @@ class StateClassifier:
             return ChangeClassification(
                 change_type=ChangeType.PAGE_NAVIGATION,
                 tier=2,
-                regions=list(diff.changed_regions),
+                regions=diff.changed_regions,
                 confidence=0.85,
                 should_wait=should_wait,
                 wait_ms=wait_ms,
@@ -206,22 +415,38 @@ class StateClassifier:
             diff,
             cursor_pos,
         )
-        should_wait, wait_ms = self._estimate_stability_wait(
-            change_type,
-        )
-
-        # Dialogs may warrant tier 2 on the dialog region only.
-        tier = 2 if change_type == ChangeType.DIALOG_APPEARED else 1
+        # One lookup gives both the tier (dialogs may warrant tier 2 on
+        # the dialog region only) and the stability wait.
+        tier, wait = _CLASSIFICATION_TABLE[change_type]
+        should_wait, wait_ms = wait or (True, self._settings.stability_wait_ms)
 
         return ChangeClassification(
             change_type=change_type,
             tier=tier,
-            regions=list(diff.changed_regions),
+            regions=diff.changed_regions,
             confidence=0.7,
             should_wait=should_wait,
             wait_ms=wait_ms,
         )
 
+    def _count_branch(self, change_type: ChangeType) -> None:
+        """Record one classification and periodically log the totals.
+
+        Only called when ``profile_classifier`` is enabled.
+
+        Args:
+            change_type: The change type just returned by ``classify``.
+        """
+        assert self._branch_counts is not None
+        self._branch_counts[change_type] += 1
+        self._profiled += 1
+        if self._profiled % _PROFILE_LOG_INTERVAL == 0:
+            logger.info(
+                "Classifier distribution over %d frames: %s",
+                self._profiled,
+                ", ".join(f"{t.label}={n}" for t, n in self._branch_counts.items() if n),
+            )
+
     # ------------------------------------------------------------------
     # App-switch detection
     # ------------------------------------------------------------------
@@ -281,41 +506,20 @@ class StateClassifier:
         if not diff.changed_regions:
             return False
 
-        for region in diff.changed_regions:
-            x, y, w, h = region
-            area = w * h
-            if area > _SMALL_REGION_AREA:
+        # The area test is cheaper than the proximity test, so it runs
+        # first; both are inlined to avoid a method call per region.
+        cx, cy = cursor_pos
+        for x, y, w, h in diff.changed_regions:
+            if w * h > _SMALL_REGION_AREA:
                 return False
-            if not self._is_near_cursor(region, cursor_pos):
+            if not (
+                -_CURSOR_MARGIN <= cx - x <= w + _CURSOR_MARGIN
+                and -_CURSOR_MARGIN <= cy - y <= h + _CURSOR_MARGIN
+            ):
                 return False
 
         return True
 
-    def _is_near_cursor(
-        self,
-        region: tuple[int, int, int, int],
-        cursor_pos: tuple[int, int],
-        margin: int = 50,
-    ) -> bool:
-        """Check if a region is near the cursor position.
-
-        A region is considered near the cursor when the cursor lies
-        within the region inflated by *margin* pixels on every side.
-
-        Args:
-            region: Bounding box ``(x, y, w, h)``.
-            cursor_pos: Cursor position ``(cx, cy)``.
-            margin: Pixel margin added around the region before the
-                proximity test.
-
-        Returns:
-            ``True`` when the cursor is within the inflated region.
-        """
-        rx, ry, rw, rh = region
-        cx, cy = cursor_pos
-
-        return rx - margin <= cx <= rx + rw + margin and ry - margin <= cy <= ry + rh + margin
-
     # ------------------------------------------------------------------
     # Region-pattern classification
     # ------------------------------------------------------------------
@@ -342,99 +546,7 @@ class StateClassifier:
         Returns:
             The best-matching ``ChangeType``.
         """
-        regions = diff.changed_regions
-        if not regions:
-            return ChangeType.CONTENT_UPDATE
-
-        # Aggregate bounding-box metrics.
-        total_area = sum(w * h for _, _, w, h in regions)
-        all_near_cursor = all(self._is_near_cursor(r, cursor_pos) for r in regions)
-
-        # --- Small near-cursor changes: hover or tooltip -----------
-        if all_near_cursor and total_area <= _SMALL_REGION_AREA:
-            # Tooltip heuristic: a single new rectangular region
-            # that was not there before.  We approximate by checking
-            # whether there is exactly one region.
-            if len(regions) == 1:
-                return ChangeType.TOOLTIP
-            return ChangeType.HOVER_EFFECT
-
-        # --- Tall, narrow region near cursor: menu dropdown --------
-        for region in regions:
-            _, _, rw, rh = region
-            area = rw * rh
-            if (
-                area <= _MEDIUM_REGION_AREA
-                and rw > 0
-                and rh / rw >= _MENU_MIN_ASPECT_RATIO
-                and self._is_near_cursor(
-                    region,
-                    cursor_pos,
-                    margin=100,
-                )
-            ):
-                return ChangeType.MENU_OPENED
-
-        # --- Centred moderate region: dialog / modal ---------------
-        if self._has_centred_region(regions, diff):
-            return ChangeType.DIALOG_APPEARED
-
-        # --- Single compact region: content update -----------------
-        if len(regions) <= 3 and total_area <= _MEDIUM_REGION_AREA:
-            return ChangeType.CONTENT_UPDATE
-
-        # --- Fallback: many or large scattered changes -------------
-        return ChangeType.PAGE_NAVIGATION
-
-    def _has_centred_region(
-        self,
-        regions: list[tuple[int, int, int, int]],
-        diff: DiffResult,
-    ) -> bool:
-        """Check if any region is roughly centred on the screen.
-
-        Uses the union bounding box of all regions to estimate the
-        screen dimensions (this avoids coupling to the platform layer
-        for screen-size queries).  A region is "centred" when its
-        centre is within ``_CENTRE_PROXIMITY_FRACTION`` of the
-        estimated screen diagonal from the estimated screen centre.
-
-        Args:
-            regions: Changed-region bounding boxes.
-            diff: The diff result (used alongside *regions* for
-                screen-extent estimation).
-
-        Returns:
-            ``True`` if at least one medium-or-larger region is near
-            the screen centre.
-        """
-        if not regions:
-            return False
-
-        # Estimate screen extent from the union of all regions.
-        max_x = max(x + w for x, y, w, h in regions)
-        max_y = max(y + h for x, y, w, h in regions)
-
-        # Guard against degenerate case.
-        if max_x == 0 or max_y == 0:
-            return False
-
-        screen_cx = max_x / 2.0
-        screen_cy = max_y / 2.0
-        diag = (max_x**2 + max_y**2) ** 0.5
-        threshold = diag * _CENTRE_PROXIMITY_FRACTION
-
-        for rx, ry, rw, rh in regions:
-            area = rw * rh
-            if area < _SMALL_REGION_AREA:
-                continue
-            region_cx = rx + rw / 2.0
-            region_cy = ry + rh / 2.0
-            dist = ((region_cx - screen_cx) ** 2 + (region_cy - screen_cy) ** 2) ** 0.5
-            if dist <= threshold:
-                return True
-
-        return False
+        return _classify_regions(diff.changed_regions, *cursor_pos)
 
     # ------------------------------------------------------------------
     # Stability wait estimation
@@ -464,24 +576,7 @@ class StateClassifier:
               ``APP_SWITCH``: full ``stability_wait_ms`` from
               settings.
         """
-        no_wait: tuple[bool, int] = (False, 0)
-        short_wait: tuple[bool, int] = (True, 100)
-        medium_wait: tuple[bool, int] = (True, 300)
-        full_wait: tuple[bool, int] = (
+        return _CLASSIFICATION_TABLE[change_type][1] or (
             True,
             self._settings.stability_wait_ms,
         )
-
-        wait_map: dict[ChangeType, tuple[bool, int]] = {
-            ChangeType.NO_CHANGE: no_wait,
-            ChangeType.CURSOR_ONLY: no_wait,
-            ChangeType.HOVER_EFFECT: short_wait,
-            ChangeType.TOOLTIP: short_wait,
-            ChangeType.MENU_OPENED: medium_wait,
-            ChangeType.CONTENT_UPDATE: medium_wait,
-            ChangeType.DIALOG_APPEARED: full_wait,
-            ChangeType.PAGE_NAVIGATION: full_wait,
-            ChangeType.APP_SWITCH: full_wait,
-        }
-
-        return wait_map.get(change_type, full_wait)
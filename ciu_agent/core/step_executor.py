@@ -32,6 +32,7 @@ Typical usage::
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 from ciu_agent.config.settings import Settings
@@ -55,8 +56,15 @@ _ACTION_TYPE_MAP: dict[str, ActionType] = {
     "move": ActionType.MOVE,
 }
 
+# Bound once so ``execute`` resolves an action type with a single call.
+_lookup_action_type = _ACTION_TYPE_MAP.get
 
-@dataclass
+# Pseudo zone id for OS-level steps (shortcuts, typing) that target no
+# zone.  Compared with ``==`` so non-interned ids still match.
+_GLOBAL_ZONE_ID = "__global__"
+
+
+@dataclass(slots=True)
 class StepResult:
     """Result of executing a single ``TaskStep``.
 
@@ -90,6 +98,49 @@ class StepResult:
     error_type: str = ""
     timestamp: float = 0.0
 
+    @classmethod
+    def failure(
+        cls,
+        step: TaskStep,
+        error: str,
+        error_type: str,
+        timestamp: float,
+    ) -> StepResult:
+        """Build the result for a step that failed before reaching the brush.
+
+        Args:
+            step: The step that failed.
+            error: Human-readable error description.
+            error_type: Machine-readable error category.
+            timestamp: Execution timestamp.
+
+        Returns:
+            An unsuccessful ``StepResult`` with no action result or events.
+        """
+        return cls(step, False, None, [], error, error_type, timestamp)
+
+    @classmethod
+    def ok(
+        cls,
+        step: TaskStep,
+        action_result: BrushActionResult | None,
+        events: list[SpatialEvent],
+        timestamp: float,
+    ) -> StepResult:
+        """Build the result for a step that completed successfully.
+
+        Args:
+            step: The step that was executed.
+            action_result: The controller's result, or ``None`` for
+                ``__global__`` steps that bypass the brush.
+            events: Spatial events emitted during execution.
+            timestamp: Execution timestamp.
+
+        Returns:
+            A successful ``StepResult`` with empty error fields.
+        """
+        return cls(step, True, action_result, events, "", "", timestamp)
+
 
 class StepExecutor:
     """Executes individual ``TaskStep`` objects through the BrushController.
@@ -109,6 +160,8 @@ class StepExecutor:
             knobs such as per-step timeouts).
     """
 
+    __slots__ = ("_brush", "_registry", "_platform", "_settings", "_contains")
+
     def __init__(
         self,
         brush: BrushController,
@@ -120,6 +173,8 @@ class StepExecutor:
         self._registry = registry
         self._platform = platform
         self._settings = settings
+        # Bound once; ``execute`` checks the target zone on every step.
+        self._contains = registry.contains
 
     # ------------------------------------------------------------------
     # Public API
@@ -149,49 +204,39 @@ class StepExecutor:
             A ``StepResult`` describing the outcome.
         """
         # 1. Map action type string -> ActionType enum.
-        action_type = self._map_action_type(step.action_type)
+        action_type = _lookup_action_type(step.action_type)
         if action_type is None:
             logger.warning(
                 "step %d: unknown action_type %r",
                 step.step_number,
                 step.action_type,
             )
-            return StepResult(
-                step=step,
-                success=False,
-                action_result=None,
-                events=[],
-                error=f"Unknown action type: {step.action_type!r}",
-                error_type="action_failed",
-                timestamp=timestamp,
+            return StepResult.failure(
+                step, f"Unknown action type: {step.action_type!r}", "action_failed", timestamp
             )
 
         # 2. Handle __global__ zone (OS-level actions, no zone needed).
-        if step.zone_id == "__global__":
+        if step.zone_id == _GLOBAL_ZONE_ID:
             return self._execute_global(step, action_type, timestamp)
 
         # 3. Verify target zone exists.
-        if not self._registry.contains(step.zone_id):
+        if not self._contains(step.zone_id):
             logger.warning(
                 "step %d: zone %r not found in registry",
                 step.step_number,
                 step.zone_id,
             )
-            return StepResult(
-                step=step,
-                success=False,
-                action_result=None,
-                events=[],
-                error=f"Zone not found: {step.zone_id!r}",
-                error_type="zone_not_found",
-                timestamp=timestamp,
+            return StepResult.failure(
+                step, f"Zone not found: {step.zone_id!r}", "zone_not_found", timestamp
             )
 
-        # 4. Build the Action and execute.
+        # 4. Build the Action and execute.  Nothing downstream mutates
+        # the parameters, so the step's dict is shared rather than
+        # copied on every attempt.
         action = Action(
             type=action_type,
             target_zone_id=step.zone_id,
-            parameters=dict(step.parameters),
+            parameters=step.parameters,
         )
         brush_result = self._brush.execute_action(action, timestamp)
 
@@ -202,20 +247,6 @@ class StepExecutor:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _map_action_type(self, action_type_str: str) -> ActionType | None:
-        """Map a planner action-type string to an ``ActionType`` enum.
-
-        Args:
-            action_type_str: One of ``"click"``, ``"double_click"``,
-                ``"type_text"``, ``"key_press"``, ``"scroll"``,
-                ``"move"``.
-
-        Returns:
-            The corresponding ``ActionType``, or ``None`` if the
-            string is not recognised.
-        """
-        return _ACTION_TYPE_MAP.get(action_type_str)
-
     def _execute_global(
         self,
         step: TaskStep,
@@ -225,12 +256,14 @@ class StepExecutor:
         """Execute an OS-level action without targeting a specific zone.
 
         Used for keyboard shortcuts (Win+R, Ctrl+S, Alt+Tab, etc.) and
-        text input that are not tied to any visible UI element.
+        text input that are not tied to any visible UI element.  The
+        handler is picked from ``_GLOBAL_HANDLERS`` in one lookup.
 
         Supported action types:
 
         * ``KEY_PRESS`` -- sends a key or key combination.
         * ``TYPE_TEXT`` -- types a string of characters.
+        * ``CLICK`` -- clicks at absolute ``x``/``y`` coordinates.
 
         Args:
             step: The task step with ``zone_id == "__global__"``.
@@ -240,104 +273,112 @@ class StepExecutor:
         Returns:
             A ``StepResult`` describing the outcome.
         """
-        try:
-            if action_type == ActionType.KEY_PRESS:
-                key = step.parameters.get("key")
-                if not key:
-                    return StepResult(
-                        step=step,
-                        success=False,
-                        action_result=None,
-                        error="__global__ key_press missing 'key' parameter",
-                        error_type="action_failed",
-                        timestamp=timestamp,
-                    )
-                logger.info(
-                    "step %d: global key_press %r",
-                    step.step_number,
-                    key,
-                )
-                self._platform.key_press(key)
-
-            elif action_type == ActionType.TYPE_TEXT:
-                text = step.parameters.get("text")
-                if not text:
-                    return StepResult(
-                        step=step,
-                        success=False,
-                        action_result=None,
-                        error="__global__ type_text missing 'text' parameter",
-                        error_type="action_failed",
-                        timestamp=timestamp,
-                    )
-                logger.info(
-                    "step %d: global type_text (%d chars)",
-                    step.step_number,
-                    len(text),
-                )
-                self._platform.type_text(text)
-
-            elif action_type == ActionType.CLICK:
-                x = step.parameters.get("x")
-                y = step.parameters.get("y")
-                if x is None or y is None:
-                    return StepResult(
-                        step=step,
-                        success=False,
-                        action_result=None,
-                        error=(
-                            "__global__ click requires 'x' and 'y' "
-                            "parameters"
-                        ),
-                        error_type="action_failed",
-                        timestamp=timestamp,
-                    )
-                button = step.parameters.get("button", "left")
-                logger.info(
-                    "step %d: global click at (%s, %s)",
-                    step.step_number,
-                    x,
-                    y,
-                )
-                self._platform.click(int(x), int(y), button)
-
-            else:
-                return StepResult(
-                    step=step,
-                    success=False,
-                    action_result=None,
-                    error=(
-                        f"__global__ zone does not support action type "
-                        f"{action_type.value!r}"
-                    ),
-                    error_type="action_failed",
-                    timestamp=timestamp,
-                )
+        handler = self._GLOBAL_HANDLERS.get(action_type)
+        if handler is None:
+            return StepResult.failure(
+                step,
+                f"__global__ zone does not support action type {action_type.value!r}",
+                "action_failed",
+                timestamp,
+            )
 
+        try:
+            error = handler(self, step)
         except Exception as exc:
             logger.error(
                 "step %d: global action failed: %s",
                 step.step_number,
                 exc,
             )
-            return StepResult(
-                step=step,
-                success=False,
-                action_result=None,
-                error=str(exc),
-                error_type="action_failed",
-                timestamp=timestamp,
-            )
+            return StepResult.failure(step, str(exc), "action_failed", timestamp)
 
-        return StepResult(
-            step=step,
-            success=True,
-            action_result=None,
-            events=[],
-            error="",
-            error_type="",
-            timestamp=timestamp,
+        if error:
+            return StepResult.failure(step, error, "action_failed", timestamp)
+
+        return StepResult.ok(step, None, [], timestamp)
+
+    def _global_key_press(self, step: TaskStep) -> str:
+        """Send the step's ``key`` parameter as a key press.
+
+        Args:
+            step: The ``__global__`` key-press step.
+
+        Returns:
+            An error message, or an empty string once the key is sent.
+        """
+        key = step.parameters.get("key")
+        if not key:
+            return "__global__ key_press missing 'key' parameter"
+        logger.info(
+            "step %d: global key_press %r",
+            step.step_number,
+            key,
+        )
+        self._platform.key_press(key)
+        return ""
+
+    def _global_type_text(self, step: TaskStep) -> str:
+        """Type the step's ``text`` parameter.
+
+        Args:
+            step: The ``__global__`` type-text step.
+
+        Returns:
+            An error message, or an empty string once the text is typed.
+        """
+        text = step.parameters.get("text")
+        if not text:
+            return "__global__ type_text missing 'text' parameter"
+        logger.info(
+            "step %d: global type_text (%d chars)",
+            step.step_number,
+            len(text),
         )
+        self._platform.type_text(text)
+        return ""
+
+    def _global_click(self, step: TaskStep) -> str:
+        """Click at the step's absolute ``x``/``y`` parameters.
+
+        Args:
+            step: The ``__global__`` click step.
+
+        Returns:
+            An error message, or an empty string once the click is sent.
+        """
+        params = step.parameters
+        x = params.get("x")
+        y = params.get("y")
+        if x is None or y is None:
+            return "__global__ click requires 'x' and 'y' parameters"
+        button = params.get("button", "left")
+        logger.info(
+            "step %d: global click at (%s, %s)",
+            step.step_number,
+            x,
+            y,
+        )
+        self._platform.click(int(x), int(y), button)
+        return ""
+
+    # ------------------------------------------------------------------
+    # Global dispatch table
+    # ------------------------------------------------------------------
+
+    # Each handler returns an error message, or an empty string once the
+    # action has been sent to the platform.
+    _GLOBAL_HANDLERS: dict[
+        ActionType,
+        Callable[[StepExecutor, TaskStep], str],
+    ] = {
+        ActionType.KEY_PRESS: _global_key_press,
+        ActionType.TYPE_TEXT: _global_type_text,
+        ActionType.CLICK: _global_click,
+    }
+
+    # ------------------------------------------------------------------
+    # Result translation
+    # ------------------------------------------------------------------
 
     def _translate_result(
         self,
@@ -357,33 +398,24 @@ class StepExecutor:
             timestamp: Execution timestamp.
 
         Returns:
-            A fully populated ``StepResult``.
+            A fully populated ``StepResult``.  Its ``events`` list is
+            the brush result's own list; the controller builds a new
+            one per action, so no copy is taken.
         """
         if brush_result.success:
-            return StepResult(
-                step=step,
-                success=True,
-                action_result=brush_result,
-                events=list(brush_result.events),
-                error="",
-                error_type="",
-                timestamp=timestamp,
-            )
+            return StepResult.ok(step, brush_result, brush_result.events, timestamp)
 
         # Determine error category.
-        if not brush_result.navigation.success:
-            error_type = "brush_lost"
-        else:
-            error_type = "action_failed"
+        error_type = "action_failed" if brush_result.navigation.success else "brush_lost"
 
         return StepResult(
-            step=step,
-            success=False,
-            action_result=brush_result,
-            events=list(brush_result.events),
-            error=brush_result.error,
-            error_type=error_type,
-            timestamp=timestamp,
+            step,
+            False,
+            brush_result,
+            brush_result.events,
+            brush_result.error,
+            error_type,
+            timestamp,
         )
 
     # ------------------------------------------------------------------
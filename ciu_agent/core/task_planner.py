@@ -10,7 +10,8 @@ It follows the same httpx / retry / backoff conventions as
 ``Tier2Analyzer``.
 
 Dependencies: ``models.zone``, ``config.settings``, ``httpx``,
-``json`` (stdlib).
+``orjson``.  Optional: ``h2`` (``pip install httpx[http2]``), which
+enables HTTP/2 to the API.
 
 Typical usage::
 
@@ -28,32 +29,73 @@ Typical usage::
 
 from __future__ import annotations
 
-import json
+import asyncio
+import heapq
+import importlib.util
 import logging
 import os
+import random
 import re
+import threading
 import time
+from dataclasses import dataclass, field, replace
 
 import httpx
+import orjson
 
 from ciu_agent.config.settings import Settings
+from ciu_agent.core.plan_cache import PlanCache, plan_fingerprint
 from ciu_agent.models.task import TaskPlan, TaskStep
-from ciu_agent.models.zone import Zone
+from ciu_agent.models.zone import Zone, ZoneState, ZoneType
 
 logger = logging.getLogger(__name__)
 
 # Anthropic Messages API endpoint.
 _API_URL: str = "https://api.anthropic.com/v1/messages"
 
+# Message Batches endpoint for offline bulk planning.
+_BATCH_API_URL: str = _API_URL + "/batches"
+
+# Upper bound on any single retry delay, including server-requested
+# ``retry-after`` values.
+_MAX_BACKOFF_SECONDS: float = 30.0
+
+# Default seconds between status polls of a submitted batch.
+_BATCH_POLL_SECONDS: float = 30.0
+
+# Default limit on how long to poll a batch: the API expires batches
+# that have not ended within 24 hours.
+_BATCH_TIMEOUT_SECONDS: float = 24 * 60 * 60.0
+
 # Model used for task planning.
 _MODEL: str = "claude-sonnet-4-20250514"
 
 # Max tokens for a plan response (plans are shorter than zone analysis).
 _MAX_TOKENS: int = 2048
 
+# Zone labels longer than this are truncated in the prompt.  Tier 2
+# occasionally returns whole paragraphs as a label; the first few words
+# identify the element just as well and cost far fewer tokens.
+_MAX_LABEL_CHARS: int = 60
+
 # Anthropic API version header.
 _API_VERSION: str = "2023-06-01"
 
+# Connection pool for the planner's long-lived HTTP client.  Idle
+# connections are kept for 30 s so replans within a task reuse the
+# TCP + TLS session instead of handshaking again.
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=4,
+    max_connections=8,
+    keepalive_expiry=30.0,
+)
+
+# Use HTTP/2 when the optional ``h2`` package is installed: concurrent
+# ``aplan`` calls then share one multiplexed connection instead of
+# opening one each.  httpx refuses ``http2=True`` without ``h2``, so
+# fall back to HTTP/1.1 rather than fail.
+_HTTP2: bool = importlib.util.find_spec("h2") is not None
+
 # ------------------------------------------------------------------
 # System prompt that instructs Claude to return a step-by-step plan.
 # ------------------------------------------------------------------
@@ -155,6 +197,247 @@ _SYSTEM_PROMPT: str = (
     "using visual mode.\n"
 )
 
+# Rules-only variant of the system prompt: the same output schema and
+# visual/command mode guidance, without the step-by-step methodology
+# and shortcut examples.  Roughly a quarter of the size, for callers
+# that plan many one-off tasks and pay for cache misses.
+_SYSTEM_PROMPT_COMPACT: str = (
+    "You plan GUI tasks for a desktop automation agent. Given a task, "
+    "the OS, and the UI zones visible on screen, return ONLY a JSON "
+    "array of steps. Each step is an object with: step_number (int), "
+    'zone_id (a zone ID from the list, or "__global__" for OS-level '
+    "keyboard actions), zone_label, action_type (one of: click, "
+    "double_click, type_text, key_press, scroll), parameters (e.g. "
+    '{"text": "hello"}, {"key": "enter"}, {"button": "left"}), '
+    "expected_change, description.\n"
+    "Rules:\n"
+    "- Prefer a visible zone's zone_id; use __global__ only when no "
+    "matching zone exists.\n"
+    "- Use the OS's own shortcuts and launcher.\n"
+    "- If the target app is not visible, include steps to launch it "
+    "first; later steps will see its new zones.\n"
+    "- Click a text field before type_text on it.\n"
+    "- Keep plans under 20 steps.\n"
+)
+
+# Closing line of the user message for each prompt variant.
+_PLAN_REQUEST: str = (
+    "Following the methodology in the system prompt, produce "
+    "a step-by-step plan to accomplish this task."
+)
+_PLAN_REQUEST_COMPACT: str = (
+    "Produce a step-by-step plan to accomplish this task."
+)
+
+# Stand-in for the user text when pre-encoding the request body.  The
+# NUL characters keep it from colliding with anything else in the
+# payload.
+_USER_TEXT_SLOT: str = "\x00user_text\x00"
+
+# The system prompt as a content block marked for server-side prompt
+# caching.  It is identical on every request, so after the first call
+# Claude reads it from cache instead of reprocessing its tokens.  Built
+# once and shared by every payload.
+_SYSTEM_PROMPT_BLOCK: list[dict] = [
+    {
+        "type": "text",
+        "text": _SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+_SYSTEM_PROMPT_COMPACT_BLOCK: list[dict] = [
+    {
+        "type": "text",
+        "text": _SYSTEM_PROMPT_COMPACT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+
+# ------------------------------------------------------------------
+# Zone relevance
+# ------------------------------------------------------------------
+
+# Zone types the agent can act on; static and unknown zones rank lower.
+_INTERACTIVE_TYPES: frozenset[ZoneType] = frozenset(ZoneType) - {
+    ZoneType.STATIC,
+    ZoneType.UNKNOWN,
+}
+
+# Task words too common to say anything about which zone is meant.
+_STOP_WORDS: frozenset[str] = frozenset(
+    "an and at by for in it of on or the then to with".split()
+)
+
+
+def _rank_zones(task: str, zones: list[Zone], k: int) -> list[Zone]:
+    """Return the *k* zones most likely to matter for *task*.
+
+    Each zone scores 3 if it is interactive, 1 per task word found in
+    its label, and 0.5 if it has focus.  Ties keep the earlier zone,
+    and the result stays in the original screen order so the summary
+    still reads top-to-bottom.
+
+    Args:
+        task: Natural-language description of the task.
+        zones: All zones currently on screen.
+        k: Number of zones to keep.
+
+    Returns:
+        At most *k* zones from *zones*, in their original order.
+    """
+    words = {
+        word
+        for word in re.findall(r"\w+", task.lower())
+        if len(word) > 1 and word not in _STOP_WORDS
+    }
+
+    def score(index: int) -> tuple[float, int]:
+        zone = zones[index]
+        label = zone.label.lower()
+        value = 3.0 if zone.type in _INTERACTIVE_TYPES else 0.0
+        value += sum(1 for word in words if word in label)
+        if zone.state is ZoneState.FOCUSED:
+            value += 0.5
+        return value, -index
+
+    keep = heapq.nlargest(k, range(len(zones)), key=score)
+    return [zones[index] for index in sorted(keep)]
+
+
+# ------------------------------------------------------------------
+# Local shortcut plans
+# ------------------------------------------------------------------
+
+# Tasks that are nothing but a single well-known keyboard shortcut.
+# Each rule is (pattern, zone keyword, keys by platform, expected
+# change).  The pattern must match the whole normalised task, so
+# "save" qualifies but "save the report as PDF" goes to the API.  The
+# plan is skipped when a visible zone's label contains the keyword,
+# since the planner prefers clicking a visible control.  Platforms
+# missing from the key map (``""`` is the default) fall through to
+# the API.
+_SHORTCUT_RULES: tuple[
+    tuple[re.Pattern[str], str, dict[str, str], str], ...
+] = (
+    (
+        re.compile(r"save(?: (?:the )?(?:current )?(?:file|document))?"),
+        "save",
+        {"": "ctrl+s", "macos": "cmd+s"},
+        "The file is saved",
+    ),
+    (
+        re.compile(r"undo(?: that| the last (?:change|action))?"),
+        "undo",
+        {"": "ctrl+z", "macos": "cmd+z"},
+        "The last change is undone",
+    ),
+    (
+        re.compile(r"select all(?: text)?"),
+        "select all",
+        {"": "ctrl+a", "macos": "cmd+a"},
+        "All content is selected",
+    ),
+    (
+        re.compile(r"copy(?: (?:the )?(?:selection|selected text))?"),
+        "copy",
+        {"": "ctrl+c", "macos": "cmd+c"},
+        "The selection is copied to the clipboard",
+    ),
+    (
+        re.compile(r"paste(?: from the clipboard)?"),
+        "paste",
+        {"": "ctrl+v", "macos": "cmd+v"},
+        "The clipboard content is pasted",
+    ),
+    (
+        re.compile(r"close(?: the)?(?: current| active)? window"),
+        "close",
+        {"": "alt+f4", "macos": "cmd+w"},
+        "The active window closes",
+    ),
+    (
+        re.compile(r"open(?: the)? run dialog"),
+        "run",
+        {"windows": "win+r"},
+        "The Run dialog opens",
+    ),
+)
+
+
+# ------------------------------------------------------------------
+# Request coalescing
+# ------------------------------------------------------------------
+
+
+@dataclass
+class _Flight:
+    """A synchronous plan request that other callers may wait on."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    plan: TaskPlan | None = None
+
+
+def _shared_plan(plan: TaskPlan, task: str) -> TaskPlan:
+    """Return a copy of a coalesced plan for a waiting caller.
+
+    The copy carries the caller's own task text and reports no API
+    calls, since the leading caller already accounted for them.
+    """
+    return replace(
+        plan,
+        task_description=task,
+        steps=list(plan.steps),
+        api_calls_used=0,
+    )
+
+
+# ------------------------------------------------------------------
+# Request outcomes (shared by the sync and async paths)
+# ------------------------------------------------------------------
+
+
+def _retryable(status: int) -> bool:
+    """Return whether an HTTP status is worth retrying.
+
+    Rate limits and server errors (including 529 overloaded) are
+    transient; other client errors will not recover.
+    """
+    return status == 429 or status >= 500
+
+
+def _status_error(http_resp: httpx.Response) -> str:
+    """Return the error text for a non-200 API response."""
+    return f"HTTP {http_resp.status_code}: {http_resp.text[:200]}"
+
+
+def _log_attempt(attempt: int, retries: int, error: str) -> str:
+    """Log a failed attempt and return its error text."""
+    logger.warning(
+        "TaskPlanner: attempt %d/%d failed: %s",
+        attempt + 1,
+        retries,
+        error,
+    )
+    return error
+
+
+def _failed_plan(
+    task: str,
+    error: str,
+    api_calls: int = 0,
+    latency_ms: float = 0.0,
+) -> TaskPlan:
+    """Return an unsuccessful ``TaskPlan`` carrying *error*."""
+    return TaskPlan(
+        task_description=task,
+        success=False,
+        error=error,
+        api_calls_used=api_calls,
+        latency_ms=latency_ms,
+    )
+
 
 # ------------------------------------------------------------------
 # Planner
@@ -177,6 +460,9 @@ class TaskPlanner:
         settings: Settings,
         api_key: str = "",
         platform_name: str = "",
+        compact: bool = False,
+        stream: bool = False,
+        shortcuts: bool = False,
     ) -> None:
         """Initialise with settings and optional API key.
 
@@ -190,12 +476,83 @@ class TaskPlanner:
             platform_name: OS identifier (e.g. ``'windows'``,
                 ``'linux'``, ``'macos'``) included in prompts so
                 the planner can choose correct shortcuts.
+            compact: When True, send the shorter rules-only system
+                prompt instead of the full methodology.  Cheaper on
+                input tokens, at some cost in plan quality for
+                multi-application tasks.
+            stream: When True, ``plan`` and ``aplan`` request a
+                streamed (server-sent events) response.  Text arrives
+                as it is generated, so long plans cannot hit the read
+                timeout while the model is still writing.
+            shortcuts: When True, tasks that are a single well-known
+                keyboard shortcut ("save", "undo", "close window")
+                are planned locally without an API call.
         """
         self._settings = settings
         self._api_key: str = api_key or os.environ.get(
             "ANTHROPIC_API_KEY", ""
         )
         self._platform_name = platform_name
+        self._system_block = (
+            _SYSTEM_PROMPT_COMPACT_BLOCK
+            if compact
+            else _SYSTEM_PROMPT_BLOCK
+        )
+        self._plan_request = (
+            _PLAN_REQUEST_COMPACT if compact else _PLAN_REQUEST
+        )
+        self._stream = stream
+        self._shortcuts = shortcuts
+        self._body_prefix, self._body_suffix = self._body_template()
+        # Requests in flight, keyed by plan fingerprint.
+        self._flights: dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        self._aflights: dict[str, asyncio.Future[TaskPlan]] = {}
+        self._client: httpx.Client | None = None
+        self._cache: PlanCache | None = (
+            PlanCache(
+                settings.plan_cache_size,
+                path=settings.plan_cache_path or None,
+                ttl_seconds=settings.plan_cache_ttl_seconds,
+                platform=platform_name,
+            )
+            if settings.plan_cache_size > 0
+            else None
+        )
+        self._aclient: httpx.AsyncClient | None = None
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
+
+    # -- Lifecycle ---------------------------------------------------
+
+    def close(self) -> None:
+        """Close the pooled HTTP client, if one is open.
+
+        Safe to call more than once.  A later ``plan`` call opens a
+        fresh client.
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both the async and the sync pooled HTTP clients.
+
+        Call from the event loop that ran ``aplan``.  Safe to call more
+        than once.
+        """
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+        self.close()
+
+    def __enter__(self) -> TaskPlanner:
+        """Return the planner for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the pooled HTTP client on leaving the ``with`` block."""
+        self.close()
 
     # -- Zone summarisation ----------------------------------------
 
@@ -203,7 +560,8 @@ class TaskPlanner:
         """Format a zone list into a text summary for the prompt.
 
         Each zone is rendered on a single line with its id, label,
-        type, state, and center coordinates.
+        type, state, and center coordinates.  Labels longer than
+        ``_MAX_LABEL_CHARS`` are cut short to keep the prompt small.
 
         Args:
             zones: The zones to summarise.
@@ -216,11 +574,13 @@ class TaskPlanner:
 
         lines: list[str] = []
         for zone in zones:
-            cx, cy = zone.bounds.center()
+            # Cached on the rectangle, so replans over the same zones
+            # do not recompute centers.
+            ext = zone.bounds.extents()
             lines.append(
-                f"- id={zone.id}  label=\"{zone.label}\"  "
+                f"- id={zone.id}  label=\"{zone.label[:_MAX_LABEL_CHARS]}\"  "
                 f"type={zone.type.value}  state={zone.state.value}  "
-                f"center=({cx}, {cy})"
+                f"center=({ext[4]}, {ext[5]})"
             )
         return "\n".join(lines)
 
@@ -239,30 +599,59 @@ class TaskPlanner:
         Returns:
             A dictionary matching the Anthropic Messages API schema.
         """
-        zone_summary = self._summarize_zones(zones)
+        return self._payload(self._user_text(task, zones))
+
+    def _user_text(self, task: str, zones: list[Zone]) -> str:
+        """Return the user message text for *task* on *zones*.
+
+        Args:
+            task: Natural-language description of the task.
+            zones: Currently available UI zones on screen.
+
+        Returns:
+            The task, OS line, and zone summary as one string.
+        """
+        limit = self._settings.plan_max_zones
+        if 0 < limit < len(zones):
+            shown = _rank_zones(task, zones, limit)
+            heading = (
+                f"The {limit} zones most relevant to the task:\n"
+            )
+        else:
+            shown = zones
+            heading = "Available zones on screen:\n"
+        zone_summary = self._summarize_zones(shown)
         os_line = (
             f"Operating system: {self._platform_name}\n"
             if self._platform_name
             else ""
         )
 
-        user_text = (
+        return (
             f"Task: {task}\n"
             "\n"
             f"{os_line}"
             f"Number of zones detected: {len(zones)}\n"
             "\n"
-            "Available zones on screen:\n"
+            f"{heading}"
             f"{zone_summary}\n"
             "\n"
-            "Following the methodology in the system prompt, produce "
-            "a step-by-step plan to accomplish this task."
+            f"{self._plan_request}"
         )
 
+    def _payload(self, user_text: str) -> dict:
+        """Wrap *user_text* in a Messages API payload.
+
+        Args:
+            user_text: The user message text.
+
+        Returns:
+            A dictionary matching the Anthropic Messages API schema.
+        """
         payload: dict = {
             "model": _MODEL,
             "max_tokens": _MAX_TOKENS,
-            "system": _SYSTEM_PROMPT,
+            "system": self._system_block,
             "messages": [
                 {
                     "role": "user",
@@ -306,8 +695,8 @@ class TaskPlanner:
             return []
 
         try:
-            data = json.loads(cleaned)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as exc:
             logger.error("TaskPlanner: JSON decode failed: %s", exc)
             return []
 
@@ -344,6 +733,12 @@ class TaskPlanner:
         calls the Claude API with retry and exponential back-off, then
         parses the response into ``TaskStep`` objects.
 
+        When the plan cache is enabled (``plan_cache_size`` > 0), a
+        plan already produced for the same task and zones is returned
+        without an API call.  Concurrent calls for the same task and
+        zones share a single request: later callers wait for the first
+        one's plan instead of sending their own.
+
         Args:
             task: Natural-language description of the task to
                 accomplish.
@@ -355,19 +750,69 @@ class TaskPlanner:
             On failure ``success`` is ``False`` and ``error`` contains
             a description.
         """
+        if self._shortcuts:
+            local = self._shortcut_plan(task, zones)
+            if local is not None:
+                return local
+
+        # One fingerprint serves the cache lookup, the in-flight map,
+        # and the cache store; hashing the zones is not free.
+        key = plan_fingerprint(task, zones, self._platform_name)
+        if self._cache is not None:
+            cached = self._cache.get(task, zones, key=key)
+            if cached is not None:
+                logger.info("TaskPlanner: reusing cached plan")
+                return cached
+
+        # Single-flight: a caller asking for the same task and zones
+        # while a request is running waits for that request's plan.
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.plan is not None:
+                logger.info("TaskPlanner: sharing in-flight plan")
+                return _shared_plan(flight.plan, task)
+            # The leader raised; make our own request instead.
+            return self._request_plan(task, zones, key)
+
+        try:
+            flight.plan = self._request_plan(task, zones, key)
+            return flight.plan
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _request_plan(
+        self,
+        task: str,
+        zones: list[Zone],
+        key: str,
+    ) -> TaskPlan:
+        """Call the API for a plan, with retry and back-off.
+
+        The uncached, uncoalesced body of ``plan``.
+
+        Args:
+            task: Natural-language description of the task.
+            zones: Currently available UI zones on screen.
+            key: The plan fingerprint, used to store the plan in
+                the cache.
+
+        Returns:
+            A ``TaskPlan``, as for ``plan``.
+        """
         if not self._api_key:
-            return TaskPlan(
-                task_description=task,
-                success=False,
-                error="No API key configured.",
-            )
+            return _failed_plan(task, "No API key configured.")
 
-        payload = self.build_prompt(task, zones)
+        body = self._request_body(task, zones)
         headers = self._build_headers()
-        timeout = httpx.Timeout(
-            self._settings.api_timeout_text_seconds,
-            connect=10.0,
-        )
+        client = self._get_client()
 
         last_error = ""
         elapsed_ms = 0.0
@@ -376,67 +821,475 @@ class TaskPlanner:
 
         for attempt in range(retries):
             api_calls += 1
+            retry_after: str | None = None
             start_ns = time.monotonic_ns()
             try:
-                with httpx.Client(timeout=timeout) as client:
-                    http_resp = client.post(
-                        _API_URL,
-                        headers=headers,
-                        json=payload,
-                    )
+                http_resp = client.post(
+                    _API_URL,
+                    headers=headers,
+                    content=body,
+                )
                 elapsed_ms = (
                     (time.monotonic_ns() - start_ns) / 1_000_000
                 )
-
                 if http_resp.status_code == 200:
-                    return self._handle_success(
-                        http_resp, task, elapsed_ms, api_calls
+                    return self._accept(
+                        http_resp, task, zones, key, elapsed_ms, api_calls
                     )
+                last_error = _log_attempt(
+                    attempt, retries, _status_error(http_resp)
+                )
+                if not _retryable(http_resp.status_code):
+                    break
+                retry_after = http_resp.headers.get("retry-after")
 
-                last_error = (
-                    f"HTTP {http_resp.status_code}: "
-                    f"{http_resp.text[:200]}"
+            except httpx.HTTPError as exc:
+                elapsed_ms = (
+                    (time.monotonic_ns() - start_ns) / 1_000_000
                 )
-                logger.warning(
-                    "TaskPlanner: attempt %d/%d failed: %s",
-                    attempt + 1,
-                    retries,
-                    last_error,
+                last_error = _log_attempt(
+                    attempt, retries, f"{type(exc).__name__}: {exc}"
                 )
 
-                # Only retry on transient server errors.
-                if http_resp.status_code < 500:
+            # Jittered exponential back-off before next attempt.
+            if attempt < retries - 1:
+                time.sleep(self._backoff_delay(attempt, retry_after))
+
+        return _failed_plan(task, last_error, api_calls, elapsed_ms)
+
+    def _shortcut_plan(
+        self,
+        task: str,
+        zones: list[Zone],
+    ) -> TaskPlan | None:
+        """Return a one-step keyboard plan if *task* is a known shortcut.
+
+        Args:
+            task: Natural-language description of the task.
+            zones: Currently available UI zones on screen.
+
+        Returns:
+            A successful single-step ``TaskPlan`` using a
+            ``__global__`` key press, or ``None`` when the task needs
+            the API.
+        """
+        norm = " ".join(task.lower().split()).rstrip(".!")
+        for pattern, keyword, keys, expected in _SHORTCUT_RULES:
+            if pattern.fullmatch(norm) is None:
+                continue
+            key = keys.get(self._platform_name, keys.get(""))
+            if key is None:
+                return None
+            if any(keyword in zone.label.lower() for zone in zones):
+                return None
+            logger.info(
+                "TaskPlanner: planned %r locally as %s", task, key
+            )
+            step = TaskStep(
+                step_number=1,
+                zone_id="__global__",
+                zone_label="keyboard",
+                action_type="key_press",
+                parameters={"key": key},
+                expected_change=expected,
+                description=f"Press {key}",
+            )
+            return TaskPlan(
+                task_description=task,
+                steps=[step],
+                success=True,
+            )
+        return None
+
+    def forget(self, task: str) -> None:
+        """Drop any cached plans for *task*.
+
+        The Director calls this before replanning, so a plan that did
+        not work is requested afresh rather than served from the
+        cache.  A no-op when the plan cache is disabled.
+
+        Args:
+            task: Natural-language task description.
+        """
+        if self._cache is not None:
+            self._cache.discard(task)
+
+    # -- Async planning ---------------------------------------------
+
+    async def aplan(self, task: str, zones: list[Zone]) -> TaskPlan:
+        """Async version of ``plan``.
+
+        Uses a pooled ``httpx.AsyncClient`` and ``asyncio.sleep`` for
+        back-off, so several plans can be in flight at once and the
+        caller's event loop is never blocked.  Retry logic is shared
+        with the sync path.
+
+        Args:
+            task: Natural-language description of the task to
+                accomplish.
+            zones: Currently available UI zones on screen.
+
+        Returns:
+            A ``TaskPlan`` describing the steps, as for ``plan``.
+        """
+        if self._shortcuts:
+            local = self._shortcut_plan(task, zones)
+            if local is not None:
+                return local
+
+        key = plan_fingerprint(task, zones, self._platform_name)
+        if self._cache is not None:
+            cached = self._cache.get(task, zones, key=key)
+            if cached is not None:
+                logger.info("TaskPlanner: reusing cached plan")
+                return cached
+
+        # Single-flight, as in ``plan``.  The request runs as its own
+        # task and callers await it through ``shield``, so cancelling
+        # one caller does not cancel the request for the others.
+        pending = self._aflights.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._arequest_plan(task, zones, key)
+            )
+            self._aflights[key] = pending
+
+            def _land(done: asyncio.Future[TaskPlan]) -> None:
+                if self._aflights.get(key) is done:
+                    del self._aflights[key]
+
+            pending.add_done_callback(_land)
+            return await asyncio.shield(pending)
+
+        logger.info("TaskPlanner: sharing in-flight plan")
+        return _shared_plan(await asyncio.shield(pending), task)
+
+    async def _arequest_plan(
+        self,
+        task: str,
+        zones: list[Zone],
+        key: str,
+    ) -> TaskPlan:
+        """Async counterpart of ``_request_plan``.
+
+        Args:
+            task: Natural-language description of the task.
+            zones: Currently available UI zones on screen.
+            key: The plan fingerprint.
+
+        Returns:
+            A ``TaskPlan``, as for ``plan``.
+        """
+        if not self._api_key:
+            return _failed_plan(task, "No API key configured.")
+
+        body = self._request_body(task, zones)
+        headers = self._build_headers()
+        client = self._get_async_client()
+
+        last_error = ""
+        elapsed_ms = 0.0
+        retries = self._settings.api_max_retries
+        api_calls = 0
+
+        for attempt in range(retries):
+            api_calls += 1
+            retry_after: str | None = None
+            start_ns = time.monotonic_ns()
+            try:
+                http_resp = await client.post(
+                    _API_URL,
+                    headers=headers,
+                    content=body,
+                )
+                elapsed_ms = (
+                    (time.monotonic_ns() - start_ns) / 1_000_000
+                )
+                if http_resp.status_code == 200:
+                    return self._accept(
+                        http_resp, task, zones, key, elapsed_ms, api_calls
+                    )
+                last_error = _log_attempt(
+                    attempt, retries, _status_error(http_resp)
+                )
+                if not _retryable(http_resp.status_code):
                     break
+                retry_after = http_resp.headers.get("retry-after")
 
             except httpx.HTTPError as exc:
                 elapsed_ms = (
                     (time.monotonic_ns() - start_ns) / 1_000_000
                 )
-                last_error = f"{type(exc).__name__}: {exc}"
-                logger.warning(
-                    "TaskPlanner: attempt %d/%d error: %s",
-                    attempt + 1,
-                    retries,
-                    last_error,
+                last_error = _log_attempt(
+                    attempt, retries, f"{type(exc).__name__}: {exc}"
                 )
 
-            # Exponential back-off before next attempt.
+            # Jittered exponential back-off before next attempt.
             if attempt < retries - 1:
-                delay = self._settings.api_backoff_base_seconds * (
-                    2**attempt
+                await asyncio.sleep(
+                    self._backoff_delay(attempt, retry_after)
                 )
-                time.sleep(delay)
 
-        return TaskPlan(
-            task_description=task,
-            success=False,
-            error=last_error,
-            api_calls_used=api_calls,
-            latency_ms=elapsed_ms,
+        return _failed_plan(task, last_error, api_calls, elapsed_ms)
+
+    async def aplan_batch(
+        self,
+        items: list[tuple[str, list[Zone]]],
+        concurrency: int = 5,
+    ) -> list[TaskPlan]:
+        """Plan several tasks concurrently.
+
+        At most *concurrency* requests are in flight at once, which
+        keeps bursts inside the API's rate limits.
+
+        Args:
+            items: ``(task, zones)`` pairs to plan.
+            concurrency: Maximum number of simultaneous API requests.
+
+        Returns:
+            One ``TaskPlan`` per item, in the same order as *items*.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(task: str, zones: list[Zone]) -> TaskPlan:
+            async with sem:
+                return await self.aplan(task, zones)
+
+        return list(
+            await asyncio.gather(*(_one(t, z) for t, z in items))
         )
 
+    # -- Offline batch planning -------------------------------------
+
+    def plan_batch_offline(
+        self,
+        items: list[tuple[str, list[Zone]]],
+        poll_interval: float = _BATCH_POLL_SECONDS,
+        timeout: float = _BATCH_TIMEOUT_SECONDS,
+    ) -> list[TaskPlan]:
+        """Plan many tasks through the Message Batches API.
+
+        Meant for non-interactive work such as regression runs or
+        replaying recorded sessions: batched requests cost half as
+        much and are not bound by the per-minute rate limits, but
+        results can take minutes to arrive.  The call blocks, polling
+        every *poll_interval* seconds, until the batch has ended or
+        *timeout* seconds have passed.
+
+        Args:
+            items: ``(task, zones)`` pairs to plan.
+            poll_interval: Seconds to wait between status polls.
+            timeout: Seconds after which polling stops.  The batch
+                itself is left to finish or expire on the server.
+
+        Returns:
+            One ``TaskPlan`` per item, in the same order as *items*.
+            If the batch cannot be submitted, fetched, or parsed, or
+            does not end in time, every plan fails with the same
+            error.
+        """
+        if not items:
+            return []
+        if not self._api_key:
+            return [
+                _failed_plan(task, "No API key configured.")
+                for task, _ in items
+            ]
+
+        requests = [
+            {
+                "custom_id": f"plan_{idx}",
+                "params": self.build_prompt(task, zones),
+            }
+            for idx, (task, zones) in enumerate(items)
+        ]
+        headers = self._build_headers()
+        client = self._get_client()
+        start_ns = time.monotonic_ns()
+        deadline = time.monotonic() + timeout
+
+        error = ""
+        results: dict[str, dict] = {}
+        try:
+            http_resp = client.post(
+                _BATCH_API_URL,
+                headers=headers,
+                content=orjson.dumps({"requests": requests}),
+            )
+            while http_resp.status_code == 200:
+                batch = orjson.loads(http_resp.content)
+                if batch.get("processing_status") == "ended":
+                    http_resp = client.get(
+                        batch["results_url"], headers=headers
+                    )
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    error = (
+                        f"Batch {batch['id']} did not end within "
+                        f"{timeout:g} s"
+                    )
+                    break
+                time.sleep(min(poll_interval, remaining))
+                http_resp = client.get(
+                    f"{_BATCH_API_URL}/{batch['id']}", headers=headers
+                )
+            if not error and http_resp.status_code != 200:
+                error = _status_error(http_resp)
+            if not error:
+                for line in http_resp.content.splitlines():
+                    if line.strip():
+                        entry = orjson.loads(line)
+                        results[entry.get("custom_id", "")] = entry.get(
+                            "result", {}
+                        )
+        except (
+            httpx.HTTPError, KeyError, ValueError, AttributeError
+        ) as exc:
+            # ValueError covers orjson.JSONDecodeError; AttributeError
+            # a well-formed document that is not a JSON object.
+            error = f"{type(exc).__name__}: {exc}"
+        elapsed_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+
+        if error:
+            logger.warning("TaskPlanner: batch failed: %s", error)
+            return [
+                _failed_plan(task, error, 1, elapsed_ms)
+                for task, _ in items
+            ]
+
+        plans: list[TaskPlan] = []
+        for idx, (task, _) in enumerate(items):
+            result = results.get(f"plan_{idx}", {})
+            if result.get("type") == "succeeded":
+                plans.append(
+                    self._plan_from_body(
+                        result.get("message", {}), task, elapsed_ms, 1
+                    )
+                )
+            else:
+                plans.append(
+                    _failed_plan(
+                        task,
+                        "Batch request "
+                        f"{result.get('type', 'missing')}: "
+                        f"{result.get('error', '')}",
+                        1,
+                        elapsed_ms,
+                    )
+                )
+        return plans
+
     # -- Private helpers --------------------------------------------
 
+    def _get_client(self) -> httpx.Client:
+        """Return the pooled HTTP client, creating it on first use.
+
+        One client is shared by every attempt and every ``plan`` call,
+        so keep-alive connections to the API are reused rather than
+        re-established per request.
+
+        Returns:
+            The planner's ``httpx.Client``.
+        """
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=self._timeout(),
+                limits=_POOL_LIMITS,
+                http2=_HTTP2,
+            )
+        return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client for the running loop.
+
+        An ``AsyncClient``'s connections belong to the event loop that
+        opened them, so a client is only reused within one loop.  When
+        ``aplan`` runs on another loop (successive ``asyncio.run``
+        calls, say) a new client is created and the old one, whose
+        loop may already be closed, is dropped.
+
+        Returns:
+            The planner's ``httpx.AsyncClient`` for the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = httpx.AsyncClient(
+                timeout=self._timeout(),
+                limits=_POOL_LIMITS,
+                http2=_HTTP2,
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _accept(
+        self,
+        http_resp: httpx.Response,
+        task: str,
+        zones: list[Zone],
+        key: str,
+        elapsed_ms: float,
+        api_calls: int,
+    ) -> TaskPlan:
+        """Build the plan from a 200 response and cache it.
+
+        Args:
+            http_resp: The successful HTTP response.
+            task: Natural-language description of the task.
+            zones: Zones the plan was requested for.
+            key: The plan fingerprint.
+            elapsed_ms: Latency of the final attempt.
+            api_calls: Attempts made, including this one.
+
+        Returns:
+            The parsed ``TaskPlan``.
+        """
+        plan = self._handle_success(http_resp, task, elapsed_ms, api_calls)
+        if self._cache is not None:
+            self._cache.put(task, zones, plan, key=key)
+        return plan
+
+    def _backoff_delay(
+        self,
+        attempt: int,
+        retry_after: str | None,
+    ) -> float:
+        """Return the seconds to wait before the next attempt.
+
+        A numeric ``retry-after`` header from the server is honoured
+        as given.  Otherwise the delay is drawn uniformly from zero up
+        to the exponential back-off for *attempt* ("full jitter"), so
+        planners retrying together do not hit the API in lock-step.
+        Both are capped at ``_MAX_BACKOFF_SECONDS``.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            retry_after: The response's ``retry-after`` header, or
+                ``None``.
+
+        Returns:
+            The delay in seconds.
+        """
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), _MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form; fall back to back-off.
+        ceiling = self._settings.api_backoff_base_seconds * (2**attempt)
+        return random.uniform(0.0, min(ceiling, _MAX_BACKOFF_SECONDS))
+
+    def _timeout(self) -> httpx.Timeout:
+        """Build the request timeout for planning calls.
+
+        Returns:
+            An ``httpx.Timeout`` using the text-request read timeout
+            and a 10-second connect timeout.
+        """
+        return httpx.Timeout(
+            self._settings.api_timeout_text_seconds,
+            connect=10.0,
+        )
+
     def _build_headers(self) -> dict[str, str]:
         """Build HTTP headers for the Anthropic Messages API.
 
@@ -449,6 +1302,38 @@ class TaskPlanner:
             "content-type": "application/json",
         }
 
+    def _request_body(self, task: str, zones: list[Zone]) -> bytes:
+        """Return the serialised request body for a live API call.
+
+        Args:
+            task: Natural-language description of the task.
+            zones: Currently available UI zones on screen.
+
+        Returns:
+            The JSON-encoded ``build_prompt`` payload, with ``stream``
+            set when the planner was created with ``stream=True``.
+        """
+        text = orjson.dumps(self._user_text(task, zones))
+        return self._body_prefix + text + self._body_suffix
+
+    def _body_template(self) -> tuple[bytes, bytes]:
+        """Return the encoded payload before and after the user text.
+
+        Everything but the user text is the same on every request.
+        Encoding it once means each call only encodes the user text
+        rather than the whole payload, system prompt included.
+
+        Returns:
+            A ``(prefix, suffix)`` pair of JSON fragments.
+        """
+        payload = self._payload(_USER_TEXT_SLOT)
+        if self._stream:
+            payload["stream"] = True
+        prefix, _, suffix = orjson.dumps(payload).partition(
+            orjson.dumps(_USER_TEXT_SLOT)
+        )
+        return prefix, suffix
+
     def _handle_success(
         self,
         http_resp: httpx.Response,
@@ -465,10 +1350,91 @@ class TaskPlanner:
             api_calls: Total number of API calls used (with retries).
 
         Returns:
-            A populated ``TaskPlan``.
+            A populated ``TaskPlan``.  A streamed response that ends
+            in an ``error`` event gives a failed plan.
+        """
+        if not self._stream:
+            return self._plan_from_body(
+                orjson.loads(http_resp.content),
+                task,
+                elapsed_ms,
+                api_calls,
+            )
+
+        raw_text, error = self._read_events(http_resp.content)
+        if error:
+            return _failed_plan(task, error, api_calls, elapsed_ms)
+        return self._plan_from_body(
+            {"content": [{"type": "text", "text": raw_text}]},
+            task,
+            elapsed_ms,
+            api_calls,
+        )
+
+    @staticmethod
+    def _read_events(content: bytes) -> tuple[str, str]:
+        """Reassemble the text of a streamed Messages API response.
+
+        Concatenates the ``text_delta`` fragments of the first text
+        content block, stopping at ``message_stop``.
+
+        Args:
+            content: The raw ``text/event-stream`` body.
+
+        Returns:
+            A ``(text, error)`` pair.  *error* is empty unless the
+            stream carried an ``error`` event.
         """
-        body = http_resp.json()
+        parts: list[str] = []
+        text_index: int | None = None
+        for line in content.splitlines():
+            if not line.startswith(b"data:"):
+                continue
+            try:
+                event = orjson.loads(line[5:])
+            except orjson.JSONDecodeError:
+                continue
+            kind = event.get("type")
+            if kind == "content_block_delta":
+                delta = event.get("delta", {})
+                if delta.get("type") != "text_delta":
+                    continue
+                index = event.get("index", 0)
+                if text_index is None:
+                    text_index = index
+                if index == text_index:
+                    parts.append(delta.get("text", ""))
+            elif kind == "message_stop":
+                break
+            elif kind == "error":
+                err = event.get("error", {})
+                return "", (
+                    f"Stream error: {err.get('type', 'error')}: "
+                    f"{err.get('message', '')}"
+                )
+        return "".join(parts), ""
 
+    def _plan_from_body(
+        self,
+        body: dict,
+        task: str,
+        elapsed_ms: float,
+        api_calls: int,
+    ) -> TaskPlan:
+        """Build a ``TaskPlan`` from a decoded Messages API response.
+
+        Shared by the live endpoint and the batch results, whose
+        ``succeeded`` entries carry the same message object.
+
+        Args:
+            body: The decoded message object.
+            task: The original task description.
+            elapsed_ms: Request round-trip time in milliseconds.
+            api_calls: Total number of API calls used (with retries).
+
+        Returns:
+            A populated ``TaskPlan``.
+        """
         # Extract text from the first content block.
         raw_text = ""
         for block in body.get("content", []):
@@ -505,16 +1471,40 @@ class TaskPlanner:
         stripped = text.strip()
 
         # Try bare JSON first.
-        if stripped.startswith("[") or stripped.startswith("{"):
+        if stripped[:1] in ("[", "{"):
             return stripped
 
         # Try Markdown code block: ```json ... ``` or ``` ... ```
-        pattern = r"```(?:json)?\s*\n?(.*?)```"
-        match = re.search(pattern, stripped, re.DOTALL)
-        if match:
-            return match.group(1).strip()
+        # The fence is a fixed literal, so two finds replace a regex.
+        start = TaskPlanner._find_fence(stripped, 0)
+        if start < 0:
+            return ""
+        end = TaskPlanner._find_fence(stripped, start + 3)
+        if end < 0:
+            return ""
+        return stripped[start + 3 : end].removeprefix("json").strip()
+
+    @staticmethod
+    def _find_fence(text: str, pos: int) -> int:
+        """Return the index of the next ````` ``` ````` at or after *pos*.
+
+        Scans for single backticks, which ``str.find`` locates with
+        ``memchr``, and checks each for a full fence.  Searching for
+        the three-character fence directly takes over ten times as
+        long across a plan-sized JSON body.
 
-        return ""
+        Args:
+            text: Text to search.
+            pos: Index to start searching from.
+
+        Returns:
+            The fence's index, or -1 if there is none.
+        """
+        while True:
+            pos = text.find("`", pos)
+            if pos < 0 or text.startswith("```", pos):
+                return pos
+            pos += 1
 
     @staticmethod
     def _item_to_step(item: dict, index: int) -> TaskStep:
@@ -535,12 +1525,23 @@ class TaskPlanner:
             TypeError: If values have the wrong type.
             ValueError: If values are invalid.
         """
+        number = item.get("step_number", index + 1)
+        zone_id = item["zone_id"]
+        label = item.get("zone_label", "")
+        action = item["action_type"]
+        params = item.get("parameters", {})
+        change = item.get("expected_change", "")
+        desc = item.get("description", "")
+        # Well-formed JSON already has the right types; only coerce
+        # the values that do not.
         return TaskStep(
-            step_number=int(item.get("step_number", index + 1)),
-            zone_id=str(item["zone_id"]),
-            zone_label=str(item.get("zone_label", "")),
-            action_type=str(item["action_type"]),
-            parameters=dict(item.get("parameters", {})),
-            expected_change=str(item.get("expected_change", "")),
-            description=str(item.get("description", "")),
+            step_number=number if type(number) is int else int(number),
+            zone_id=zone_id if type(zone_id) is str else str(zone_id),
+            zone_label=label if type(label) is str else str(label),
+            action_type=action if type(action) is str else str(action),
+            parameters=params if type(params) is dict else dict(params),
+            expected_change=(
+                change if type(change) is str else str(change)
+            ),
+            description=desc if type(desc) is str else str(desc),
         )
@@ -6,8 +6,8 @@ the most expensive analysis tier and should only fire when the frame-diff
 engine detects a large change (>30 % pixel delta or application switch).
 
 Dependencies: ``models.zone``, ``config.settings``, ``httpx``,
-``base64``, ``json`` (stdlib), and optionally ``cv2`` / ``numpy`` for
-frame encoding.
+``orjson``, ``base64``, and optionally ``cv2`` / ``numpy`` for frame
+encoding.
 
 Typical usage::
 
@@ -33,8 +33,8 @@ Typical usage::
 
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
 import logging
 import os
 import re
@@ -43,6 +43,7 @@ from dataclasses import dataclass, field
 
 import httpx
 import numpy as np
+import orjson
 from numpy.typing import NDArray
 
 from ciu_agent.config.settings import Settings
@@ -67,6 +68,15 @@ _MAX_TOKENS: int = 4096
 # Anthropic API version header.
 _API_VERSION: str = "2023-06-01"
 
+# Connection pool for the analyser's long-lived HTTP client.  Tier 2
+# calls come one at a time, so a couple of idle connections suffice;
+# keeping them for 30 s lets back-to-back rebuilds skip the handshake.
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=2,
+    max_connections=4,
+    keepalive_expiry=30.0,
+)
+
 # ------------------------------------------------------------------
 # System prompt that instructs Claude to return structured zone data.
 # ------------------------------------------------------------------
@@ -178,6 +188,41 @@ class Tier2Analyzer:
         """
         self._settings = settings
         self._api_key: str = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        self._client: httpx.Client | None = None
+        self._aclient: httpx.AsyncClient | None = None
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
+
+    # -- Lifecycle ---------------------------------------------------
+
+    def close(self) -> None:
+        """Close the pooled HTTP client, if one is open.
+
+        Safe to call more than once.  A later ``analyze_sync`` call
+        opens a fresh client.
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both the async and the sync pooled HTTP clients.
+
+        Call from the event loop that ran ``analyze``.  Safe to call
+        more than once.
+        """
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+        self.close()
+
+    def __enter__(self) -> Tier2Analyzer:
+        """Return the analyser for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the pooled HTTP client on leaving the ``with`` block."""
+        self.close()
 
     # -- Prompt construction ----------------------------------------
 
@@ -259,8 +304,8 @@ class Tier2Analyzer:
             return []
 
         try:
-            data = json.loads(cleaned)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as exc:
             logger.error("Tier2: JSON decode failed: %s", exc)
             return []
 
@@ -310,10 +355,7 @@ class Tier2Analyzer:
 
         payload = self.build_prompt(request)
         headers = self._build_headers()
-        timeout = httpx.Timeout(
-            self._settings.api_timeout_vision_seconds,
-            connect=10.0,
-        )
+        client = self._get_async_client()
 
         last_error = ""
         retries = self._settings.api_max_retries
@@ -321,14 +363,11 @@ class Tier2Analyzer:
         for attempt in range(retries):
             start_ns = time.monotonic_ns()
             try:
-                async with httpx.AsyncClient(
-                    timeout=timeout,
-                ) as client:
-                    http_resp = await client.post(
-                        _API_URL,
-                        headers=headers,
-                        json=payload,
-                    )
+                http_resp = await client.post(
+                    _API_URL,
+                    headers=headers,
+                    json=payload,
+                )
                 elapsed_ms = (time.monotonic_ns() - start_ns) / 1_000_000
 
                 if http_resp.status_code == 200:
@@ -359,8 +398,6 @@ class Tier2Analyzer:
             # Exponential back-off before next attempt.
             if attempt < retries - 1:
                 delay = self._settings.api_backoff_base_seconds * (2**attempt)
-                import asyncio
-
                 await asyncio.sleep(delay)
 
         return Tier2Response(
@@ -391,10 +428,7 @@ class Tier2Analyzer:
 
         payload = self.build_prompt(request)
         headers = self._build_headers()
-        timeout = httpx.Timeout(
-            self._settings.api_timeout_vision_seconds,
-            connect=10.0,
-        )
+        client = self._get_client()
 
         last_error = ""
         elapsed_ms = 0.0
@@ -403,12 +437,11 @@ class Tier2Analyzer:
         for attempt in range(retries):
             start_ns = time.monotonic_ns()
             try:
-                with httpx.Client(timeout=timeout) as client:
-                    http_resp = client.post(
-                        _API_URL,
-                        headers=headers,
-                        json=payload,
-                    )
+                http_resp = client.post(
+                    _API_URL,
+                    headers=headers,
+                    json=payload,
+                )
                 elapsed_ms = (time.monotonic_ns() - start_ns) / 1_000_000
 
                 if http_resp.status_code == 200:
@@ -513,6 +546,42 @@ class Tier2Analyzer:
 
     # -- Private helpers --------------------------------------------
 
+    def _get_client(self) -> httpx.Client:
+        """Return the pooled HTTP client, creating it on first use.
+
+        One client serves every attempt and every ``analyze_sync``
+        call, so the TCP and TLS session to the API is reused instead
+        of being set up again for each screenshot.
+
+        Returns:
+            The analyser's ``httpx.Client``.
+        """
+        if self._client is None:
+            self._client = httpx.Client(timeout=self._timeout(), limits=_POOL_LIMITS)
+        return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client for the running event loop.
+
+        An ``AsyncClient``'s connections belong to the loop that opened
+        them, so a client is only reused within one loop.  When
+        ``analyze`` runs on a different loop (for example, successive
+        ``asyncio.run`` calls) a new client is created and the old one,
+        whose loop may already be closed, is dropped.
+
+        Returns:
+            The analyser's ``httpx.AsyncClient`` for the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = httpx.AsyncClient(timeout=self._timeout(), limits=_POOL_LIMITS)
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _timeout(self) -> httpx.Timeout:
+        """Return the request timeout for vision calls."""
+        return httpx.Timeout(self._settings.api_timeout_vision_seconds, connect=10.0)
+
     def _build_headers(self) -> dict[str, str]:
         """Build HTTP headers for the Anthropic Messages API.
 
@@ -539,7 +608,9 @@ class Tier2Analyzer:
         Returns:
             A populated ``Tier2Response``.
         """
-        body = http_resp.json()
+        # Decode the raw bytes directly; httpx's .json() would first
+        # build a str and then run the stdlib decoder over it.
+        body = orjson.loads(http_resp.content)
 
         # Extract text from the first content block.
         raw_text = ""
@@ -44,6 +44,7 @@ class ZoneRegistry:
         """Initialize an empty zone registry."""
         self._zones: dict[str, Zone] = {}
         self._lock = threading.Lock()
+        self._version: int = 0
 
     # ------------------------------------------------------------------
     # CRUD
@@ -57,6 +58,7 @@ class ZoneRegistry:
         """
         with self._lock:
             self._zones[zone.id] = zone
+            self._version += 1
 
     def register_many(self, zones: list[Zone]) -> None:
         """Register multiple zones at once.
@@ -68,6 +70,7 @@ class ZoneRegistry:
         with self._lock:
             for zone in zones:
                 self._zones[zone.id] = zone
+            self._version += 1
 
     def update(self, zone_id: str, **kwargs: Any) -> Zone:
         """Update fields of an existing zone.
@@ -92,6 +95,7 @@ class ZoneRegistry:
                 raise KeyError(f"Zone '{zone_id}' not found in registry")
             updated = replace(self._zones[zone_id], **kwargs)
             self._zones[zone_id] = updated
+            self._version += 1
             return updated
 
     def remove(self, zone_id: str) -> Zone:
@@ -109,6 +113,7 @@ class ZoneRegistry:
         with self._lock:
             if zone_id not in self._zones:
                 raise KeyError(f"Zone '{zone_id}' not found in registry")
+            self._version += 1
             return self._zones.pop(zone_id)
 
     def get(self, zone_id: str) -> Zone | None:
@@ -137,6 +142,7 @@ class ZoneRegistry:
         """Remove all zones from the registry."""
         with self._lock:
             self._zones.clear()
+            self._version += 1
 
     # ------------------------------------------------------------------
     # Queries
@@ -233,6 +239,7 @@ class ZoneRegistry:
             self._zones.clear()
             for zone in zones:
                 self._zones[zone.id] = zone
+            self._version += 1
 
     def expire_stale(
         self,
@@ -255,6 +262,8 @@ class ZoneRegistry:
             stale: list[Zone] = [z for z in self._zones.values() if z.last_seen < cutoff]
             for z in stale:
                 del self._zones[z.id]
+            if stale:
+                self._version += 1
         return stale
 
     def update_last_seen(
@@ -278,6 +287,7 @@ class ZoneRegistry:
                 self._zones[zone_id],
                 last_seen=timestamp,
             )
+            self._version += 1
 
     # ------------------------------------------------------------------
     # Properties
@@ -293,6 +303,15 @@ class ZoneRegistry:
         """List of all zone IDs in the registry."""
         return list(self._zones.keys())
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every mutation.
+
+        Callers can cache values derived from zone contents and treat
+        a changed version as the invalidation signal.
+        """
+        return self._version
+
     # ------------------------------------------------------------------
     # Dunder helpers
     # ------------------------------------------------------------------
@@ -193,8 +193,12 @@ class CIUAgent:
     def shutdown(self) -> None:
         """Stop the replay session if one is active.
 
-        Safe to call multiple times; subsequent calls are no-ops.
+        Also closes the task planner's and Tier 2 analyser's pooled
+        HTTP connections.  Safe to call multiple times; subsequent
+        calls are no-ops.
         """
+        self.task_planner.close()
+        self.tier2.close()
         if self._replay_active:
             try:
                 session_dir = self.replay.stop_session()
@@ -83,6 +83,24 @@ class Action:
     timestamp: float = 0.0
     result: str = ""
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-ready dictionary of this action.
+
+        Enum fields are emitted by name.  ``parameters`` is copied
+        shallowly, so its values should already be JSON-serialisable.
+
+        Returns:
+            A plain dictionary with one key per field.
+        """
+        return {
+            "type": self.type.name,
+            "target_zone_id": self.target_zone_id,
+            "status": self.status.name,
+            "parameters": dict(self.parameters),
+            "timestamp": self.timestamp,
+            "result": self.result,
+        }
+
 
 class TrajectoryType(Enum):
     """Strategy used to plan cursor movement toward a target zone.
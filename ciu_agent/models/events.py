@@ -64,3 +64,21 @@ class SpatialEvent:
     timestamp: float
     position: tuple[int, int]
     data: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-ready dictionary of this event.
+
+        The event type is emitted by enum name and the position as a
+        list.  ``data`` is copied shallowly, so its values should
+        already be JSON-serialisable.
+
+        Returns:
+            A plain dictionary with one key per field.
+        """
+        return {
+            "type": self.type.name,
+            "zone_id": self.zone_id,
+            "timestamp": self.timestamp,
+            "position": list(self.position),
+            "data": dict(self.data),
+        }
@@ -7,11 +7,12 @@ models layer avoids circular imports between core modules.
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskStep:
     """A single step in a task plan.
 
@@ -44,6 +45,10 @@ class TaskStep:
     expected_change: str = ""
     description: str = ""
 
+    def __post_init__(self) -> None:
+        """Intern ``action_type`` so executor lookups match by identity."""
+        self.action_type = sys.intern(self.action_type)
+
 
 @dataclass
 class TaskPlan:
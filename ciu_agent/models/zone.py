@@ -10,6 +10,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 
 
 class ZoneType(Enum):
@@ -96,6 +97,29 @@ class Rectangle:
         if self.height < 0:
             raise ValueError(f"Rectangle height must be >= 0, got {self.height}")
 
+    def extents(self) -> tuple[int, int, int, int, int, int, int]:
+        """Return cached edge, center, and area values in one tuple.
+
+        Geometry-heavy callers (trajectory planning, intersection
+        tests) unpack this once instead of repeating attribute
+        lookups and method calls.  The tuple is computed on first use
+        and kept outside the dataclass fields, so ``asdict``,
+        ``repr``, and equality are unaffected.  Rectangles are not
+        resized in place; code that does reassign a field after
+        calling this must ``del rect._extents`` to drop the cache.
+
+        Returns:
+            ``(x_min, y_min, x_max, y_max, cx, cy, area)`` where the
+            center matches ``center()`` and area matches ``area()``.
+        """
+        return self._extents
+
+    @cached_property
+    def _extents(self) -> tuple[int, int, int, int, int, int, int]:
+        """Compute the tuple returned by ``extents()``."""
+        x, y, w, h = self.x, self.y, self.width, self.height
+        return (x, y, x + w, y + h, x + w // 2, y + h // 2, w * h)
+
     def contains_point(self, px: int, py: int) -> bool:
         """Check whether a point lies inside (or on the edge of) this rect.
 
@@ -151,7 +175,7 @@ class Rectangle:
         return self.width * self.height
 
 
-@dataclass
+@dataclass(slots=True)
 class Zone:
     """A bounded screen region with interactive meaning.
 
@@ -8,10 +8,13 @@ environments.
 Session directory layout (produced by ``ReplayBuffer``)::
 
     sessions/session_YYYYMMDD_HHMMSS/
-        frames/          # PNG frames (when save_frames_as_png is True)
-            000001.png
+        frames/          # Frames (when save_frames_as_png is True)
+            000001.png   # One image per frame in the frame_codec format,
             ...
-        cursor.jsonl     # One JSON object per cursor sample
+            000000.tar   # or tar shards of images (frame_shard_size > 0)
+            delta.bin    # XOR deltas between keyframes (keyframe_interval > 1)
+            delta.json   # Index of delta.bin
+        cursor.jsonl     # One JSON object per cursor sample (or cursor.npz)
         events.jsonl     # Spatial events serialised as JSON per line
         actions.jsonl    # Director actions serialised as JSON per line
         metadata.json    # SessionMetadata as JSON
@@ -28,7 +31,9 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
@@ -36,6 +41,9 @@ import cv2
 import numpy as np
 from numpy.typing import NDArray
 
+from ciu_agent.config.settings import get_default_settings
+from ciu_agent.core.replay_buffer import ReplayBuffer
+
 # ---------------------------------------------------------------------------
 # Data structures
 # ---------------------------------------------------------------------------
@@ -47,18 +55,24 @@ class Session:
 
     Attributes:
         metadata: Parsed contents of ``metadata.json``.
-        cursor_samples: Cursor positions loaded from ``cursor.jsonl``.
+        cursor_samples: Cursor positions loaded from ``cursor.jsonl``
+            or ``cursor.npz``.
         events: Spatial events loaded from ``events.jsonl``.
         actions: Director actions loaded from ``actions.jsonl``.
-        frame_paths: Sorted paths to frame PNG files in ``frames/``.
-        frame_count: Number of frames available on disk.
+        session_dir: The session directory, from which frame images
+            are decoded during playback.
+        frame_numbers: Recorded frame numbers in playback order, one
+            per cursor sample.  Empty when the session saved no
+            frame images.
+        frame_count: Number of frames available for playback.
     """
 
     metadata: dict[str, Any]
     cursor_samples: list[dict[str, Any]]
     events: list[dict[str, Any]]
     actions: list[dict[str, Any]]
-    frame_paths: list[Path]
+    session_dir: Path
+    frame_numbers: list[int]
     frame_count: int = 0
 
 
@@ -71,7 +85,7 @@ class SessionLoader:
     """Loads a session directory into a ``Session`` instance.
 
     The loader reads each file independently and tolerates missing
-    optional files (``cursor.jsonl``, ``events.jsonl``, ``actions.jsonl``,
+    optional files (the cursor log, ``events.jsonl``, ``actions.jsonl``,
     ``frames/``).  Only ``metadata.json`` is required.
     """
 
@@ -94,18 +108,21 @@ class SessionLoader:
             raise FileNotFoundError(f"Session directory not found: {root}")
 
         metadata = self._load_metadata(root)
-        cursor_samples = self._load_jsonl(root / "cursor.jsonl")
+        # ReplayBuffer reads every cursor format it can write.
+        buffer = ReplayBuffer(get_default_settings())
+        cursor_samples = [asdict(s) for s in buffer.load_cursor(root)]
         events = self._load_jsonl(root / "events.jsonl")
         actions = self._load_jsonl(root / "actions.jsonl")
-        frame_paths = self._discover_frames(root / "frames")
+        frame_numbers = self._frame_numbers(root / "frames", cursor_samples)
 
         return Session(
             metadata=metadata,
             cursor_samples=cursor_samples,
             events=events,
             actions=actions,
-            frame_paths=frame_paths,
-            frame_count=len(frame_paths),
+            session_dir=root,
+            frame_numbers=frame_numbers,
+            frame_count=len(frame_numbers),
         )
 
     def _load_metadata(self, root: Path) -> dict[str, Any]:
@@ -149,22 +166,114 @@ class SessionLoader:
                     results.append(json.loads(stripped))
         return results
 
-    def _discover_frames(self, frames_dir: Path) -> list[Path]:
-        """Find and sort frame PNGs in the ``frames/`` subdirectory.
+    def _frame_numbers(
+        self,
+        frames_dir: Path,
+        cursor_samples: list[dict[str, Any]],
+    ) -> list[int]:
+        """Return the frame numbers to play back, in order.
 
-        Frames are sorted lexicographically, which matches the
-        zero-padded naming convention ``000001.png``, ``000002.png``, etc.
+        Every recorded frame has exactly one cursor sample, while the
+        ``frames/`` directory may hold fewer images than frames
+        (duplicates skipped, deltas against keyframes, tar shards).
+        The cursor log is therefore the timeline; images are matched
+        to it by frame number during playback.
 
         Args:
             frames_dir: Path to the ``frames/`` subdirectory.
+            cursor_samples: Samples loaded from the cursor log.
 
         Returns:
-            Sorted list of paths, or an empty list if the directory
-            does not exist.
+            Sorted frame numbers, or an empty list if the session
+            saved no frame images.
         """
         if not frames_dir.is_dir():
             return []
-        return sorted(frames_dir.glob("*.png"))
+        return sorted({int(s["frame"]) for s in cursor_samples})
+
+
+# ---------------------------------------------------------------------------
+# Frame source
+# ---------------------------------------------------------------------------
+
+
+# Decoded frames kept for stepping backwards without re-decoding.
+_HISTORY_FRAMES = 256
+
+
+class _FrameSource:
+    """Random access by frame number to a session's decoded frames.
+
+    Frames are decoded lazily, in order, by
+    ``ReplayBuffer.load_frames``, which understands every on-disk
+    layout (image files, tar shards, keyframe deltas).  A frame
+    without an image of its own (skipped as a duplicate) shows the
+    latest stored frame before it.  Recent frames are kept so that
+    stepping back is cheap; stepping back further restarts decoding.
+
+    Args:
+        session_dir: The session directory to read.
+    """
+
+    def __init__(self, session_dir: Path) -> None:
+        """Open the frame stream.
+
+        Args:
+            session_dir: The session directory to read.
+        """
+        self._session_dir = session_dir
+        self._buffer = ReplayBuffer(get_default_settings())
+        self._frames: Iterator[tuple[int, NDArray[np.uint8]]] = iter(())
+        self._history: OrderedDict[int, NDArray[np.uint8]] = OrderedDict()
+        self._pending: tuple[int, NDArray[np.uint8]] | None = None
+        self._evicted = False
+        self._restart()
+
+    def image_for(self, frame_number: int) -> NDArray[np.uint8] | None:
+        """Return the image shown at *frame_number*.
+
+        Args:
+            frame_number: A recorded frame number.
+
+        Returns:
+            The stored image with the highest frame number not above
+            *frame_number*, or None if there is none.
+        """
+        if self._evicted and self._history and frame_number < next(iter(self._history)):
+            self._restart()
+
+        while True:
+            if self._pending is None:
+                self._pending = next(self._frames, None)
+                if self._pending is None:
+                    break
+            if self._pending[0] > frame_number:
+                break
+            number, image = self._pending
+            self._pending = None
+            self._history[number] = image
+            if len(self._history) > _HISTORY_FRAMES:
+                self._history.popitem(last=False)
+                self._evicted = True
+
+        for number in reversed(self._history):
+            if number <= frame_number:
+                return self._history[number]
+        return None
+
+    def close(self) -> None:
+        """Stop decoding and release the session's files."""
+        close = getattr(self._frames, "close", None)
+        if close is not None:
+            close()
+        self._history.clear()
+        self._pending = None
+
+    def _restart(self) -> None:
+        """Start decoding again from the first frame."""
+        self.close()
+        self._frames = self._buffer.load_frames(self._session_dir)
+        self._evicted = False
 
 
 # ---------------------------------------------------------------------------
@@ -238,19 +347,23 @@ class ReplayViewer:
             base_delay_ms = 67  # ~15 fps fallback
 
         frame_idx = 0
+        source = _FrameSource(self._session.session_dir)
 
         try:
             while 0 <= frame_idx < self._session.frame_count:
-                frame_path = self._session.frame_paths[frame_idx]
-                image = cv2.imread(str(frame_path))
+                frame_number = self._session.frame_numbers[frame_idx]
+                image = source.image_for(frame_number)
                 if image is None:
-                    print(f"Warning: could not read {frame_path}, skipping.")
+                    print(f"Warning: no image for frame {frame_number}, skipping.")
                     frame_idx += 1
                     continue
+                if image.ndim == 2:
+                    # Grayscale recordings; overlays are drawn in colour.
+                    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
 
                 # Determine cursor position for this frame.
                 cursor_x, cursor_y, timestamp = self._cursor_at_frame(
-                    frame_idx, cursor_by_frame
+                    frame_number, cursor_by_frame
                 )
 
                 # Draw overlays.
@@ -309,6 +422,7 @@ class ReplayViewer:
 
                 frame_idx += 1
         finally:
+            source.close()
             cv2.destroyAllWindows()
 
     def _draw_overlay(
@@ -508,12 +622,13 @@ class ReplayViewer:
             return {}
 
         # Build sorted list of (timestamp, frame_index) from cursor samples.
+        position = {n: i for i, n in enumerate(self._session.frame_numbers)}
         ts_to_frame: list[tuple[float, int]] = []
         for sample in self._session.cursor_samples:
             ts = sample.get("timestamp", 0.0)
-            frame_num = sample.get("frame", 0)
-            # Cursor samples use 1-based frame numbers; convert to 0-based.
-            ts_to_frame.append((float(ts), int(frame_num) - 1))
+            frame_idx = position.get(int(sample.get("frame", 0)))
+            if frame_idx is not None:
+                ts_to_frame.append((float(ts), frame_idx))
         ts_to_frame.sort()
 
         if not ts_to_frame:
@@ -565,16 +680,14 @@ class ReplayViewer:
 
     def _cursor_at_frame(
         self,
-        frame_idx: int,
+        frame_number: int,
         cursor_by_frame: dict[int, dict[str, Any]],
     ) -> tuple[int, int, float]:
-        """Look up cursor position for a given frame index.
-
-        Frame PNGs use 1-based numbering (``000001.png``), so we look
-        up ``frame_idx + 1`` in the cursor index.
+        """Look up cursor position for a given frame number.
 
         Args:
-            frame_idx: Zero-based frame index.
+            frame_number: Recorded frame number, as stored in the
+                cursor log.
             cursor_by_frame: Index built by ``_build_cursor_index``.
 
         Returns:
@@ -582,8 +695,7 @@ class ReplayViewer:
             ``(0, 0, 0.0)`` if no cursor data is available for the
             frame.
         """
-        # Cursor samples record 1-based frame numbers.
-        sample = cursor_by_frame.get(frame_idx + 1)
+        sample = cursor_by_frame.get(frame_number)
         if sample is not None:
             return (
                 int(sample.get("x", 0)),
@@ -702,7 +814,7 @@ def print_summary(session: Session) -> None:
     print(f"  Duration:    {duration:.2f}s")
     print(f"  Screen:      {screen_w}x{screen_h}")
     print(f"  Frames:      {frame_count_meta} (metadata)")
-    print(f"               {session.frame_count} (on disk)")
+    print(f"               {session.frame_count} (replayable)")
     print(f"  Events:      {event_count_meta}")
     print(f"  Actions:     {action_count_meta}")
     print(f"  Cursor pts:  {len(session.cursor_samples)}")
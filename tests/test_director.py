@@ -32,8 +32,12 @@ class MockPlanner:
 
     def __init__(self) -> None:
         self.plans: list[TaskPlan] = []
+        self.forgotten: list[str] = []
         self._call_index: int = 0
 
+    def forget(self, task: str) -> None:
+        self.forgotten.append(task)
+
     def plan(self, task: str, zones: list[Zone]) -> TaskPlan:
         if self._call_index < len(self.plans):
             result = self.plans[self._call_index]
@@ -366,6 +370,25 @@ class TestStepFailuresAndRecovery:
 
         assert result.plans_used >= 2
 
+    def test_replan_forgets_cached_plan(self) -> None:
+        """Replanning drops the failed plan from the planner's cache."""
+        director, planner, executor, _reg = _build_director()
+
+        step_a = _make_step(step_number=1, description="Click X")
+        step_b = _make_step(step_number=1, description="Click Y")
+        planner.plans = [
+            _make_plan(steps=[step_a]),
+            _make_plan(steps=[step_b]),
+        ]
+        executor.results = [
+            _make_failure_result(step_a, error_type="zone_not_found"),
+            _make_success_result(step_b),
+        ]
+
+        director.execute_task("Click something")
+
+        assert planner.forgotten == ["Click something"]
+
     def test_action_failed_attempt_0_retries_then_replans(self) -> None:
         """action_failed at attempt=0 gets RETRY, then REPLAN.
 
@@ -6,6 +6,10 @@ and geometric methods defined in the models package.
 
 from __future__ import annotations
 
+from dataclasses import asdict
+from enum import Enum
+from typing import get_type_hints
+
 import pytest
 
 from ciu_agent.models.actions import (
@@ -259,6 +263,31 @@ class TestRectangle:
         r = Rectangle(x=0, y=0, width=1, height=1)
         assert r.area() == 1
 
+    # -- extents -----------------------------------------------------------
+
+    def test_extents_values(self) -> None:
+        """Extents pack edges, center, and area into one tuple."""
+        r = Rectangle(x=10, y=20, width=31, height=15)
+        assert r.extents() == (10, 20, 41, 35, 25, 27, 465)
+        assert r.extents()[4:6] == r.center()
+
+    def test_extents_recomputed_after_invalidation(self) -> None:
+        """Deleting the cache after a field change recomputes the tuple."""
+        r = Rectangle(x=0, y=0, width=10, height=10)
+        assert r.extents()[2] == 10
+        r.width = 40
+        del r._extents
+        assert r.extents() == (0, 0, 40, 10, 20, 5, 400)
+
+    def test_extents_cache_invisible_to_dataclass_helpers(self) -> None:
+        """The cache does not leak into asdict, repr, or equality."""
+        a = Rectangle(x=1, y=2, width=3, height=4)
+        b = Rectangle(x=1, y=2, width=3, height=4)
+        a.extents()
+        assert asdict(a) == {"x": 1, "y": 2, "width": 3, "height": 4}
+        assert "_extents" not in repr(a)
+        assert a == b
+
 
 # ---------------------------------------------------------------------------
 # Zone
@@ -301,6 +330,13 @@ class TestZone:
         assert z.confidence == 0.85
         assert z.last_seen == 1234567890.0
 
+    def test_zone_has_no_instance_dict(self) -> None:
+        """Zone is a slotted dataclass; fields still update in place."""
+        z = self._make_zone()
+        assert not hasattr(z, "__dict__")
+        z.state = ZoneState.HOVERED
+        assert z.state == ZoneState.HOVERED
+
     def test_contains_point_delegates_to_bounds(self) -> None:
         """Zone.contains_point forwards to Rectangle.contains_point."""
         z = self._make_zone(bounds=Rectangle(x=10, y=10, width=80, height=40))
@@ -436,6 +472,26 @@ class TestSpatialEvent:
         ev1.data["key"] = "value"
         assert "key" not in ev2.data
 
+    def test_to_dict_uses_enum_name_and_list_position(self) -> None:
+        """to_dict emits the type by name and position as a list."""
+        ev = SpatialEvent(
+            type=SpatialEventType.ZONE_CLICK,
+            zone_id="btn_ok",
+            timestamp=100.0,
+            position=(50, 25),
+            data={"button": "left"},
+        )
+        d = ev.to_dict()
+        assert d == {
+            "type": "ZONE_CLICK",
+            "zone_id": "btn_ok",
+            "timestamp": 100.0,
+            "position": [50, 25],
+            "data": {"button": "left"},
+        }
+        d["data"]["button"] = "right"
+        assert ev.data["button"] == "left"
+
 
 # ---------------------------------------------------------------------------
 # ActionType
@@ -530,6 +586,22 @@ class TestAction:
         a1.parameters["extra"] = True
         assert "extra" not in a2.parameters
 
+    def test_to_dict_uses_enum_names(self) -> None:
+        """to_dict emits type and status by name, matching asdict keys."""
+        a = Action(
+            type=ActionType.TYPE_TEXT,
+            target_zone_id="input_name",
+            status=ActionStatus.COMPLETED,
+            parameters={"text": "hi"},
+            timestamp=5.0,
+            result="ok",
+        )
+        d = a.to_dict()
+        assert d["type"] == "TYPE_TEXT"
+        assert d["status"] == "COMPLETED"
+        assert d.keys() == asdict(a).keys()
+        assert d["parameters"] == {"text": "hi"}
+
 
 # ---------------------------------------------------------------------------
 # TrajectoryType
@@ -609,3 +681,38 @@ class TestTrajectory:
         )
         t1.avoid_zone_ids.append("z99")
         assert "z99" not in t2.avoid_zone_ids
+
+
+# ---------------------------------------------------------------------------
+# to_dict enum coverage
+# ---------------------------------------------------------------------------
+
+
+class TestToDictEnumFields:
+    """Guards the hand-written to_dict methods against field drift."""
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            SpatialEvent(
+                type=SpatialEventType.ZONE_TYPE,
+                zone_id="z",
+                timestamp=1.0,
+                position=(1, 2),
+                data={"text": "x"},
+            ),
+            Action(type=ActionType.SCROLL, target_zone_id="z", status=ActionStatus.FAILED),
+        ],
+    )
+    def test_every_enum_field_emitted_by_name(self, obj: SpatialEvent | Action) -> None:
+        """Each Enum-annotated field appears in to_dict as its name."""
+        d = obj.to_dict()
+        assert d.keys() == asdict(obj).keys()
+        enum_fields = [
+            name
+            for name, hint in get_type_hints(type(obj)).items()
+            if isinstance(hint, type) and issubclass(hint, Enum)
+        ]
+        assert enum_fields
+        for name in enum_fields:
+            assert d[name] == getattr(obj, name).name
@@ -7,10 +7,13 @@ line_intersects_rect, estimate_duration_ms, and edge cases.
 from __future__ import annotations
 
 import math
+from fractions import Fraction
 
+import numpy as np
 import pytest
 
 from ciu_agent.config.settings import Settings
+from ciu_agent.core import motion_planner
 from ciu_agent.core.motion_planner import (
     _DEFAULT_SCAN_SPACING,
     _MAX_WAYPOINTS,
@@ -228,6 +231,59 @@ class TestPlanDirect:
         traj = pop_planner.plan_direct((0, 0), "btn_save")
         assert traj.avoid_zone_ids == []
 
+    def test_repeated_plan_returns_equal_independent_copies(
+        self, pop_planner: MotionPlanner,
+    ) -> None:
+        """Cached trajectories are copied so callers cannot corrupt them."""
+        first = pop_planner.plan_direct((0, 0), "btn_save")
+        first.points.clear()
+        second = pop_planner.plan_direct((0, 0), "btn_save")
+        assert second.points[0] == (0, 0)
+        assert second.points[-1] == (240, 215)
+
+    def test_cache_invalidated_when_zone_moves(
+        self, registry: ZoneRegistry, settings: Settings,
+    ) -> None:
+        registry.register(_make_zone("mv", 96, 96, 8, 8))  # center (100, 100)
+        planner = MotionPlanner(registry, settings)
+        assert planner.plan_direct((0, 0), "mv").points[-1] == (100, 100)
+        registry.update("mv", bounds=Rectangle(x=296, y=96, width=8, height=8))
+        assert planner.plan_direct((0, 0), "mv").points[-1] == (300, 100)
+
+    def test_removed_zone_still_raises_after_caching(
+        self, registry: ZoneRegistry, settings: Settings,
+    ) -> None:
+        registry.register(_make_zone("gone", 96, 96, 8, 8))
+        planner = MotionPlanner(registry, settings)
+        planner.plan_direct((0, 0), "gone")
+        registry.remove("gone")
+        with pytest.raises(ValueError, match="gone"):
+            planner.plan_direct((0, 0), "gone")
+
+
+class TestPlanDirectIter:
+    """Tests for MotionPlanner.plan_direct_iter."""
+
+    def test_matches_plan_direct(self, pop_planner: MotionPlanner) -> None:
+        eager = pop_planner.plan_direct((3, 7), "btn_cancel").points
+        lazy = list(pop_planner.plan_direct_iter((3, 7), "btn_cancel"))
+        assert len(lazy) == len(eager)
+        assert lazy[0] == eager[0]
+        assert lazy[-1] == eager[-1]
+        for (lx, ly), (ex, ey) in zip(lazy, eager):
+            assert abs(lx - ex) <= 1 and abs(ly - ey) <= 1
+
+    def test_is_lazy(self, pop_planner: MotionPlanner) -> None:
+        it = pop_planner.plan_direct_iter((0, 0), "btn_save")
+        assert next(it) == (0, 0)
+        assert not isinstance(it, list)
+
+    def test_missing_zone_raises_before_iteration(
+        self, pop_planner: MotionPlanner,
+    ) -> None:
+        with pytest.raises(ValueError, match="no_such_zone"):
+            pop_planner.plan_direct_iter((0, 0), "no_such_zone")
+
 
 # ==================================================================
 # plan_safe
@@ -279,6 +335,60 @@ class TestPlanSafe:
         # btn_cancel center = (440, 215)
         assert traj_safe.points[-1] == (440, 215)
 
+    def test_route_legs_clear_blocker_that_sub_legs_would_cross(self) -> None:
+        """Detour legs are re-checked against the blocker they avoid."""
+        planner = MotionPlanner(ZoneRegistry(), Settings())
+        rect = Rectangle(x=100, y=50, width=200, height=200)
+        waypoints = planner._route_around((0, 100), (400, 100), [("r", rect)])
+        assert waypoints[0] == (0, 100)
+        assert waypoints[-1] == (400, 100)
+        # The first detour leg still cuts the rect's corner, so it is
+        # routed again rather than being trusted blindly.
+        assert len(waypoints) > 3
+        assert not MotionPlanner.line_intersects_rect(
+            waypoints[0], waypoints[1], rect,
+        )
+
+    def test_result_independent_of_avoid_order(
+        self, registry: ZoneRegistry, settings: Settings,
+    ) -> None:
+        """Avoid zones are checked nearest-first, whatever their order."""
+        registry.register_many([
+            _make_zone("near", 200, 60, 100, 80),
+            _make_zone("far", 700, 60, 100, 80),
+            _make_zone("goal", 996, 96, 8, 8),  # center = (1000, 100)
+        ])
+        planner = MotionPlanner(registry, settings)
+        a = planner.plan_safe((0, 100), "goal", ["near", "far"])
+        b = planner.plan_safe((0, 100), "goal", ["far", "near"])
+        assert a.points == b.points
+        assert b.avoid_zone_ids == ["far", "near"]
+
+    @pytest.mark.parametrize(
+        ("start", "end", "expected"),
+        [
+            ((0, 52), (100, 52), (50, 40)),     # nearest edge: top
+            ((0, 97), (100, 97), (50, 110)),    # nearest edge: bottom
+            ((3, 0), (3, 150), (-10, 75)),      # nearest edge: left
+            ((97, 0), (97, 150), (110, 75)),    # nearest edge: right
+            ((0, 75), (50, 75), (50, 40)),      # top/bottom/left tie: top
+        ],
+    )
+    def test_detour_point_picks_nearest_edge(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        expected: tuple[int, int],
+    ) -> None:
+        rect = Rectangle(x=0, y=50, width=100, height=50)
+        assert MotionPlanner._detour_point(start, end, rect) == expected
+
+    def test_edge_distance_sq(self) -> None:
+        rect = Rectangle(x=10, y=10, width=20, height=20)
+        assert MotionPlanner._edge_distance_sq((15, 15), rect) == 0
+        assert MotionPlanner._edge_distance_sq((0, 20), rect) == 100
+        assert MotionPlanner._edge_distance_sq((33, 34), rect) == 9 + 16
+
     def test_avoid_zone_ids_populated_in_result(
         self, pop_planner: MotionPlanner,
     ) -> None:
@@ -452,6 +562,29 @@ class TestPlanExploratory:
         assert len(traj.points) == 1
         assert traj.points[0] == start
 
+    def test_scan_grid_reused_across_start_points(
+        self, planner: MotionPlanner,
+    ) -> None:
+        """The sweep is cached per region; only the lead-in changes."""
+        region = (100, 100, 300, 200)
+        a = planner.plan_exploratory((0, 0), region)
+        b = planner.plan_exploratory((50, 400), region)
+        grid = planner._build_scan_grid(region, _DEFAULT_SCAN_SPACING)
+        assert grid is planner._build_scan_grid(region, _DEFAULT_SCAN_SPACING)
+        assert not grid.flags.writeable
+        sweep = [tuple(p) for p in grid.tolist()]
+        assert a.points[-len(sweep):] == sweep
+        assert b.points[-len(sweep):] == sweep
+
+    def test_scan_grid_depends_on_spacing(
+        self, planner: MotionPlanner,
+    ) -> None:
+        region = (0, 0, 600, 100)
+        coarse = planner._build_scan_grid(region, 50)
+        fine = planner._build_scan_grid(region, 25)
+        assert len(fine) > len(coarse)
+        assert planner._build_scan_grid(region, 50) is coarse
+
     def test_points_capped_at_max_waypoints(
         self, settings: Settings,
     ) -> None:
@@ -508,6 +641,64 @@ class TestInterpolateLine:
         for x, y in pts:
             assert abs(x - y) <= 1
 
+    @pytest.mark.parametrize(
+        ("start", "end", "steps"),
+        [
+            ((3, 40), (250, 40), 17),
+            ((250, 40), (-7, 40), 23),
+            ((9, -5), (9, 333), 31),
+            ((10, 10), (137, 137), 29),
+            ((10, 200), (101, 109), 13),
+            ((0, 0), (97, 41), 19),
+        ],
+    )
+    def test_matches_scalar_rounding(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int,
+    ) -> None:
+        """Fast paths agree with the per-waypoint ``round()`` formula."""
+        sx, sy = start
+        ex, ey = end
+        expected = [
+            (
+                round(sx + (ex - sx) * (i / (steps - 1))),
+                round(sy + (ey - sy) * (i / (steps - 1))),
+            )
+            for i in range(steps)
+        ]
+        pts = MotionPlanner.interpolate_line(start, end, steps)
+        assert pts == expected
+        assert all(type(v) is int for p in pts for v in p)
+
+    @pytest.mark.parametrize(
+        ("start", "end", "steps"),
+        [
+            ((0, 0), (-11, 5), 23),
+            ((7, 3), (20, -9), 40),
+            ((1001, 7), (1000, 8), 2),
+            ((-3, 1), (3, 4), 9),
+        ],
+    )
+    def test_short_segments_round_exactly(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int,
+    ) -> None:
+        """Sub-2-pixel spacing uses integer stepping with exact rounding."""
+        sx, sy = start
+        ex, ey = end
+        expected = [
+            (
+                round(sx + Fraction((ex - sx) * i, steps - 1)),
+                round(sy + Fraction((ey - sy) * i, steps - 1)),
+            )
+            for i in range(steps)
+        ]
+        assert MotionPlanner.interpolate_line(start, end, steps) == expected
+
     def test_same_start_and_end(self) -> None:
         pts = MotionPlanner.interpolate_line((42, 42), (42, 42), 5)
         assert len(pts) == 5
@@ -595,6 +786,59 @@ class TestLineIntersectsRect:
         ) is False
 
 
+class TestFirstIntersecting:
+    """Tests for the vectorised multi-rectangle intersection helper."""
+
+    RECTS = [
+        Rectangle(x=300, y=0, width=50, height=50),
+        Rectangle(x=50, y=50, width=0, height=100),  # zero area
+        Rectangle(x=120, y=80, width=40, height=40),
+        Rectangle(x=100, y=90, width=10, height=10),
+    ]
+
+    @staticmethod
+    def _extents(rects: list[Rectangle]) -> np.ndarray:
+        return np.array([r.extents() for r in rects], dtype=np.float64)
+
+    @pytest.mark.parametrize(
+        ("p1", "p2"),
+        [
+            ((0, 100), (200, 100)),
+            ((0, 10), (200, 10)),
+            ((130, 0), (130, 300)),
+            ((0, 0), (400, 40)),
+            ((140, 100), (140, 100)),
+            ((0, 200), (200, 200)),
+        ],
+    )
+    def test_matches_scalar_test(
+        self, p1: tuple[int, int], p2: tuple[int, int],
+    ) -> None:
+        expected = next(
+            (
+                i for i, r in enumerate(self.RECTS)
+                if MotionPlanner.line_intersects_rect(p1, p2, r)
+            ),
+            -1,
+        )
+        got = MotionPlanner._first_intersecting(p1, p2, self._extents(self.RECTS))
+        assert got == expected
+
+    def test_route_same_with_batched_checks(
+        self, planner: MotionPlanner, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        rects = [
+            (f"r{i}", Rectangle(x=80 * i + 40, y=60 + (i % 3) * 20, width=30, height=60))
+            for i in range(10)
+        ]
+        monkeypatch.setattr(motion_planner, "_BATCH_INTERSECT_MIN_RECTS", 1000)
+        looped = planner._route_around((0, 100), (900, 110), rects)
+        monkeypatch.setattr(motion_planner, "_BATCH_INTERSECT_MIN_RECTS", 1)
+        batched = planner._route_around((0, 100), (900, 110), rects)
+        assert batched == looped
+        assert len(batched) > 2
+
+
 # ==================================================================
 # estimate_duration_ms
 # ==================================================================
@@ -687,6 +931,102 @@ class TestEstimateDurationMs:
         assert planner.estimate_duration_ms(traj) == 0.0
 
 
+# ==================================================================
+# _path_array
+# ==================================================================
+
+
+def _legacy_path(
+    planner: MotionPlanner, waypoints: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Per-leg float interpolation with junction de-duplication."""
+    merged: list[tuple[int, int]] = []
+    for (sx, sy), (ex, ey) in zip(waypoints, waypoints[1:]):
+        n = planner._steps_for_distance(planner._distance((sx, sy), (ex, ey)))
+        leg = [
+            (
+                round(sx + (ex - sx) * (i / (n - 1))),
+                round(sy + (ey - sy) * (i / (n - 1))),
+            )
+            for i in range(n)
+        ]
+        merged.extend(leg[1:] if merged else leg)
+    return merged
+
+
+def _path_points(
+    planner: MotionPlanner, waypoints: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """``_path_array`` output as a list of tuples."""
+    return planner._to_points(planner._path_array(waypoints))
+
+
+class TestPathArray:
+    """Tests for the fused multi-leg interpolation helper."""
+
+    def test_matches_per_leg_interpolation(self, planner: MotionPlanner) -> None:
+        waypoints = [(0, 0), (640, 15), (640, 15), (-20, 480), (333, 333), (334, 333)]
+        assert _path_points(planner, waypoints) == _legacy_path(planner, waypoints)
+
+    def test_single_leg_keeps_both_endpoints(self, planner: MotionPlanner) -> None:
+        pts = _path_points(planner, [(5, 5), (6, 5)])
+        assert pts == [(5, 5), (6, 5)]
+
+    @pytest.mark.parametrize("length", [30, 50, 70, 90])
+    def test_step_count_ties_agree_with_scalar_path(
+        self, registry: ZoneRegistry, length: int,
+    ) -> None:
+        """Half-frame step counts round up in both code paths."""
+        # 1200 px/s at 60 fps is 20 px per frame, so these lengths
+        # land exactly on .5 frames.
+        planner = MotionPlanner(registry, Settings(motion_speed_pixels_per_sec=1200.0))
+        expected = length // 20 + 1
+        assert planner._steps_for_distance(float(length)) == expected
+        assert len(planner._path_array([(0, 0), (length, 0)])) == expected
+
+    def test_zero_speed_uses_minimum_steps(self, registry: ZoneRegistry) -> None:
+        slow = MotionPlanner(registry, Settings(motion_speed_pixels_per_sec=0.0))
+        pts = _path_points(slow, [(0, 0), (100, 0), (100, 100)])
+        assert pts == [(0, 0), (100, 0), (100, 100)]
+
+
+# ==================================================================
+# _downsample_indices
+# ==================================================================
+
+
+class TestDownsampleIndices:
+    """Tests for MotionPlanner._downsample_indices (static helper)."""
+
+    def test_preserves_endpoints_and_count(self) -> None:
+        idx = MotionPlanner._downsample_indices(1000, 200)
+        assert len(idx) == 200
+        assert idx[0] == 0
+        assert idx[-1] == 999
+
+    def test_indices_ascending_and_unique(self) -> None:
+        idx = MotionPlanner._downsample_indices(731, 200).tolist()
+        assert idx == sorted(set(idx))
+
+    def test_matches_uniform_index_rounding(self) -> None:
+        """Selected indices match ``round(i * step)`` for every slot."""
+        idx = MotionPlanner._downsample_indices(517, 200)
+        step = (517 - 1) / 199
+        assert idx.tolist() == [round(i * step) for i in range(200)]
+
+    def test_downsampled_path_keeps_legacy_endpoints(
+        self, planner: MotionPlanner,
+    ) -> None:
+        """Downsampling a long path keeps its first and last points."""
+        waypoints = [(0, 0), (1900, 0), (1900, 1000), (0, 1000)]
+        legacy = _legacy_path(planner, waypoints)
+        path = planner._path_array(waypoints)
+        kept = planner._to_points(path[MotionPlanner._downsample_indices(len(path), 50)])
+        assert kept[0] == legacy[0]
+        assert kept[-1] == legacy[-1]
+        assert set(kept) <= set(legacy)
+
+
 # ==================================================================
 # Edge cases and integration
 # ==================================================================
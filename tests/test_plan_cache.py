@@ -0,0 +1,244 @@
+"""Unit tests for ciu_agent.core.plan_cache.
+
+Covers fingerprinting, LRU behaviour, discard, and JSON persistence
+with time-to-live expiry.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from ciu_agent.core.plan_cache import PlanCache, plan_fingerprint
+from ciu_agent.models.task import TaskPlan, TaskStep
+from ciu_agent.models.zone import Rectangle, Zone, ZoneType
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+
+def _make_zone(
+    zone_id: str = "btn_ok",
+    label: str = "OK",
+    x: int = 100,
+    y: int = 200,
+) -> Zone:
+    """Return a button Zone with a fixed size."""
+    return Zone(
+        id=zone_id,
+        bounds=Rectangle(x=x, y=y, width=80, height=30),
+        type=ZoneType.BUTTON,
+        label=label,
+    )
+
+
+def _make_plan(task: str = "Click OK", zone_id: str = "btn_ok") -> TaskPlan:
+    """Return a successful one-step plan."""
+    return TaskPlan(
+        task_description=task,
+        steps=[
+            TaskStep(
+                step_number=1,
+                zone_id=zone_id,
+                zone_label="OK",
+                action_type="click",
+                parameters={"button": "left"},
+            )
+        ],
+        raw_response="[...]",
+        success=True,
+        api_calls_used=1,
+        latency_ms=850.0,
+    )
+
+
+# ------------------------------------------------------------------
+# Fingerprint
+# ------------------------------------------------------------------
+
+
+class TestPlanFingerprint:
+    """Tests for plan_fingerprint."""
+
+    def test_task_case_and_spacing_ignored(self) -> None:
+        """Task text is normalised before hashing."""
+        zones = [_make_zone()]
+        assert plan_fingerprint("Click  OK ", zones) == plan_fingerprint("click ok", zones)
+
+    def test_punctuation_and_courtesy_ignored(self) -> None:
+        """Punctuation and "please" do not change the key."""
+        polite = plan_fingerprint("Please open Settings.", [])
+        assert polite == plan_fingerprint("open settings", [])
+
+    def test_different_words_change_key(self) -> None:
+        """Tasks differing in a word are never conflated."""
+        assert plan_fingerprint("open settings", []) != plan_fingerprint("close settings", [])
+
+    def test_zone_order_ignored(self) -> None:
+        """The same zones in another order give the same key."""
+        a, b = _make_zone("a", "A"), _make_zone("b", "B", x=300)
+        assert plan_fingerprint("t", [a, b]) == plan_fingerprint("t", [b, a])
+
+    def test_moved_zone_changes_key(self) -> None:
+        """A zone whose center moved gives a different key."""
+        assert plan_fingerprint("t", [_make_zone()]) != plan_fingerprint("t", [_make_zone(x=400)])
+
+    def test_platform_changes_key(self) -> None:
+        """The same task and zones on another OS give a different key."""
+        zones = [_make_zone()]
+        assert plan_fingerprint("t", zones, "windows") != plan_fingerprint("t", zones, "macos")
+
+
+# ------------------------------------------------------------------
+# In-memory cache
+# ------------------------------------------------------------------
+
+
+class TestPlanCache:
+    """Tests for PlanCache lookups, eviction, and discard."""
+
+    def test_miss_returns_none(self) -> None:
+        """An empty cache has no plan."""
+        assert PlanCache().get("Click OK", [_make_zone()]) is None
+
+    def test_hit_returns_fresh_plan(self) -> None:
+        """A hit rebuilds the plan with zero API cost."""
+        cache = PlanCache()
+        zones = [_make_zone()]
+        cache.put("Click OK", zones, _make_plan())
+
+        plan = cache.get("click ok", zones)
+
+        assert plan is not None
+        assert plan.success is True
+        assert plan.task_description == "click ok"
+        assert plan.steps[0].zone_id == "btn_ok"
+        assert plan.api_calls_used == 0
+        assert plan.latency_ms == 0.0
+
+    def test_failed_plan_not_stored(self) -> None:
+        """Failed or empty plans are never cached."""
+        cache = PlanCache()
+        cache.put("t", [], TaskPlan(task_description="t", success=False))
+        cache.put("t", [], TaskPlan(task_description="t", success=True))
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self) -> None:
+        """The oldest untouched entry is evicted beyond max_entries."""
+        cache = PlanCache(max_entries=2)
+        cache.put("one", [], _make_plan("one"))
+        cache.put("two", [], _make_plan("two"))
+        cache.get("one", [])
+        cache.put("three", [], _make_plan("three"))
+
+        assert cache.get("one", []) is not None
+        assert cache.get("two", []) is None
+        assert cache.get("three", []) is not None
+
+    def test_expired_entry_missed(self) -> None:
+        """An entry older than the TTL is not served, even in memory."""
+        cache = PlanCache(ttl_seconds=60.0)
+        cache.put("Click OK", [], _make_plan())
+        key = next(iter(cache._entries))
+        task, _, steps, raw = cache._entries[key]
+        cache._entries[key] = (task, time.time() - 120.0, steps, raw)
+
+        assert cache.get("Click OK", []) is None
+        assert len(cache) == 0
+
+    def test_discard_removes_task_for_all_zones(self) -> None:
+        """discard drops every entry for the task."""
+        cache = PlanCache()
+        cache.put("Click OK", [], _make_plan())
+        cache.put("Click OK", [_make_zone()], _make_plan())
+        cache.put("Other", [], _make_plan("Other"))
+
+        assert cache.discard("click ok") == 2
+        assert len(cache) == 1
+
+
+# ------------------------------------------------------------------
+# Persistence
+# ------------------------------------------------------------------
+
+
+class TestPlanCachePersistence:
+    """Tests for saving and reloading the cache file."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """A new cache on the same path sees earlier plans."""
+        path = tmp_path / "cache" / "plans.json"
+        zones = [_make_zone()]
+        PlanCache(path=path).put("Click OK", zones, _make_plan())
+
+        plan = PlanCache(path=path).get("Click OK", zones)
+
+        assert plan is not None
+        assert plan.steps[0].parameters == {"button": "left"}
+        assert not path.with_name("plans.json.tmp").exists()
+
+    def test_expired_entries_dropped_on_load(self, tmp_path: Path) -> None:
+        """Entries older than the TTL are ignored."""
+        path = tmp_path / "plans.json"
+        PlanCache(path=path).put("Click OK", [], _make_plan())
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["entries"][0]["stored_at"] = time.time() - 120.0
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert len(PlanCache(path=path, ttl_seconds=60.0)) == 0
+
+    def test_platforms_kept_apart(self, tmp_path: Path) -> None:
+        """A shared file never serves one platform's plan to another."""
+        path = tmp_path / "plans.json"
+        PlanCache(path=path, platform="windows").put("Save", [], _make_plan("Save"))
+
+        assert PlanCache(path=path, platform="macos").get("Save", []) is None
+        assert PlanCache(path=path, platform="windows").get("Save", []) is not None
+
+    def test_concurrent_puts(self, tmp_path: Path) -> None:
+        """Threads storing and reading plans at once never corrupt the cache."""
+        path = tmp_path / "plans.json"
+        cache = PlanCache(max_entries=8, path=path)
+        errors: list[BaseException] = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(25):
+                    task = f"task {n} {i}"
+                    cache.put(task, [], _make_plan(task))
+                    cache.get(f"task {n} {i - 1}", [])
+            except BaseException as exc:  # noqa: BLE001 - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads often to expose races
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert len(cache) == 8
+        assert len(PlanCache(path=path)) == 8
+
+    def test_corrupt_file_ignored(self, tmp_path: Path) -> None:
+        """An unreadable cache file starts an empty cache."""
+        path = tmp_path / "plans.json"
+        path.write_text("{not json", encoding="utf-8")
+
+        assert len(PlanCache(path=path)) == 0
+
+    def test_non_object_file_ignored(self, tmp_path: Path) -> None:
+        """A cache file holding valid JSON of the wrong shape is ignored."""
+        path = tmp_path / "plans.json"
+        path.write_text("[]", encoding="utf-8")
+
+        assert len(PlanCache(path=path)) == 0
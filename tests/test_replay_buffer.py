@@ -7,15 +7,20 @@ stop), file output verification, and session reloading.
 from __future__ import annotations
 
 import json
+import os
 import re
-from dataclasses import replace
+import tarfile
+import time
+from dataclasses import asdict, replace
 from pathlib import Path
 
+import cv2
 import numpy as np
 import pytest
 
 from ciu_agent.config.settings import get_default_settings
-from ciu_agent.core.replay_buffer import ReplayBuffer, SessionMetadata
+from ciu_agent.core import replay_buffer
+from ciu_agent.core.replay_buffer import CursorSample, ReplayBuffer, SessionMetadata
 from ciu_agent.models.actions import Action, ActionStatus, ActionType
 from ciu_agent.models.events import SpatialEvent, SpatialEventType
 
@@ -40,6 +45,16 @@ def settings_no_png(tmp_path: Path):
     )
 
 
+@pytest.fixture
+def settings_sharded(tmp_path: Path):
+    """Settings that pack frames into tar shards of two frames each."""
+    return replace(
+        get_default_settings(),
+        session_dir=str(tmp_path),
+        frame_shard_size=2,
+    )
+
+
 @pytest.fixture
 def buf(settings):
     """A fresh ReplayBuffer backed by a temporary session directory."""
@@ -128,6 +143,11 @@ class TestSessionMetadata:
         assert isinstance(meta.screen_width, int)
         assert isinstance(meta.screen_height, int)
 
+    def test_to_dict_matches_asdict(self) -> None:
+        """to_dict returns every field, same as dataclasses.asdict."""
+        meta = SessionMetadata(session_id="t", start_time=1.0, frame_count=3)
+        assert meta.to_dict() == asdict(meta)
+
 
 # ---------------------------------------------------------------------------
 # ReplayBuffer lifecycle tests
@@ -234,6 +254,7 @@ class TestRecording:
         buf.start_session(session_id="png_test")
         buf.record_frame(test_frame, 0, 0, 1000.0, 1)
         buf.record_frame(test_frame, 0, 0, 1001.0, 2)
+        buf.flush_frames()
 
         frames_dir = buf.session_path / "frames"
         assert (frames_dir / "000001.png").exists()
@@ -241,6 +262,54 @@ class TestRecording:
 
         buf.stop_session()
 
+    def test_stop_session_waits_for_queued_frames(
+        self,
+        buf: ReplayBuffer,
+        test_frame: np.ndarray,
+    ) -> None:
+        """stop_session drains the writer queue before returning."""
+        buf.start_session(session_id="drain")
+        for n in range(1, 11):
+            buf.record_frame(test_frame, 0, 0, 1000.0 + n, n)
+        session_dir = buf.stop_session()
+
+        pngs = sorted((session_dir / "frames").glob("*.png"))
+        assert [p.name for p in pngs] == [f"{n:06d}.png" for n in range(1, 11)]
+
+    def test_writer_failure_raised_at_stop(
+        self,
+        buf: ReplayBuffer,
+        test_frame: np.ndarray,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A frame that fails to encode is reported by stop_session."""
+
+        def fail(*args: object) -> bool:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(replay_buffer.cv2, "imencode", fail)
+        buf.start_session(session_id="fail")
+        buf.record_frame(test_frame, 0, 0, 1000.0, 1)
+        buf.record_frame(test_frame, 0, 0, 1001.0, 2)
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            buf.stop_session()
+        assert buf.is_recording is False
+
+    def test_saved_png_matches_encoder_output(
+        self,
+        buf: ReplayBuffer,
+    ) -> None:
+        """Frame files hold exactly the bytes cv2.imencode produced."""
+        image = np.arange(300, dtype=np.uint8).reshape(10, 10, 3)
+        buf.start_session(session_id="bytes")
+        buf.record_frame(image, 0, 0, 1.0, 1)
+        session_dir = buf.stop_session()
+
+        ok, expected = cv2.imencode(".png", image)
+        assert ok
+        assert (session_dir / "frames" / "000001.png").read_bytes() == expected.tobytes()
+
     def test_record_frame_no_png_when_disabled(
         self,
         buf_no_png: ReplayBuffer,
@@ -270,6 +339,33 @@ class TestRecording:
         lines = events_path.read_text(encoding="utf-8").strip().split("\n")
         assert len(lines) == 2
 
+    def test_event_and_action_files_opened_at_start(
+        self,
+        buf: ReplayBuffer,
+    ) -> None:
+        """events.jsonl and actions.jsonl exist as soon as recording starts."""
+        buf.start_session(session_id="stream")
+        assert (buf.session_path / "events.jsonl").exists()
+        assert (buf.session_path / "actions.jsonl").exists()
+        buf.stop_session()
+
+    def test_action_recorded_as_of_record_time(
+        self,
+        buf: ReplayBuffer,
+        sample_action: Action,
+    ) -> None:
+        """Mutating an action after record_action does not change the log."""
+        buf.start_session(session_id="snapshot")
+        buf.record_action(sample_action)
+        sample_action.result = "changed later"
+        sample_action.parameters["button"] = "right"
+        session_dir = buf.stop_session()
+
+        line = (session_dir / "actions.jsonl").read_text(encoding="utf-8").strip()
+        obj = json.loads(line)
+        assert obj["result"] == "clicked"
+        assert obj["parameters"] == {"button": "left"}
+
     def test_record_action_buffers_actions(
         self,
         buf: ReplayBuffer,
@@ -335,6 +431,29 @@ class TestStopSession:
         session_dir = buf.stop_session()
         assert (session_dir / "metadata.json").exists()
 
+    @pytest.mark.skipif(not Path("/proc/self/fd").is_dir(), reason="needs Linux /proc")
+    def test_stop_syncs_frames_and_session_directories(
+        self,
+        buf: ReplayBuffer,
+        test_frame: np.ndarray,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """stop_session fsyncs the two directories, not each file."""
+        synced: list[str] = []
+        real_fsync = os.fsync
+
+        def tracking_fsync(fd: int) -> None:
+            synced.append(os.readlink(f"/proc/self/fd/{fd}"))
+            real_fsync(fd)
+
+        monkeypatch.setattr(replay_buffer.os, "fsync", tracking_fsync)
+        buf.start_session(session_id="sync")
+        buf.record_frame(test_frame, 0, 0, 1.0, 1)
+        session_dir = buf.stop_session()
+
+        real_dir = session_dir.resolve()
+        assert synced == [str(real_dir / "frames"), str(real_dir)]
+
     def test_after_stop_is_recording_false(
         self,
         buf: ReplayBuffer,
@@ -410,6 +529,294 @@ class TestLoadSession:
         assert loaded.action_count == 1
 
 
+# ---------------------------------------------------------------------------
+# Frame shard tests
+# ---------------------------------------------------------------------------
+
+
+class TestFrameShards:
+    """Tests for tar-sharded frame storage and load_frames."""
+
+    def test_shards_roll_over_at_configured_size(self, settings_sharded) -> None:
+        """Five frames with a shard size of two produce three shards."""
+        buf = ReplayBuffer(settings_sharded)
+        buf.start_session(session_id="shards")
+        for n in range(1, 6):
+            buf.record_frame(np.full((8, 8, 3), n, dtype=np.uint8), 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        frames_dir = session_dir / "frames"
+        assert [p.name for p in sorted(frames_dir.iterdir())] == [
+            "000000.tar",
+            "000001.tar",
+            "000002.tar",
+        ]
+
+    def test_concurrent_encodes_stored_in_order(self, settings_sharded, monkeypatch) -> None:
+        """Frames finishing out of order on the encoder pool are stored in order."""
+        real_imencode = cv2.imencode
+
+        def slow_first(ext: str, image: np.ndarray, params: object) -> tuple[bool, np.ndarray]:
+            if image[0, 0, 0] == 1:
+                time.sleep(0.05)
+            return real_imencode(ext, image, params)
+
+        monkeypatch.setattr(replay_buffer, "_ENCODE_WORKERS", 4)
+        monkeypatch.setattr(replay_buffer.cv2, "imencode", slow_first)
+        buf = ReplayBuffer(replace(settings_sharded, frame_shard_size=8))
+        buf.start_session(session_id="order")
+        for n in range(1, 5):
+            buf.record_frame(np.full((8, 8, 3), n, dtype=np.uint8), 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        with tarfile.open(session_dir / "frames" / "000000.tar") as tar:
+            assert tar.getnames() == [f"{n:06d}.png" for n in range(1, 5)]
+
+    def test_load_frames_round_trips_shards(self, settings_sharded) -> None:
+        """load_frames decodes shard members back to the recorded pixels."""
+        buf = ReplayBuffer(settings_sharded)
+        buf.start_session(session_id="shard_rt")
+        images = [np.full((8, 8, 3), n * 10, dtype=np.uint8) for n in range(1, 4)]
+        for n, image in enumerate(images, start=1):
+            buf.record_frame(image, 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        loaded = list(buf.load_frames(session_dir))
+        assert [n for n, _ in loaded] == [1, 2, 3]
+        for (_, got), want in zip(loaded, images):
+            np.testing.assert_array_equal(got, want)
+
+    def test_load_frames_reads_png_files(
+        self,
+        buf: ReplayBuffer,
+    ) -> None:
+        """load_frames also reads the one-file-per-frame layout."""
+        image = np.full((8, 8, 3), 7, dtype=np.uint8)
+        buf.start_session(session_id="png_rt")
+        buf.record_frame(image, 0, 0, 1.0, 4)
+        session_dir = buf.stop_session()
+
+        loaded = list(buf.load_frames(session_dir))
+        assert len(loaded) == 1
+        assert loaded[0][0] == 4
+        np.testing.assert_array_equal(loaded[0][1], image)
+
+
+class TestFinalize:
+    """Tests for the background PNG recompression pass."""
+
+    @staticmethod
+    def _image() -> np.ndarray:
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        image[:, ::4] = 200
+        return image
+
+    @pytest.mark.parametrize("shard_size", [0, 2])
+    def test_recompresses_losslessly(self, settings, shard_size: int) -> None:
+        """finalize shrinks frames without changing their pixels."""
+        buf = ReplayBuffer(replace(settings, frame_shard_size=shard_size))
+        image = self._image()
+        buf.start_session(session_id=f"fin_{shard_size}")
+        for n in range(1, 4):
+            buf.record_frame(image, 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        saved = buf.finalize(session_dir).result(timeout=10)
+        assert saved > 0
+        loaded = list(buf.load_frames(session_dir))
+        assert [n for n, _ in loaded] == [1, 2, 3]
+        for _, got in loaded:
+            np.testing.assert_array_equal(got, image)
+        assert not list((session_dir / "frames").glob("*.tmp"))
+
+    def test_invalid_level_rejected(self, buf: ReplayBuffer, tmp_path: Path) -> None:
+        """finalize raises ValueError for levels outside 0-9."""
+        with pytest.raises(ValueError, match="level"):
+            buf.finalize(tmp_path, level=10)
+
+
+class TestFrameCodec:
+    """Tests for the frame_codec setting."""
+
+    def test_webp_frames_round_trip_losslessly(self, settings) -> None:
+        """WebP frames are saved with a .webp extension and decode exactly."""
+        buf = ReplayBuffer(replace(settings, frame_codec="webp"))
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=(16, 16, 3), dtype=np.uint8)
+        buf.start_session(session_id="webp")
+        buf.record_frame(image, 0, 0, 1.0, 1)
+        session_dir = buf.stop_session()
+
+        assert (session_dir / "frames" / "000001.webp").exists()
+        ((number, loaded),) = list(buf.load_frames(session_dir))
+        assert number == 1
+        np.testing.assert_array_equal(loaded, image)
+
+    def test_unknown_codec_rejected(self, settings) -> None:
+        """start_session raises ValueError for an unsupported codec."""
+        buf = ReplayBuffer(replace(settings, frame_codec="gif"))
+        with pytest.raises(ValueError, match="frame_codec"):
+            buf.start_session(session_id="bad")
+        assert buf.is_recording is False
+
+
+class TestKeyframeDeltas:
+    """Tests for keyframe + XOR delta frame storage."""
+
+    @staticmethod
+    def _frames() -> list[np.ndarray]:
+        rng = np.random.default_rng(1)
+        base = rng.integers(0, 256, size=(12, 16, 3), dtype=np.uint8)
+        frames = []
+        for n in range(5):
+            frame = base.copy()
+            frame[n, n] = 255 - frame[n, n]
+            frames.append(frame)
+        return frames
+
+    def test_only_keyframes_encoded_in_full(self, settings) -> None:
+        """With an interval of 3, frames 1 and 4 are keyframes."""
+        buf = ReplayBuffer(replace(settings, keyframe_interval=3))
+        buf.start_session(session_id="delta")
+        for n, frame in enumerate(self._frames(), start=1):
+            buf.record_frame(frame, 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        frames_dir = session_dir / "frames"
+        assert sorted(p.name for p in frames_dir.glob("*.png")) == ["000001.png", "000004.png"]
+        index = json.loads((frames_dir / "delta.json").read_text(encoding="utf-8"))
+        assert [(entry[0], entry[1]) for entry in index] == [(2, 1), (3, 1), (5, 4)]
+
+    @pytest.mark.parametrize("shard_size", [0, 2])
+    def test_load_frames_reconstructs_deltas(self, settings, shard_size: int) -> None:
+        """load_frames rebuilds every frame exactly, in order."""
+        buf = ReplayBuffer(replace(settings, keyframe_interval=3, frame_shard_size=shard_size))
+        frames = self._frames()
+        buf.start_session(session_id=f"delta_rt_{shard_size}")
+        for n, frame in enumerate(frames, start=1):
+            buf.record_frame(frame, 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        loaded = list(buf.load_frames(session_dir))
+        assert [n for n, _ in loaded] == [1, 2, 3, 4, 5]
+        for (_, got), want in zip(loaded, frames):
+            np.testing.assert_array_equal(got, want)
+
+
+class TestFrameReduction:
+    """Tests for the record_scale and record_grayscale settings."""
+
+    def test_scale_and_grayscale_applied_before_encoding(self, settings) -> None:
+        """Saved frames are downscaled and single-channel."""
+        buf = ReplayBuffer(replace(settings, record_scale=0.5, record_grayscale=True))
+        buf.start_session(session_id="reduce")
+        buf.record_frame(np.full((40, 60, 3), 128, dtype=np.uint8), 0, 0, 1.0, 1)
+        session_dir = buf.stop_session()
+
+        ((_, image),) = list(buf.load_frames(session_dir))
+        assert image.shape == (20, 30)
+        assert int(image[0, 0]) == 128
+
+    @pytest.mark.parametrize("keyframe_interval", [0, 3])
+    def test_webp_grayscale_round_trip(self, settings, keyframe_interval: int) -> None:
+        """Grayscale WebP frames, with or without deltas, load single-channel."""
+        buf = ReplayBuffer(
+            replace(
+                settings,
+                frame_codec="webp",
+                record_grayscale=True,
+                keyframe_interval=keyframe_interval,
+            )
+        )
+        rng = np.random.default_rng(2)
+        frames = [rng.integers(0, 256, size=(20, 30, 3), dtype=np.uint8) for _ in range(4)]
+        buf.start_session(session_id=f"webp_gray_{keyframe_interval}")
+        for n, frame in enumerate(frames, start=1):
+            buf.record_frame(frame, 0, 0, float(n), n)
+        session_dir = buf.stop_session()
+
+        loaded = list(buf.load_frames(session_dir))
+        assert [n for n, _ in loaded] == [1, 2, 3, 4]
+        for (_, got), want in zip(loaded, frames):
+            np.testing.assert_array_equal(got, cv2.cvtColor(want, cv2.COLOR_BGR2GRAY))
+
+    def test_invalid_scale_rejected(self, settings) -> None:
+        """A record_scale outside (0, 1] is rejected at start_session."""
+        buf = ReplayBuffer(replace(settings, record_scale=0.0))
+        with pytest.raises(ValueError, match="record_scale"):
+            buf.start_session(session_id="bad_scale")
+
+
+class TestSkipDuplicateFrames:
+    """Tests for the skip_duplicate_frames setting."""
+
+    def test_repeated_frames_reference_saved_frame(self, settings) -> None:
+        """Identical frames are saved once and referenced via same_as."""
+        buf = ReplayBuffer(replace(settings, skip_duplicate_frames=True))
+        idle = np.zeros((8, 8, 3), dtype=np.uint8)
+        busy = np.full((8, 8, 3), 255, dtype=np.uint8)
+        buf.start_session(session_id="dedupe")
+        buf.record_frame(idle, 0, 0, 1.0, 1)
+        buf.record_frame(idle.copy(), 0, 0, 2.0, 2)
+        buf.record_frame(idle.copy(), 0, 0, 3.0, 3)
+        buf.record_frame(busy, 0, 0, 4.0, 4)
+        session_dir = buf.stop_session()
+
+        pngs = sorted(p.name for p in (session_dir / "frames").iterdir())
+        assert pngs == ["000001.png", "000004.png"]
+
+        lines = (session_dir / "cursor.jsonl").read_text(encoding="utf-8").splitlines()
+        samples = [json.loads(line) for line in lines]
+        assert [s.get("same_as") for s in samples] == [None, 1, 1, None]
+        assert "same_as" not in samples[0]
+
+        meta = json.loads((session_dir / "metadata.json").read_text(encoding="utf-8"))
+        assert meta["frame_count"] == 4
+
+
+class TestCursorFormat:
+    """Tests for the cursor_format setting and load_cursor."""
+
+    def _record(self, buf: ReplayBuffer, session_id: str) -> Path:
+        image = np.zeros((4, 4, 3), dtype=np.uint8)
+        buf.start_session(session_id=session_id)
+        buf.record_frame(image, 1, 2, 10.5, 1)
+        buf.record_frame(image.copy(), 3, 4, 11.25, 2)
+        return buf.stop_session()
+
+    def test_npz_round_trips_through_load_cursor(self, settings) -> None:
+        """cursor.npz replaces cursor.jsonl and loads back exactly."""
+        buf = ReplayBuffer(replace(settings, cursor_format="npz", skip_duplicate_frames=True))
+        session_dir = self._record(buf, "cnpz")
+
+        assert (session_dir / "cursor.npz").exists()
+        assert not (session_dir / "cursor.jsonl").exists()
+        assert buf.load_cursor(session_dir) == [
+            CursorSample(1, 2, 10.5, 1),
+            CursorSample(3, 4, 11.25, 2, same_as=1),
+        ]
+
+    def test_load_cursor_reads_jsonl(self, settings) -> None:
+        """load_cursor returns the same samples from cursor.jsonl."""
+        buf = ReplayBuffer(replace(settings, skip_duplicate_frames=True))
+        session_dir = self._record(buf, "cjsonl")
+
+        assert buf.load_cursor(session_dir) == [
+            CursorSample(1, 2, 10.5, 1),
+            CursorSample(3, 4, 11.25, 2, same_as=1),
+        ]
+
+    def test_cursor_sample_has_no_instance_dict(self) -> None:
+        """CursorSample uses __slots__, so loaded logs stay compact."""
+        assert not hasattr(CursorSample(0, 0, 0.0, 1), "__dict__")
+
+    def test_unknown_cursor_format_rejected(self, settings) -> None:
+        """start_session raises ValueError for an unsupported format."""
+        buf = ReplayBuffer(replace(settings, cursor_format="csv"))
+        with pytest.raises(ValueError, match="cursor_format"):
+            buf.start_session(session_id="bad_cursor")
+
+
 # ---------------------------------------------------------------------------
 # JSONL content tests
 # ---------------------------------------------------------------------------
@@ -459,6 +866,26 @@ class TestJsonlContent:
             assert set(obj.keys()) == {"x", "y", "timestamp", "frame"}
             assert obj["frame"] == i
 
+    def test_cursor_log_grows_past_initial_capacity(
+        self,
+        buf_no_png: ReplayBuffer,
+        test_frame: np.ndarray,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """The cursor array doubles as needed without losing samples."""
+        monkeypatch.setattr(replay_buffer, "_CURSOR_INITIAL_ROWS", 2)
+        buf_no_png.start_session(session_id="cgrow")
+        for n in range(1, 8):
+            buf_no_png.record_frame(test_frame, n, -n, 100.0 + n / 4, n)
+        session_dir = buf_no_png.stop_session()
+
+        lines = (session_dir / "cursor.jsonl").read_text(encoding="utf-8").splitlines()
+        samples = [json.loads(line) for line in lines]
+        assert samples == [
+            {"x": n, "y": -n, "timestamp": 100.0 + n / 4, "frame": n} for n in range(1, 8)
+        ]
+        assert all(isinstance(s["x"], int) for s in samples)
+
     def test_events_jsonl_uses_enum_names(
         self,
         buf: ReplayBuffer,
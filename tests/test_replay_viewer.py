@@ -0,0 +1,179 @@
+"""Unit tests for the CIU Agent replay viewer.
+
+Sessions are recorded with a real ``ReplayBuffer`` into a temporary
+directory, then loaded back through ``SessionLoader``.  Playback runs
+with OpenCV's window functions patched out, so no window is opened.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+from ciu_agent.config.settings import get_default_settings
+from ciu_agent.core.replay_buffer import ReplayBuffer
+from ciu_agent.replay_viewer import ReplayViewer, Session, SessionLoader, _FrameSource
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _cursor(n: int) -> tuple[int, int]:
+    """Cursor position recorded with frame *n*, clear of the text overlay."""
+    return (150 + 10 * n, 120 + 5 * n)
+
+
+def _record(
+    tmp_path: Path,
+    frames: list[np.ndarray],
+    **overrides: Any,
+) -> Path:
+    """Record *frames* (numbered from 1) and return the session directory."""
+    settings = replace(get_default_settings(), session_dir=str(tmp_path), **overrides)
+    buf = ReplayBuffer(settings)
+    buf.start_session(session_id="viewer")
+    for n, frame in enumerate(frames, start=1):
+        buf.record_frame(frame, *_cursor(n), 100.0 + n, n)
+    return buf.stop_session()
+
+
+def _solid(value: int) -> np.ndarray:
+    """Return a BGR frame filled with *value*."""
+    return np.full((160, 240, 3), value, dtype=np.uint8)
+
+
+def _play(session: Session) -> list[np.ndarray]:
+    """Play *session* headlessly and return the images shown."""
+    shown: list[np.ndarray] = []
+    with (
+        patch("ciu_agent.replay_viewer.cv2.imshow", lambda _, image: shown.append(image)),
+        patch("ciu_agent.replay_viewer.cv2.waitKey", return_value=-1),
+        patch("ciu_agent.replay_viewer.cv2.destroyAllWindows"),
+    ):
+        ReplayViewer(session).play()
+    return shown
+
+
+# ---------------------------------------------------------------------------
+# Cursor loading
+# ---------------------------------------------------------------------------
+
+
+class TestCursorLoading:
+    """Tests for SessionLoader cursor samples."""
+
+    def test_npz_cursor_log_loaded(self, tmp_path: Path) -> None:
+        """Sessions recorded with cursor_format="npz" keep their samples."""
+        session_dir = _record(tmp_path, [_solid(0), _solid(50)], cursor_format="npz")
+        assert not (session_dir / "cursor.jsonl").exists()
+
+        session = SessionLoader().load(session_dir)
+
+        assert [(s["x"], s["y"], s["frame"]) for s in session.cursor_samples] == [
+            (*_cursor(1), 1),
+            (*_cursor(2), 2),
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Frame playback
+# ---------------------------------------------------------------------------
+
+
+class TestFramePlayback:
+    """Tests that playback shows each recorded frame with its own cursor."""
+
+    @staticmethod
+    def _assert_timeline(shown: list[np.ndarray], values: list[int]) -> None:
+        """Check each shown frame's fill value and cursor dot."""
+        assert len(shown) == len(values)
+        for n, (image, value) in enumerate(zip(shown, values), start=1):
+            assert int(image[-1, -1, 0]) == value
+            x, y = _cursor(n)
+            assert tuple(int(c) for c in image[y, x]) == (0, 255, 0)
+
+    def test_plain_session(self, tmp_path: Path) -> None:
+        """One image file per frame plays in order."""
+        session_dir = _record(tmp_path, [_solid(10), _solid(20), _solid(30)])
+
+        session = SessionLoader().load(session_dir)
+
+        assert session.frame_numbers == [1, 2, 3]
+        self._assert_timeline(_play(session), [10, 20, 30])
+
+    def test_skipped_duplicates_keep_their_place(self, tmp_path: Path) -> None:
+        """A skipped duplicate shows the saved frame at its own time."""
+        frames = [_solid(10), _solid(10), _solid(10), _solid(40)]
+        session_dir = _record(tmp_path, frames, skip_duplicate_frames=True)
+        assert len(list((session_dir / "frames").glob("*.png"))) == 2
+
+        session = SessionLoader().load(session_dir)
+
+        assert session.frame_count == 4
+        self._assert_timeline(_play(session), [10, 10, 10, 40])
+
+    def test_sharded_session(self, tmp_path: Path) -> None:
+        """Frames packed into tar shards are found and played."""
+        frames = [_solid(v) for v in (10, 20, 30, 40, 50)]
+        session_dir = _record(tmp_path, frames, frame_shard_size=2)
+        assert not list((session_dir / "frames").glob("*.png"))
+
+        session = SessionLoader().load(session_dir)
+
+        assert session.frame_count == 5
+        self._assert_timeline(_play(session), [10, 20, 30, 40, 50])
+
+    def test_keyframe_deltas_rebuilt(self, tmp_path: Path) -> None:
+        """Frames stored as deltas are rebuilt and shown at their own time."""
+        frames = [_solid(v) for v in (10, 20, 30, 40, 50)]
+        session_dir = _record(tmp_path, frames, keyframe_interval=3)
+        assert len(list((session_dir / "frames").glob("*.png"))) == 2
+
+        session = SessionLoader().load(session_dir)
+
+        assert session.frame_count == 5
+        self._assert_timeline(_play(session), [10, 20, 30, 40, 50])
+
+    def test_grayscale_frames_shown_in_colour(self, tmp_path: Path) -> None:
+        """Single-channel recordings are converted before drawing overlays."""
+        session_dir = _record(tmp_path, [_solid(60), _solid(90)], record_grayscale=True)
+
+        shown = _play(SessionLoader().load(session_dir))
+
+        assert all(image.ndim == 3 for image in shown)
+        self._assert_timeline(shown, [60, 90])
+
+    def test_session_without_frames(self, tmp_path: Path) -> None:
+        """Sessions recorded without images have nothing to play."""
+        session_dir = _record(tmp_path, [_solid(10)], save_frames_as_png=False)
+
+        session = SessionLoader().load(session_dir)
+
+        assert session.frame_count == 0
+        assert _play(session) == []
+
+
+class TestFrameSource:
+    """Tests for random access to decoded frames."""
+
+    def test_step_back_past_history_redecodes(self, tmp_path: Path) -> None:
+        """Frames evicted from the history are decoded again on demand."""
+        session_dir = _record(tmp_path, [_solid(v) for v in (10, 20, 30, 40)])
+        source = _FrameSource(session_dir)
+
+        with patch("ciu_agent.replay_viewer._HISTORY_FRAMES", 2):
+            assert int(source.image_for(4)[0, 0, 0]) == 40
+            assert int(source.image_for(1)[0, 0, 0]) == 10
+            assert int(source.image_for(3)[0, 0, 0]) == 30
+        source.close()
+
+    def test_before_first_frame_is_none(self, tmp_path: Path) -> None:
+        """A frame number below every stored frame has no image."""
+        source = _FrameSource(_record(tmp_path, [_solid(10)]))
+        assert source.image_for(0) is None
+        source.close()
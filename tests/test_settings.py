@@ -43,6 +43,10 @@ class TestGetDefaultSettings:
         """Default stability_wait_ms is 500."""
         assert get_default_settings().stability_wait_ms == 500
 
+    def test_profile_classifier_default(self) -> None:
+        """Default profile_classifier is False."""
+        assert get_default_settings().profile_classifier is False
+
     def test_min_zone_confidence_default(self) -> None:
         """Default min_zone_confidence is 0.7."""
         assert get_default_settings().min_zone_confidence == 0.7
@@ -59,6 +63,22 @@ class TestGetDefaultSettings:
         """Default motion_speed_pixels_per_sec is 1500.0."""
         assert get_default_settings().motion_speed_pixels_per_sec == 1500.0
 
+    def test_plan_cache_size_default(self) -> None:
+        """Default plan_cache_size is 0 (plan cache disabled)."""
+        assert get_default_settings().plan_cache_size == 0
+
+    def test_plan_cache_path_default(self) -> None:
+        """Default plan_cache_path is empty (memory only)."""
+        assert get_default_settings().plan_cache_path == ""
+
+    def test_plan_cache_ttl_seconds_default(self) -> None:
+        """Default plan_cache_ttl_seconds is seven days."""
+        assert get_default_settings().plan_cache_ttl_seconds == 604800.0
+
+    def test_plan_max_zones_default(self) -> None:
+        """Default plan_max_zones is 200."""
+        assert get_default_settings().plan_max_zones == 200
+
     def test_api_timeout_vision_seconds_default(self) -> None:
         """Default api_timeout_vision_seconds is 30.0."""
         assert get_default_settings().api_timeout_vision_seconds == 30.0
@@ -87,6 +107,34 @@ class TestGetDefaultSettings:
         """Default save_frames_as_png is True."""
         assert get_default_settings().save_frames_as_png is True
 
+    def test_frame_codec_default(self) -> None:
+        """Default frame_codec is png."""
+        assert get_default_settings().frame_codec == "png"
+
+    def test_frame_shard_size_default(self) -> None:
+        """Default frame_shard_size is 0 (one image file per frame)."""
+        assert get_default_settings().frame_shard_size == 0
+
+    def test_keyframe_interval_default(self) -> None:
+        """Default keyframe_interval is 0 (every frame stored in full)."""
+        assert get_default_settings().keyframe_interval == 0
+
+    def test_record_scale_default(self) -> None:
+        """Default record_scale is 1.0 (full resolution)."""
+        assert get_default_settings().record_scale == 1.0
+
+    def test_record_grayscale_default(self) -> None:
+        """Default record_grayscale is False."""
+        assert get_default_settings().record_grayscale is False
+
+    def test_skip_duplicate_frames_default(self) -> None:
+        """Default skip_duplicate_frames is False."""
+        assert get_default_settings().skip_duplicate_frames is False
+
+    def test_cursor_format_default(self) -> None:
+        """Default cursor_format is jsonl."""
+        assert get_default_settings().cursor_format == "jsonl"
+
     def test_compress_video_default(self) -> None:
         """Default compress_video is True."""
         assert get_default_settings().compress_video is True
@@ -212,6 +260,10 @@ class TestSettingsFieldTypes:
             "stability_wait_ms",
             "hover_threshold_ms",
             "api_max_retries",
+            "frame_shard_size",
+            "keyframe_interval",
+            "plan_cache_size",
+            "plan_max_zones",
         ]
         for name in int_fields:
             value = getattr(s, name)
@@ -230,6 +282,8 @@ class TestSettingsFieldTypes:
             "api_timeout_vision_seconds",
             "api_timeout_text_seconds",
             "api_backoff_base_seconds",
+            "record_scale",
+            "plan_cache_ttl_seconds",
         ]
         for name in float_fields:
             value = getattr(s, name)
@@ -241,6 +295,9 @@ class TestSettingsFieldTypes:
         bool_fields = [
             "recording_enabled",
             "save_frames_as_png",
+            "profile_classifier",
+            "record_grayscale",
+            "skip_duplicate_frames",
             "compress_video",
         ]
         for name in bool_fields:
@@ -250,7 +307,13 @@ class TestSettingsFieldTypes:
     def test_str_fields(self) -> None:
         """String fields must be str."""
         s = get_default_settings()
-        str_fields = ["session_dir", "platform_name"]
+        str_fields = [
+            "session_dir",
+            "frame_codec",
+            "cursor_format",
+            "plan_cache_path",
+            "platform_name",
+        ]
         for name in str_fields:
             value = getattr(s, name)
             assert isinstance(value, str), f"{name} should be str, got {type(value).__name__}"
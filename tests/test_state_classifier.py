@@ -7,6 +7,7 @@ no live screen, display server, or CaptureEngine is required.
 from __future__ import annotations
 
 from ciu_agent.config.settings import Settings, get_default_settings
+from ciu_agent.core import state_classifier
 from ciu_agent.core.capture_engine import DiffResult
 from ciu_agent.core.state_classifier import (
     ChangeClassification,
@@ -108,11 +109,18 @@ class TestNoChange:
         assert result.wait_ms == 0
 
     def test_no_change_empty_regions(self) -> None:
-        """NO_CHANGE returns empty regions list."""
+        """NO_CHANGE returns an empty regions tuple."""
         c = _make_classifier()
         diff = _make_diff(changed_percent=0.1)
         result = c.classify(diff, (0, 0))
-        assert result.regions == []
+        assert result.regions == ()
+
+    def test_no_change_result_is_shared(self) -> None:
+        """Idle frames reuse one NO_CHANGE classification."""
+        c = _make_classifier()
+        first = c.classify(_make_diff(changed_percent=0.0), (0, 0))
+        second = c.classify(_make_diff(changed_percent=0.1), (5, 5))
+        assert first is second
 
     def test_no_change_confidence_is_one(self) -> None:
         """NO_CHANGE has confidence 1.0."""
@@ -411,6 +419,16 @@ class TestRegionPatterns:
         )
         assert result.change_type == ChangeType.MENU_OPENED
 
+    def test_menu_opened_before_many_far_regions(self) -> None:
+        """A menu region followed by far-off regions -> MENU_OPENED."""
+        far = [(1500 + i, 900, 10, 10) for i in range(200)]
+        result = self._classify_moderate(
+            regions=[(100, 100, 60, 200), *far],
+            cursor_pos=(120, 120),
+            changed_percent=2.0,
+        )
+        assert result.change_type == ChangeType.MENU_OPENED
+
     def test_menu_opened_medium_wait(self) -> None:
         """MENU_OPENED has should_wait=True with 300ms."""
         result = self._classify_moderate(
@@ -559,6 +577,10 @@ class TestStabilityWait:
         c = _make_classifier()
         return c._estimate_stability_wait(change_type)
 
+    def test_table_covers_every_change_type(self) -> None:
+        """Every ChangeType has a tier and wait policy entry."""
+        assert set(state_classifier._CLASSIFICATION_TABLE) == set(ChangeType)
+
     def test_no_change_no_wait(self) -> None:
         assert self._get_wait(ChangeType.NO_CHANGE) == (False, 0)
 
@@ -621,6 +643,22 @@ class TestChangeClassification:
             cc = ChangeClassification(change_type=ct, tier=0)
             assert cc.change_type == ct
 
+    def test_change_type_labels(self) -> None:
+        """ChangeType.label gives the lowercase name used in logs."""
+        assert ChangeType.MENU_OPENED.label == "menu_opened"
+        assert ChangeType.NO_CHANGE.label == "no_change"
+
+    def test_has_no_instance_dict(self) -> None:
+        """ChangeClassification uses __slots__ to stay compact per frame."""
+        cc = ChangeClassification(change_type=ChangeType.NO_CHANGE, tier=0)
+        assert not hasattr(cc, "__dict__")
+
+    def test_regions_share_diff_list(self) -> None:
+        """Classified regions reference the diff's list instead of copying it."""
+        diff = _make_diff(changed_percent=5.0, changed_regions=[(0, 0, 900, 900)])
+        result = _make_classifier().classify(diff, (5000, 5000))
+        assert result.regions is diff.changed_regions
+
 
 # ==================================================================
 # Test class: Custom settings
@@ -657,3 +695,39 @@ class TestCustomSettings:
         c = StateClassifier(settings)
         should_wait, wait_ms = c._estimate_stability_wait(ChangeType.APP_SWITCH)
         assert wait_ms == 1000
+
+
+# ==================================================================
+# Test class: Classifier profiling
+# ==================================================================
+
+
+class TestProfiling:
+    """Tests for the optional change-type distribution counters."""
+
+    def test_disabled_by_default(self) -> None:
+        """Without profile_classifier nothing is counted."""
+        c = _make_classifier()
+        c.classify(_make_diff(changed_percent=0.0), (0, 0))
+        assert c.branch_counts == {}
+
+    def test_counts_each_change_type(self) -> None:
+        """Idle and non-idle classifications are both counted."""
+        c = _make_classifier(Settings(profile_classifier=True))
+        c.classify(_make_diff(changed_percent=0.0), (0, 0))
+        c.classify(_make_diff(changed_percent=0.1), (0, 0))
+        c.classify(_make_diff(changed_percent=50.0, changed_regions=[(0, 0, 900, 900)]), (0, 0))
+
+        counts = c.branch_counts
+        assert counts[ChangeType.NO_CHANGE] == 2
+        assert counts[ChangeType.PAGE_NAVIGATION] == 1
+
+    def test_distribution_logged_at_interval(self, monkeypatch, caplog) -> None:
+        """The distribution is logged every _PROFILE_LOG_INTERVAL frames."""
+        monkeypatch.setattr(state_classifier, "_PROFILE_LOG_INTERVAL", 2)
+        c = _make_classifier(Settings(profile_classifier=True))
+        with caplog.at_level("INFO", logger=state_classifier.__name__):
+            for _ in range(3):
+                c.classify(_make_diff(changed_percent=0.0), (0, 0))
+        messages = [r.getMessage() for r in caplog.records]
+        assert messages == ["Classifier distribution over 2 frames: no_change=2"]
@@ -14,12 +14,12 @@ from numpy.typing import NDArray
 
 from ciu_agent.config.settings import Settings
 from ciu_agent.core.action_executor import ActionExecutor
-from ciu_agent.core.brush_controller import BrushController
+from ciu_agent.core.brush_controller import BrushActionResult, BrushController
 from ciu_agent.core.motion_planner import MotionPlanner
 from ciu_agent.core.step_executor import StepExecutor, StepResult
 from ciu_agent.core.zone_registry import ZoneRegistry
 from ciu_agent.core.zone_tracker import ZoneTracker
-from ciu_agent.models.actions import ActionType
+from ciu_agent.models.actions import Action, ActionType
 from ciu_agent.models.events import SpatialEventType
 from ciu_agent.models.task import TaskStep
 from ciu_agent.models.zone import Rectangle, Zone, ZoneState, ZoneType
@@ -727,7 +727,98 @@ class TestStepExecutor_ActionFailure:
 
 
 # ------------------------------------------------------------------
-# 6. Edge Cases
+# 6. Global Zone Steps
+# ------------------------------------------------------------------
+
+
+class TestStepExecutor_GlobalZone:
+    """Tests for OS-level steps targeting the ``__global__`` zone."""
+
+    def test_global_key_press_sent_to_platform(self) -> None:
+        """A global key_press goes straight to the platform."""
+        executor, _, platform, _ = _build_executor()
+
+        step = _make_step(
+            zone_id="__global__",
+            action_type="key_press",
+            parameters={"key": "ctrl+s"},
+        )
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is True
+        assert result.action_result is None
+        assert ("key_press", ("ctrl+s",)) in platform.calls
+
+    def test_global_type_text_sent_to_platform(self) -> None:
+        """A global type_text goes straight to the platform."""
+        executor, _, platform, _ = _build_executor()
+
+        step = _make_step(
+            zone_id="__global__",
+            action_type="type_text",
+            parameters={"text": "notepad"},
+        )
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is True
+        assert ("type_text", ("notepad",)) in platform.calls
+
+    def test_global_click_uses_coordinates(self) -> None:
+        """A global click uses the x/y parameters and default button."""
+        executor, _, platform, _ = _build_executor()
+
+        step = _make_step(
+            zone_id="__global__",
+            action_type="click",
+            parameters={"x": "40", "y": 60},
+        )
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is True
+        assert ("click", (40, 60, "left")) in platform.calls
+
+    def test_global_missing_parameter_fails(self) -> None:
+        """A global step without its required parameter fails."""
+        executor, _, platform, _ = _build_executor()
+
+        step = _make_step(zone_id="__global__", action_type="key_press")
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is False
+        assert result.error_type == "action_failed"
+        assert "'key'" in result.error
+        assert platform.calls == []
+
+    def test_global_unsupported_action_fails(self) -> None:
+        """Action types without a global handler are rejected."""
+        executor, *_ = _build_executor()
+
+        step = _make_step(zone_id="__global__", action_type="scroll")
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is False
+        assert result.error_type == "action_failed"
+        assert "'scroll'" in result.error
+
+    def test_global_platform_exception_fails(self) -> None:
+        """A platform error during a global step becomes action_failed."""
+        executor, _, platform, _ = _build_executor()
+        platform.raise_on = "type_text"
+
+        step = _make_step(
+            zone_id="__global__",
+            action_type="type_text",
+            parameters={"text": "hello"},
+        )
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.success is False
+        assert result.error_type == "action_failed"
+        assert "forced error" in result.error
+
+
+# ------------------------------------------------------------------
+# 7. Edge Cases
 # ------------------------------------------------------------------
 
 
@@ -750,6 +841,29 @@ class TestStepExecutor_EdgeCases:
 
         assert result.success is True
 
+    def test_action_shares_step_parameters(self) -> None:
+        """The Action handed to the brush reuses the step's parameters."""
+        zone = _make_zone("btn", 100, 100, 200, 100)
+        executor, brush, _, _ = _build_executor(
+            cursor_pos=(200, 150), zones=[zone]
+        )
+        seen: list[Action] = []
+        original = brush.execute_action
+
+        def capture(action: Action, timestamp: float) -> BrushActionResult:
+            seen.append(action)
+            return original(action, timestamp)
+
+        brush.execute_action = capture  # type: ignore[method-assign]
+        step = _make_step(
+            zone_id="btn",
+            action_type="click",
+            parameters={"button": "left"},
+        )
+        executor.execute(step, timestamp=1.0)
+
+        assert seen[0].parameters is step.parameters
+
     def test_step_result_timestamp_matches_input(self) -> None:
         """StepResult.timestamp matches the timestamp passed to execute."""
         zone = _make_zone("btn", 100, 100, 200, 100)
@@ -762,6 +876,60 @@ class TestStepExecutor_EdgeCases:
 
         assert result.timestamp == 42.5
 
+    def test_step_result_reuses_brush_events(self) -> None:
+        """StepResult.events is the brush result's list, not a copy."""
+        zone = _make_zone("btn", 100, 100, 200, 100)
+        executor, brush, _, _ = _build_executor(
+            cursor_pos=(200, 150), zones=[zone]
+        )
+        results: list[BrushActionResult] = []
+        original = brush.execute_action
+
+        def capture(action: Action, timestamp: float) -> BrushActionResult:
+            results.append(original(action, timestamp))
+            return results[-1]
+
+        brush.execute_action = capture  # type: ignore[method-assign]
+        step = _make_step(zone_id="btn", action_type="click")
+        result = executor.execute(step, timestamp=1.0)
+
+        assert result.events is results[0].events
+
+    def test_step_result_has_no_instance_dict(self) -> None:
+        """StepResult uses __slots__ to stay compact per step."""
+        step = _make_step(zone_id="btn", action_type="click")
+        result = StepResult(step=step, success=True, action_result=None)
+        assert not hasattr(result, "__dict__")
+
+    def test_step_result_failure_factory(self) -> None:
+        """StepResult.failure fills the failure fields with no events."""
+        step = _make_step(zone_id="btn", action_type="click")
+        result = StepResult.failure(step, "boom", "action_failed", 3.0)
+
+        assert result.success is False
+        assert result.action_result is None
+        assert result.events == []
+        assert result.error == "boom"
+        assert result.error_type == "action_failed"
+        assert result.timestamp == 3.0
+
+    def test_step_result_ok_factory(self) -> None:
+        """StepResult.ok fills the success fields with empty errors."""
+        step = _make_step(zone_id="btn", action_type="click")
+        events: list = []
+        result = StepResult.ok(step, None, events, 4.0)
+
+        assert result.success is True
+        assert result.events is events
+        assert result.error == ""
+        assert result.error_type == ""
+        assert result.timestamp == 4.0
+
+    def test_step_executor_has_no_instance_dict(self) -> None:
+        """StepExecutor declares __slots__ for its injected components."""
+        executor, *_ = _build_executor()
+        assert not hasattr(executor, "__dict__")
+
     def test_step_executor_repr(self) -> None:
         """StepExecutor repr produces a human-readable string."""
         zone = _make_zone("btn", 100, 100, 200, 100)
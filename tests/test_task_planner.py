@@ -9,14 +9,22 @@ All HTTP traffic is mocked -- no real API calls are made.
 
 from __future__ import annotations
 
+import asyncio
 import json
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import orjson
 
 from ciu_agent.config.settings import Settings, get_default_settings
-from ciu_agent.core.task_planner import TaskPlanner
+from ciu_agent.core.plan_cache import plan_fingerprint
+from ciu_agent.core.task_planner import TaskPlanner, _Flight, _rank_zones
 from ciu_agent.models.task import TaskPlan, TaskStep
 from ciu_agent.models.zone import (
     Rectangle,
@@ -108,6 +116,8 @@ def _mock_httpx_response(
     resp = MagicMock(spec=httpx.Response)
     resp.status_code = status_code
     resp.text = text or json.dumps(json_body or {})
+    resp.content = resp.text.encode("utf-8")
+    resp.headers = httpx.Headers()
     resp.json.return_value = json_body or {}
     return resp
 
@@ -136,6 +146,51 @@ def _make_mock_client(
     return mock_client
 
 
+def _make_mock_async_client(
+    response: MagicMock | None = None,
+    side_effect: Any = None,
+) -> MagicMock:
+    """Return a mock httpx.AsyncClient with an awaitable ``post``."""
+    mock_client = MagicMock(spec=httpx.AsyncClient)
+    mock_client.post = AsyncMock(return_value=response, side_effect=side_effect)
+    mock_client.aclose = AsyncMock()
+    return mock_client
+
+
+@contextmanager
+def _local_api(body: dict[str, Any]) -> Iterator[str]:
+    """Serve *body* as JSON to every POST on a local port.
+
+    Yields:
+        The URL to post to.
+    """
+    payload = json.dumps(body).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so clients pool
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/v1/messages"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 # ==================================================================
 # Test classes
 # ==================================================================
@@ -170,11 +225,34 @@ class TestBuildPrompt:
         assert isinstance(payload["max_tokens"], int)
         assert payload["max_tokens"] > 0
 
-    def test_system_prompt_is_string(self) -> None:
-        """system field is a non-empty string."""
+    def test_system_prompt_is_cached_text_block(self) -> None:
+        """system is one non-empty text block marked for prompt caching."""
         payload = self.planner.build_prompt("Open settings", [])
-        assert isinstance(payload["system"], str)
-        assert len(payload["system"]) > 0
+        (block,) = payload["system"]
+        assert block["type"] == "text"
+        assert isinstance(block["text"], str)
+        assert len(block["text"]) > 0
+        assert block["cache_control"] == {"type": "ephemeral"}
+
+    def test_system_block_shared_between_payloads(self) -> None:
+        """The static system block is built once, not per call."""
+        first = self.planner.build_prompt("Open settings", [])
+        second = self.planner.build_prompt("Close settings", [])
+        assert first["system"] is second["system"]
+
+    def test_compact_mode_uses_shorter_prompt(self) -> None:
+        """compact=True sends the rules-only system prompt."""
+        compact = TaskPlanner(
+            _make_settings(), api_key="sk-test", compact=True
+        )
+        full_text = self.planner.build_prompt("t", [])["system"][0]["text"]
+        payload = compact.build_prompt("t", [])
+        text = payload["system"][0]["text"]
+        assert len(text) < len(full_text) // 2
+        assert "__global__" in text
+        assert "METHODOLOGY" not in text
+        user_text = payload["messages"][0]["content"][0]["text"]
+        assert "methodology" not in user_text
 
     def test_messages_contain_task_description(self) -> None:
         """User message includes the task description string."""
@@ -274,6 +352,13 @@ class TestParseResponse:
         assert len(steps) == 1
         assert steps[0].action_type == "click"
 
+    def test_action_type_interned(self) -> None:
+        """Parsed action types are interned strings."""
+        text = json.dumps([_make_step_dict(action_type="double_click")])
+
+        steps = self.planner.parse_response(text)
+        assert steps[0].action_type is sys.intern("double_click")
+
     def test_steps_wrapper_object(self) -> None:
         """A JSON object with 'steps' key is unwrapped correctly."""
         data = {"steps": [_make_step_dict(zone_id="btn_1")]}
@@ -385,6 +470,40 @@ class TestParseResponse:
         steps = self.planner.parse_response("[]")
         assert steps == []
 
+    def test_backticks_inside_fenced_json(self) -> None:
+        """Single and double backticks do not end the code block."""
+        item = _make_step_dict(description="Type `ls` then ``pwd``")
+        text = "Plan:\n```json\n" + json.dumps([item]) + "\n```\nDone."
+
+        steps = self.planner.parse_response(text)
+
+        assert steps[0].description == "Type `ls` then ``pwd``"
+
+    def test_mistyped_values_coerced(self) -> None:
+        """Values of the wrong JSON type are still converted."""
+        item = _make_step_dict()
+        item["step_number"] = "4"
+        item["zone_id"] = 17
+        item["parameters"] = [["key", "enter"]]
+
+        steps = self.planner.parse_response(json.dumps([item]))
+
+        assert steps[0].step_number == 4
+        assert steps[0].zone_id == "17"
+        assert steps[0].parameters == {"key": "enter"}
+
+    def test_null_parameters_item_skipped(self) -> None:
+        """An item whose parameters cannot become a dict is skipped."""
+        item = _make_step_dict()
+        item["parameters"] = None
+
+        assert self.planner.parse_response(json.dumps([item])) == []
+
+    def test_task_step_has_no_instance_dict(self) -> None:
+        """TaskStep is a slotted dataclass."""
+        step = TaskStep(1, "btn_ok_1", "OK", "click")
+        assert not hasattr(step, "__dict__")
+
 
 class TestPlan:
     """Tests for TaskPlanner.plan with mocked httpx."""
@@ -474,7 +593,7 @@ class TestPlan:
         assert "API key" in result.error or "api key" in result.error.lower()
 
     def test_http_400_no_retry(self) -> None:
-        """A 4xx error is not retried (only 5xx triggers retries)."""
+        """A 4xx error is not retried (only 429 and 5xx are)."""
         mock_resp = _mock_httpx_response(400, text="Bad request")
 
         settings = _make_settings(api_max_retries=3)
@@ -506,6 +625,60 @@ class TestPlan:
         assert "500" in result.error
         assert mock_client.post.call_count == 3
 
+    def test_http_429_triggers_retry(self) -> None:
+        """A rate-limit response is retried like a server error."""
+        mock_resp = _mock_httpx_response(429, text="Too many requests")
+
+        settings = _make_settings(api_max_retries=3)
+        planner = TaskPlanner(settings, api_key="sk-test")
+
+        mock_client = _make_mock_client(response=mock_resp)
+        with patch("httpx.Client", return_value=mock_client):
+            result = planner.plan("Click OK", [])
+
+        assert "429" in result.error
+        assert mock_client.post.call_count == 3
+
+    def test_http_401_no_retry(self) -> None:
+        """An authentication failure is not retried."""
+        mock_resp = _mock_httpx_response(401, text="Unauthorized")
+
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        mock_client = _make_mock_client(response=mock_resp)
+        with patch("httpx.Client", return_value=mock_client):
+            planner.plan("Click OK", [])
+
+        assert mock_client.post.call_count == 1
+
+    def test_retry_after_header_honoured(self) -> None:
+        """A numeric retry-after header sets the back-off delay."""
+        mock_resp = _mock_httpx_response(429, text="Slow down")
+        mock_resp.headers = httpx.Headers({"retry-after": "7"})
+
+        settings = _make_settings(api_max_retries=2)
+        planner = TaskPlanner(settings, api_key="sk-test")
+        mock_client = _make_mock_client(response=mock_resp)
+        with (
+            patch("httpx.Client", return_value=mock_client),
+            patch("time.sleep") as mock_sleep,
+        ):
+            planner.plan("Click OK", [])
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_backoff_delay_jittered_and_capped(self) -> None:
+        """Computed delays fall in [0, base * 2**attempt], capped."""
+        settings = _make_settings(api_backoff_base_seconds=2.0)
+        planner = TaskPlanner(settings, api_key="sk-test")
+
+        for _ in range(50):
+            assert 0.0 <= planner._backoff_delay(1, None) <= 4.0
+            assert 0.0 <= planner._backoff_delay(10, None) <= 30.0
+        assert planner._backoff_delay(0, "3600") == 30.0
+        # HTTP-date values fall back to the computed delay.
+        delay = planner._backoff_delay(0, "Wed, 21 Oct 2026 07:28:00 GMT")
+        assert 0.0 <= delay <= 2.0
+
     def test_network_error_triggers_retry(self) -> None:
         """An httpx.ConnectError triggers retries."""
         settings = _make_settings(api_max_retries=2)
@@ -534,6 +707,685 @@ class TestPlan:
         assert result.steps == []
 
 
+class TestClientReuse:
+    """Tests for the planner's pooled HTTP client."""
+
+    def test_client_shared_across_plans(self) -> None:
+        """One client serves every attempt and every plan call."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client) as factory:
+            planner.plan("Click OK", [])
+            planner.plan("Click OK again", [])
+
+        assert factory.call_count == 1
+        assert mock_client.post.call_count == 2
+
+    def test_close_releases_client(self) -> None:
+        """close() closes the client and the next plan opens another."""
+        body = _make_api_response_body("[]")
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client) as factory:
+            planner.plan("Click OK", [])
+            planner.close()
+            planner.close()
+            planner.plan("Click OK", [])
+
+        mock_client.close.assert_called_once()
+        assert factory.call_count == 2
+
+    def test_context_manager_closes_client(self) -> None:
+        """Leaving a ``with`` block closes the pooled client."""
+        body = _make_api_response_body("[]")
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+
+        with patch("httpx.Client", return_value=mock_client):
+            with TaskPlanner(_make_settings(), api_key="sk-test") as planner:
+                planner.plan("Click OK", [])
+
+        mock_client.close.assert_called_once()
+
+    def test_http2_used_when_available(self) -> None:
+        """Both clients ask for HTTP/2 when h2 is installed."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        async def open_async() -> None:
+            planner._get_async_client()
+
+        with (
+            patch("ciu_agent.core.task_planner._HTTP2", True),
+            patch("httpx.Client") as sync_factory,
+            patch("httpx.AsyncClient") as async_factory,
+        ):
+            planner._get_client()
+            asyncio.run(open_async())
+
+        assert sync_factory.call_args.kwargs["http2"] is True
+        assert async_factory.call_args.kwargs["http2"] is True
+
+    def test_http1_fallback_without_h2(self) -> None:
+        """Without h2 the client stays on HTTP/1.1."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with (
+            patch("ciu_agent.core.task_planner._HTTP2", False),
+            patch("httpx.Client") as factory,
+        ):
+            planner._get_client()
+
+        assert factory.call_args.kwargs["http2"] is False
+
+    def test_async_client_per_event_loop(self) -> None:
+        """Each ``asyncio.run`` gets a client bound to its own loop."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with (
+            _local_api(body) as url,
+            patch("ciu_agent.core.task_planner._API_URL", url),
+        ):
+            first = asyncio.run(planner.aplan("Click OK", []))
+            second = asyncio.run(planner.aplan("Click Cancel", []))
+
+        assert first.success is True
+        assert second.success is True
+        assert second.steps[0].zone_id == "btn_ok_1"
+
+    def test_async_client_reused_within_loop(self) -> None:
+        """Plans on the same event loop share one async client."""
+        mock_client = _make_mock_async_client(
+            response=_mock_httpx_response(200, _make_api_response_body("[]"))
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        async def run() -> None:
+            await planner.aplan("Click OK", [])
+            await planner.aplan("Click Cancel", [])
+
+        with patch(
+            "httpx.AsyncClient", return_value=mock_client
+        ) as factory:
+            asyncio.run(run())
+
+        assert factory.call_count == 1
+        assert mock_client.post.await_count == 2
+
+
+class TestAsyncPlan:
+    """Tests for TaskPlanner.aplan and aplan_batch."""
+
+    def test_aplan_success(self) -> None:
+        """A 200 response produces a successful plan."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_async_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            result = asyncio.run(planner.aplan("Click OK", []))
+
+        assert result.success is True
+        assert result.steps[0].action_type == "click"
+
+    def test_aplan_no_api_key(self) -> None:
+        """aplan fails fast when no API key is set."""
+        with patch.dict("os.environ", {}, clear=True):
+            planner = TaskPlanner(_make_settings(), api_key="")
+        result = asyncio.run(planner.aplan("Click OK", []))
+
+        assert result.success is False
+
+    def test_aplan_retries_server_errors(self) -> None:
+        """A 500 response is retried up to api_max_retries times."""
+        mock_client = _make_mock_async_client(
+            response=_mock_httpx_response(500, text="Server Error")
+        )
+        settings = _make_settings(
+            api_max_retries=3, api_backoff_base_seconds=0.0
+        )
+        planner = TaskPlanner(settings, api_key="sk-test")
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            result = asyncio.run(planner.aplan("Click OK", []))
+
+        assert result.success is False
+        assert result.api_calls_used == 3
+        assert mock_client.post.await_count == 3
+
+    def test_aplan_batch_preserves_order(self) -> None:
+        """Batch results line up with the input items."""
+        responses = [
+            _mock_httpx_response(
+                200,
+                _make_api_response_body(
+                    json.dumps([_make_step_dict(zone_id=f"z{i}")])
+                ),
+            )
+            for i in range(4)
+        ]
+        mock_client = _make_mock_async_client(side_effect=responses)
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        items = [(f"task {i}", []) for i in range(4)]
+
+        async def run() -> list[TaskPlan]:
+            plans = await planner.aplan_batch(items, concurrency=2)
+            await planner.aclose()
+            return plans
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            plans = asyncio.run(run())
+
+        assert [p.task_description for p in plans] == [
+            "task 0", "task 1", "task 2", "task 3",
+        ]
+        assert [p.steps[0].zone_id for p in plans] == [
+            "z0", "z1", "z2", "z3",
+        ]
+        mock_client.aclose.assert_awaited_once()
+
+    def test_aplan_batch_bounds_concurrency(self) -> None:
+        """No more than ``concurrency`` requests are in flight at once."""
+        body = _make_api_response_body("[]")
+        in_flight = 0
+        peak = 0
+
+        async def slow_post(*args: Any, **kwargs: Any) -> MagicMock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _mock_httpx_response(200, body)
+
+        mock_client = _make_mock_async_client(side_effect=slow_post)
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        items = [(f"task {i}", []) for i in range(6)]
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            plans = asyncio.run(planner.aplan_batch(items, concurrency=2))
+
+        assert len(plans) == 6
+        assert peak == 2
+
+
+class TestShortcutPlans:
+    """Tests for planning single-shortcut tasks without the API."""
+
+    def test_shortcut_task_planned_locally(self) -> None:
+        """'Save the file' becomes one ctrl+s step, no request."""
+        planner = TaskPlanner(
+            _make_settings(),
+            api_key="sk-test",
+            platform_name="windows",
+            shortcuts=True,
+        )
+        mock_client = _make_mock_client()
+        with patch("httpx.Client", return_value=mock_client):
+            result = planner.plan("Save the file.", [])
+
+        assert mock_client.post.call_count == 0
+        assert result.success is True
+        assert result.api_calls_used == 0
+        step = result.steps[0]
+        assert step.zone_id == "__global__"
+        assert step.action_type == "key_press"
+        assert step.parameters == {"key": "ctrl+s"}
+
+    def test_macos_uses_cmd(self) -> None:
+        """On macOS the shortcut uses cmd instead of ctrl."""
+        planner = TaskPlanner(
+            _make_settings(),
+            api_key="sk-test",
+            platform_name="macos",
+            shortcuts=True,
+        )
+        result = asyncio.run(planner.aplan("undo", []))
+        assert result.steps[0].parameters == {"key": "cmd+z"}
+
+    def test_longer_task_goes_to_api(self) -> None:
+        """A task that only starts with a shortcut word is not matched."""
+        planner = TaskPlanner(
+            _make_settings(), api_key="sk-test", shortcuts=True
+        )
+        assert planner._shortcut_plan("Save the report as PDF", []) is None
+        assert planner._shortcut_plan("Copy the", []) is None
+
+    def test_visible_zone_preferred(self) -> None:
+        """A visible Save button sends the task to the API instead."""
+        planner = TaskPlanner(
+            _make_settings(), api_key="sk-test", shortcuts=True
+        )
+        zones = [_make_zone(zone_id="btn_save", label="Save")]
+        assert planner._shortcut_plan("save", zones) is None
+
+    def test_platform_without_shortcut_goes_to_api(self) -> None:
+        """The Run dialog rule only applies on Windows."""
+        planner = TaskPlanner(
+            _make_settings(),
+            api_key="sk-test",
+            platform_name="linux",
+            shortcuts=True,
+        )
+        assert planner._shortcut_plan("open run dialog", []) is None
+
+    def test_disabled_by_default(self) -> None:
+        """Without shortcuts=True every task reaches the API."""
+        body = _make_api_response_body("[]")
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        with patch("httpx.Client", return_value=mock_client):
+            planner.plan("save", [])
+
+        assert mock_client.post.call_count == 1
+
+
+class TestRequestCoalescing:
+    """Tests for sharing one request between identical plan calls."""
+
+    def test_concurrent_aplan_calls_share_request(self) -> None:
+        """Identical concurrent aplan calls send one request."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+
+        async def slow_post(*args: Any, **kwargs: Any) -> MagicMock:
+            await asyncio.sleep(0.01)
+            return _mock_httpx_response(200, body)
+
+        mock_client = _make_mock_async_client(side_effect=slow_post)
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        async def run() -> list[TaskPlan]:
+            return list(
+                await asyncio.gather(
+                    planner.aplan("Click OK", []),
+                    planner.aplan("click  ok", []),
+                    planner.aplan("Click Cancel", []),
+                )
+            )
+
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            first, second, other = asyncio.run(run())
+
+        assert mock_client.post.call_count == 2
+        assert first.api_calls_used == 1
+        assert second.success is True
+        assert second.task_description == "click  ok"
+        assert second.api_calls_used == 0
+        assert second.steps is not first.steps
+        assert other.api_calls_used == 1
+        assert planner._aflights == {}
+
+    def test_plan_waits_for_in_flight_request(self) -> None:
+        """A sync caller reuses the plan of a matching flight."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        flight = _Flight()
+        flight.plan = TaskPlan(
+            task_description="Click OK",
+            steps=[TaskStep(1, "btn_ok_1", "OK", "click")],
+            success=True,
+            api_calls_used=1,
+        )
+        flight.done.set()
+        planner._flights[plan_fingerprint("Click OK", [])] = flight
+
+        mock_client = _make_mock_client()
+        with patch("httpx.Client", return_value=mock_client):
+            result = planner.plan("Click OK", [])
+
+        assert mock_client.post.call_count == 0
+        assert result.success is True
+        assert result.api_calls_used == 0
+
+    def test_plan_clears_flight_when_done(self) -> None:
+        """The leading caller removes its flight, even on error."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        mock_client = _make_mock_client(side_effect=RuntimeError("boom"))
+        with patch("httpx.Client", return_value=mock_client):
+            try:
+                planner.plan("Click OK", [])
+            except RuntimeError:
+                pass
+
+        assert planner._flights == {}
+
+
+def _sse_response(*events: dict[str, Any]) -> MagicMock:
+    """Return a 200 mock response whose body is a server-sent event stream."""
+    resp = _mock_httpx_response(200, text="x")
+    resp.content = b"".join(
+        b"event: " + e["type"].encode() + b"\ndata: " + orjson.dumps(e) + b"\n\n"
+        for e in events
+    )
+    return resp
+
+
+def _text_delta(text: str, index: int = 0) -> dict[str, Any]:
+    """Return a content_block_delta event carrying *text*."""
+    return {
+        "type": "content_block_delta",
+        "index": index,
+        "delta": {"type": "text_delta", "text": text},
+    }
+
+
+class TestStreaming:
+    """Tests for plan() with stream=True."""
+
+    def test_default_body_not_streamed(self) -> None:
+        """Without stream=True the request body has no stream flag."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        assert b'"stream"' not in planner._request_body("t", [])
+
+    def test_streamed_text_reassembled(self) -> None:
+        """Text deltas are joined and parsed into steps."""
+        steps_json = json.dumps([_make_step_dict()])
+        half = len(steps_json) // 2
+        resp = _sse_response(
+            {"type": "message_start", "message": {}},
+            {"type": "ping"},
+            _text_delta(steps_json[:half]),
+            _text_delta(steps_json[half:]),
+            _text_delta("ignored", index=1),
+            {"type": "message_stop"},
+            _text_delta("after stop"),
+        )
+        planner = TaskPlanner(
+            _make_settings(), api_key="sk-test", stream=True
+        )
+        mock_client = _make_mock_client(response=resp)
+        with patch("httpx.Client", return_value=mock_client):
+            result = planner.plan("Click OK", [])
+
+        sent = orjson.loads(mock_client.post.call_args.kwargs["content"])
+        assert sent["stream"] is True
+        assert result.success is True
+        assert result.raw_response == steps_json
+        assert result.steps[0].zone_id == "btn_ok_1"
+
+    def test_stream_error_event_fails_plan(self) -> None:
+        """An error event mid-stream gives a failed plan."""
+        resp = _sse_response(
+            _text_delta("[{"),
+            {
+                "type": "error",
+                "error": {
+                    "type": "overloaded_error",
+                    "message": "Overloaded",
+                },
+            },
+        )
+        planner = TaskPlanner(
+            _make_settings(), api_key="sk-test", stream=True
+        )
+        with _patch_client(resp):
+            result = planner.plan("Click OK", [])
+
+        assert result.success is False
+        assert "overloaded_error" in result.error
+
+
+class TestPlanBatchOffline:
+    """Tests for TaskPlanner.plan_batch_offline with mocked httpx."""
+
+    @staticmethod
+    def _results_response(entries: list[dict[str, Any]]) -> MagicMock:
+        """Build a mock JSONL results download."""
+        return _mock_httpx_response(
+            200, text="\n".join(json.dumps(e) for e in entries)
+        )
+
+    def test_results_mapped_back_in_order(self) -> None:
+        """Plans follow item order, whatever order results arrive in."""
+        submitted = _mock_httpx_response(
+            200, {"id": "b1", "processing_status": "in_progress"}
+        )
+        ended = _mock_httpx_response(
+            200,
+            {
+                "id": "b1",
+                "processing_status": "ended",
+                "results_url": "https://example.test/results",
+            },
+        )
+        results = self._results_response([
+            {
+                "custom_id": "plan_1",
+                "result": {
+                    "type": "succeeded",
+                    "message": _make_api_response_body(
+                        json.dumps([_make_step_dict(zone_id="second")])
+                    ),
+                },
+            },
+            {
+                "custom_id": "plan_0",
+                "result": {
+                    "type": "succeeded",
+                    "message": _make_api_response_body(
+                        json.dumps([_make_step_dict(zone_id="first")])
+                    ),
+                },
+            },
+        ])
+        mock_client = _make_mock_client(response=submitted)
+        mock_client.get.side_effect = [ended, results]
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            plans = planner.plan_batch_offline(
+                [("task a", []), ("task b", [])], poll_interval=0.0
+            )
+
+        assert [p.success for p in plans] == [True, True]
+        assert plans[0].steps[0].zone_id == "first"
+        assert plans[1].steps[0].zone_id == "second"
+        body = orjson.loads(mock_client.post.call_args.kwargs["content"])
+        assert [r["custom_id"] for r in body["requests"]] == [
+            "plan_0", "plan_1",
+        ]
+        assert mock_client.get.call_args_list[0].args[0].endswith("/b1")
+
+    def test_errored_entry_fails_only_that_plan(self) -> None:
+        """A per-request error leaves the other plans intact."""
+        ended = _mock_httpx_response(
+            200,
+            {
+                "id": "b2",
+                "processing_status": "ended",
+                "results_url": "https://example.test/results",
+            },
+        )
+        results = self._results_response([
+            {
+                "custom_id": "plan_0",
+                "result": {
+                    "type": "succeeded",
+                    "message": _make_api_response_body("[]"),
+                },
+            },
+            {"custom_id": "plan_1", "result": {"type": "errored"}},
+        ])
+        mock_client = _make_mock_client(response=ended)
+        mock_client.get.return_value = results
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            plans = planner.plan_batch_offline(
+                [("a", []), ("b", []), ("c", [])], poll_interval=0.0
+            )
+
+        assert [p.success for p in plans] == [True, False, False]
+        assert "errored" in plans[1].error
+        assert "missing" in plans[2].error
+
+    def test_submit_failure_fails_every_plan(self) -> None:
+        """An HTTP error on submission is reported for every item."""
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(400, text="Bad batch")
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            plans = planner.plan_batch_offline([("a", []), ("b", [])])
+
+        assert all(not p.success and "400" in p.error for p in plans)
+        mock_client.get.assert_not_called()
+
+    def test_malformed_status_fails_every_plan(self) -> None:
+        """Non-JSON or non-object status bodies fail the batch."""
+        for text in ("<html>busy</html>", "[]"):
+            mock_client = _make_mock_client(
+                response=_mock_httpx_response(200, text=text)
+            )
+            planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+            with patch("httpx.Client", return_value=mock_client):
+                plans = planner.plan_batch_offline([("a", []), ("b", [])])
+
+            assert [p.success for p in plans] == [False, False]
+            assert plans[0].error
+
+    def test_malformed_results_line_fails_every_plan(self) -> None:
+        """A results download that is not JSONL fails the batch."""
+        ended = _mock_httpx_response(
+            200,
+            {
+                "id": "b3",
+                "processing_status": "ended",
+                "results_url": "https://example.test/results",
+            },
+        )
+        mock_client = _make_mock_client(response=ended)
+        mock_client.get.return_value = _mock_httpx_response(
+            200, text='{"custom_id": "plan_0"\nnot json'
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            plans = planner.plan_batch_offline([("a", [])])
+
+        assert plans[0].success is False
+        assert "JSONDecodeError" in plans[0].error
+
+    def test_polling_stops_at_timeout(self) -> None:
+        """A batch still running at the deadline fails every plan."""
+        running = _mock_httpx_response(
+            200, {"id": "b4", "processing_status": "in_progress"}
+        )
+        mock_client = _make_mock_client(response=running)
+        mock_client.get.return_value = running
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            plans = planner.plan_batch_offline(
+                [("a", []), ("b", [])], poll_interval=0.01, timeout=0.05
+            )
+
+        assert all(
+            not p.success and "did not end" in p.error for p in plans
+        )
+        assert "b4" in plans[0].error
+
+    def test_empty_items_makes_no_request(self) -> None:
+        """An empty batch returns immediately."""
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+        with patch("httpx.Client") as factory:
+            assert planner.plan_batch_offline([]) == []
+        factory.assert_not_called()
+
+
+class TestPlanCacheIntegration:
+    """Tests for TaskPlanner with the plan cache enabled."""
+
+    def test_repeat_plan_skips_api(self) -> None:
+        """A second identical plan call is served from the cache."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(
+            _make_settings(plan_cache_size=10), api_key="sk-test"
+        )
+        zones = [_make_zone()]
+
+        with patch("httpx.Client", return_value=mock_client):
+            first = planner.plan("Click OK", zones)
+            second = planner.plan("Click OK", zones)
+
+        assert mock_client.post.call_count == 1
+        assert second.success is True
+        assert second.api_calls_used == 0
+        assert second.steps[0].zone_id == first.steps[0].zone_id
+
+    def test_forget_forces_new_request(self) -> None:
+        """forget() makes the next plan call hit the API again."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(
+            _make_settings(plan_cache_size=10), api_key="sk-test"
+        )
+
+        with patch("httpx.Client", return_value=mock_client):
+            planner.plan("Click OK", [])
+            planner.forget("Click OK")
+            planner.plan("Click OK", [])
+
+        assert mock_client.post.call_count == 2
+
+    def test_zones_fingerprinted_once_per_call(self) -> None:
+        """Cache lookup, coalescing, and store share one fingerprint."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(
+            _make_settings(plan_cache_size=10), api_key="sk-test"
+        )
+
+        with (
+            patch("httpx.Client", return_value=mock_client),
+            patch(
+                "ciu_agent.core.plan_cache.plan_fingerprint"
+            ) as cache_fp,
+            patch(
+                "ciu_agent.core.task_planner.plan_fingerprint",
+                wraps=plan_fingerprint,
+            ) as planner_fp,
+        ):
+            planner.plan("Click OK", [_make_zone()])
+
+        assert planner_fp.call_count == 1
+        assert cache_fp.call_count == 0
+
+    def test_cache_disabled_by_default(self) -> None:
+        """Without plan_cache_size every call reaches the API."""
+        body = _make_api_response_body(json.dumps([_make_step_dict()]))
+        mock_client = _make_mock_client(
+            response=_mock_httpx_response(200, body)
+        )
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        with patch("httpx.Client", return_value=mock_client):
+            planner.plan("Click OK", [])
+            planner.plan("Click OK", [])
+
+        assert mock_client.post.call_count == 2
+
+
 class TestSummarizeZones:
     """Tests for TaskPlanner._summarize_zones."""
 
@@ -575,6 +1427,13 @@ class TestSummarizeZones:
         ]
         assert len(lines) == 2
 
+    def test_long_label_truncated(self) -> None:
+        """Labels are cut to 60 characters in the summary."""
+        zone = _make_zone(label="x" * 200)
+        summary = self.planner._summarize_zones([zone])
+        assert f'label="{"x" * 60}"' in summary
+        assert "x" * 61 not in summary
+
     def test_empty_list_returns_message(self) -> None:
         """An empty zone list returns a descriptive string."""
         summary = self.planner._summarize_zones([])
@@ -588,6 +1447,53 @@ class TestSummarizeZones:
         assert "(130, 220)" in summary
 
 
+class TestRankZones:
+    """Tests for limiting the zones sent in the prompt."""
+
+    def _zones(self) -> list[Zone]:
+        """Return a small Notepad-like screen."""
+        return [
+            _make_zone(zone_id="title", label="Untitled - Notepad",
+                       zone_type=ZoneType.STATIC),
+            _make_zone(zone_id="deco", label="", zone_type=ZoneType.STATIC),
+            _make_zone(zone_id="file", label="File"),
+            _make_zone(zone_id="save", label="Save"),
+            _make_zone(zone_id="edit", label="Text area",
+                       zone_type=ZoneType.TEXT_FIELD,
+                       state=ZoneState.FOCUSED),
+        ]
+
+    def test_keeps_relevant_zones_in_screen_order(self) -> None:
+        """Interactive, label-matching, and focused zones win."""
+        kept = _rank_zones("Save the file", self._zones(), 3)
+
+        assert [z.id for z in kept] == ["file", "save", "edit"]
+
+    def test_prompt_trimmed_beyond_limit(self) -> None:
+        """Only plan_max_zones zones are listed, with the true count."""
+        planner = TaskPlanner(
+            _make_settings(plan_max_zones=2), api_key="sk-test"
+        )
+        payload = planner.build_prompt("Save the file", self._zones())
+        text = payload["messages"][0]["content"][0]["text"]
+
+        assert "Number of zones detected: 5" in text
+        assert "The 2 zones most relevant" in text
+        assert "id=save" in text and "id=file" in text
+        assert "id=deco" not in text
+
+    def test_zero_limit_sends_every_zone(self) -> None:
+        """plan_max_zones=0 disables trimming."""
+        planner = TaskPlanner(
+            _make_settings(plan_max_zones=0), api_key="sk-test"
+        )
+        payload = planner.build_prompt("Save", self._zones())
+        text = payload["messages"][0]["content"][0]["text"]
+
+        assert "Available zones on screen:" in text
+        assert text.count("- id=") == 5
+
+
 class TestEdgeCases:
     """Edge-case tests for TaskPlanner and related dataclasses."""
 
@@ -666,6 +1572,17 @@ class TestEdgeCases:
         assert step.parameters == {}
         assert isinstance(step.parameters, dict)
 
+    def test_task_step_interns_action_type(self) -> None:
+        """TaskStep interns action_type however it was built."""
+        built = "".join(["type", "_", "text"])
+        step = TaskStep(
+            step_number=1,
+            zone_id="field",
+            zone_label="Name",
+            action_type=built,
+        )
+        assert step.action_type is sys.intern("type_text")
+
     def test_task_plan_steps_defaults_to_empty_list(self) -> None:
         """TaskPlan.steps defaults to an empty list."""
         plan = TaskPlan(task_description="Test")
@@ -778,6 +1695,31 @@ class TestEdgeCases:
         assert result.success is False
         assert result.api_calls_used == 3
 
+    def test_request_body_is_serialised_payload(self) -> None:
+        """The request body is the JSON-encoded build_prompt payload."""
+        mock_resp = _mock_httpx_response(200, _make_api_response_body("[]"))
+        planner = TaskPlanner(_make_settings(), api_key="sk-test")
+
+        mock_client = _make_mock_client(response=mock_resp)
+        with patch("httpx.Client", return_value=mock_client):
+            planner.plan("Body test", [_make_zone()])
+
+        sent = orjson.loads(mock_client.post.call_args.kwargs["content"])
+        assert sent == planner.build_prompt("Body test", [_make_zone()])
+
+    def test_spliced_body_matches_full_encoding(self) -> None:
+        """The pre-encoded body equals encoding the payload outright."""
+        zones = [_make_zone(label='Say "hi" \\ ü')]
+        for kwargs in ({}, {"compact": True}, {"stream": True}):
+            planner = TaskPlanner(
+                _make_settings(), api_key="sk-test", **kwargs
+            )
+            payload = planner.build_prompt('Type "x"\n', zones)
+            if kwargs.get("stream"):
+                payload["stream"] = True
+            body = planner._request_body('Type "x"\n', zones)
+            assert body == orjson.dumps(payload)
+
     def test_headers_contain_api_key(self) -> None:
         """The request sends the API key in x-api-key header."""
         steps_json = json.dumps([])
@@ -4,13 +4,19 @@ Tests cover prompt construction, response parsing (multiple JSON formats),
 zone-type/state enum mapping, synchronous analysis with mocked httpx,
 frame encoding, and error handling (no API key, HTTP errors, retries).
 
-All HTTP traffic is mocked -- no real API calls are made.
+All HTTP traffic is mocked or served on localhost -- no real API calls
+are made.
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -98,10 +104,40 @@ def _mock_httpx_response(
     resp = MagicMock(spec=httpx.Response)
     resp.status_code = status_code
     resp.text = text or json.dumps(json_body or {})
+    resp.content = resp.text.encode("utf-8")
     resp.json.return_value = json_body or {}
     return resp
 
 
+@contextmanager
+def _local_api(body: dict) -> Iterator[str]:
+    """Serve *body* as JSON to every POST on a local port; yield the URL."""
+    payload = json.dumps(body).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so the client pools
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/v1/messages"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 # ==================================================================
 # Test classes
 # ==================================================================
@@ -416,8 +452,6 @@ class TestNoApiKey:
 
     def test_analyze_async_no_key_returns_error(self) -> None:
         """analyze (async) returns success=False when no key is set."""
-        import asyncio
-
         with patch.dict("os.environ", {}, clear=True):
             analyzer_no_env = Tier2Analyzer(_make_settings(), api_key="")
         response = asyncio.run(analyzer_no_env.analyze(_make_request()))
@@ -594,6 +628,78 @@ class TestAnalyzeSync:
         assert result.success is True
         assert result.zones == []
 
+    def test_client_reused_across_calls(self) -> None:
+        """One pooled client serves every request until closed."""
+        body = _make_api_response_body("[]")
+        mock_resp = _mock_httpx_response(200, body)
+
+        analyzer = Tier2Analyzer(_make_settings(), api_key="sk-test")
+        with self._patch_client(mock_resp) as factory:
+            analyzer.analyze_sync(_make_request())
+            analyzer.analyze_sync(_make_request())
+
+        assert factory.call_count == 1
+        assert factory.return_value.post.call_count == 2
+
+    def test_close_releases_client(self) -> None:
+        """close() shuts the client; the next call opens a new one."""
+        body = _make_api_response_body("[]")
+        mock_resp = _mock_httpx_response(200, body)
+
+        analyzer = Tier2Analyzer(_make_settings(), api_key="sk-test")
+        with self._patch_client(mock_resp) as factory:
+            analyzer.analyze_sync(_make_request())
+            analyzer.close()
+            analyzer.close()
+            analyzer.analyze_sync(_make_request())
+
+        assert factory.return_value.close.call_count == 1
+        assert factory.call_count == 2
+
+    def test_context_manager_closes_client(self) -> None:
+        """Leaving a ``with`` block closes the pooled client."""
+        body = _make_api_response_body("[]")
+        mock_resp = _mock_httpx_response(200, body)
+
+        with self._patch_client(mock_resp) as factory:
+            with Tier2Analyzer(_make_settings(), api_key="sk-test") as analyzer:
+                analyzer.analyze_sync(_make_request())
+
+        factory.return_value.close.assert_called_once()
+
+
+class TestAnalyzeAsync:
+    """Tests for Tier2Analyzer.analyze against a local HTTP server."""
+
+    def test_separate_event_loops(self) -> None:
+        """Successive ``asyncio.run`` calls each get a working client."""
+        body = _make_api_response_body(json.dumps([_make_zone_dict(label="OK")]))
+        analyzer = Tier2Analyzer(_make_settings(), api_key="sk-test")
+
+        with _local_api(body) as url, patch("ciu_agent.core.tier2_analyzer._API_URL", url):
+            first = asyncio.run(analyzer.analyze(_make_request()))
+            second = asyncio.run(analyzer.analyze(_make_request()))
+
+        assert first.success is True
+        assert second.success is True
+        assert second.zones[0].label == "OK"
+
+    def test_client_reused_within_loop(self) -> None:
+        """Calls on the same event loop share one pooled client."""
+        body = _make_api_response_body("[]")
+        analyzer = Tier2Analyzer(_make_settings(), api_key="sk-test")
+
+        async def run_twice() -> bool:
+            await analyzer.analyze(_make_request())
+            client = analyzer._aclient
+            await analyzer.analyze(_make_request())
+            same = analyzer._aclient is client
+            await analyzer.aclose()
+            return same
+
+        with _local_api(body) as url, patch("ciu_agent.core.tier2_analyzer._API_URL", url):
+            assert asyncio.run(run_twice()) is True
+
 
 class TestTier2RequestDataclass:
     """Tests for the Tier2Request dataclass."""
@@ -526,6 +526,38 @@ class TestProperties:
         ids_b = registry.zone_ids
         assert ids_a is not ids_b
 
+    def test_version_starts_at_zero(self, registry: ZoneRegistry) -> None:
+        assert registry.version == 0
+
+    def test_version_bumped_by_every_mutation(self, registry: ZoneRegistry) -> None:
+        seen = [registry.version]
+        registry.register(_make_zone("a", last_seen=1.0))
+        seen.append(registry.version)
+        registry.register_many([_make_zone("b"), _make_zone("c")])
+        seen.append(registry.version)
+        registry.update("a", label="New")
+        seen.append(registry.version)
+        registry.update_last_seen("b", 2000.0)
+        seen.append(registry.version)
+        registry.expire_stale(current_time=1500.0, max_age_seconds=100.0)
+        seen.append(registry.version)
+        registry.remove("b")
+        seen.append(registry.version)
+        registry.replace_all([_make_zone("d")])
+        seen.append(registry.version)
+        registry.clear()
+        seen.append(registry.version)
+        assert seen == sorted(set(seen))
+
+    def test_version_unchanged_by_reads_and_empty_expiry(
+        self, populated_registry: ZoneRegistry,
+    ) -> None:
+        before = populated_registry.version
+        populated_registry.get("btn_save")
+        populated_registry.find_at_point(10, 10)
+        populated_registry.expire_stale(current_time=0.0, max_age_seconds=1.0)
+        assert populated_registry.version == before
+
 
 # ==================================================================
 # Dunder methods